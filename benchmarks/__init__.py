@@ -0,0 +1,3 @@
+"""
+Game's benchmark package, contains performance benchmarks for the source package.
+"""
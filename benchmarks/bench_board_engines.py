@@ -0,0 +1,66 @@
+"""
+Benchmark comparing the list-backed Board with the array-backed ArrayBoard.
+
+Run from the project's root directory:
+    python benchmarks/bench_board_engines.py [size ...]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+from source.engines import BOARD_ENGINES, create_board
+
+
+def measure(engine: str, size: int) -> tuple[float, float, float]:
+    """
+    Builds and renders a square board with the given engine.
+
+    Args:
+        engine (str): Name of the board engine
+        size (int): Width and height of the board
+
+    Returns:
+        tuple[float, float, float]: Construction time in seconds, rendering time in seconds and peak memory in MB
+    """
+    start = time.perf_counter()
+    board = create_board(size, size, engine=engine, seed=size)
+    built = time.perf_counter()
+    str(board)
+    rendered = time.perf_counter()
+
+    # Measure memory in a separate run, since tracing allocations slows down the timed run considerably
+    del board
+    tracemalloc.start()
+    str(create_board(size, size, engine=engine, seed=size))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return built - start, rendered - built, peak / 2**20
+
+
+def main(sizes: list[int]) -> None:
+    """
+    Prints a comparison table of all board engines for the given sizes.
+
+    Args:
+        sizes (list[int]): Board sizes (width and height) to benchmark
+    """
+    print(f"{'size':>6} {'engine':>6} {'build s':>9} {'render s':>9} {'peak MB':>9} {'speedup':>8}")
+    for size in sizes:
+        baseline = 0.0
+        for engine in BOARD_ENGINES:
+            build, render, peak = measure(engine, size)
+            if engine == "list":
+                baseline = build
+            speedup = baseline / build if build else float("inf")
+            print(f"{size:>6} {engine:>6} {build:>9.3f} {render:>9.3f} {peak:>9.1f} {speedup:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100, 500, 2000])
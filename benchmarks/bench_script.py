@@ -0,0 +1,79 @@
+"""
+Benchmark of scripted sessions: the input of many games is generated up front and played through the game's input handling like a script read with --script.
+Every game starts with a y followed by random scans, the scans left over when a game ends early are rejected by the main menu.
+
+Run from the project's root directory:
+    python benchmarks/bench_script.py --games 20000 --moves 30
+"""
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+import argparse
+import io
+from random import Random
+
+from source.game import Game
+from source.script import Script, ScriptStats
+
+
+def script_lines(games: int, moves: int, size: int = 10, seed: int = 0) -> str:
+    """
+    Returns the input of a scripted session.
+
+    Args:
+        games (int): number of games to start
+        moves (int): number of scans per game
+        size (int, optional): Scans are drawn from the rows and columns below this size. Defaults to 10 (the largest default board).
+        seed (int, optional): Seed of the scans. Defaults to 0.
+
+    Returns:
+        str: input lines of the session, ending with an n to quit
+    """
+    rng = Random(seed)
+    lines = []
+    for _ in range(games):
+        lines.append("y\n")
+        lines.extend(f"{rng.randrange(size)} {rng.randrange(size)}\n" for _ in range(moves))
+    lines.append("n\n")
+    return "".join(lines)
+
+
+def run_script(games: int, moves: int, size: int = 10, seed: int = 0) -> ScriptStats:
+    """
+    Plays a scripted session on default boards (5 to 10 cells wide and high, generated when a game starts, like main.py does for scripts).
+
+    Args:
+        games (int): number of games to start
+        moves (int): number of scans per game
+        size (int, optional): Scans are drawn from the rows and columns below this size. Defaults to 10.
+        seed (int, optional): Seed of the scans. Defaults to 0.
+
+    Returns:
+        ScriptStats: statistics of the session
+    """
+    script = Script(io.StringIO(script_lines(games, moves, size, seed)), output=io.StringIO(), report_games=False)
+    Game(wait_time=0, script=script)
+    return script.stats
+
+
+def main() -> None:
+    """
+    Command line interface of the benchmark.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark scripted sessions of the abandoned space station game.")
+    parser.add_argument("--games", type=int, default=20000, help="number of games to start")
+    parser.add_argument("--moves", type=int, nargs="+", default=[5, 30], help="numbers of scans per game")
+    parser.add_argument("--size", type=int, default=10, help="scans are drawn from the rows and columns below this size")
+    args = parser.parse_args()
+    for moves in args.moves:
+        print(f"{moves} scans per game: {run_script(args.games, moves, args.size)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark of the spectator feed: one player's moves are broadcast to many spectators in the same process, some of which read too slowly and are resynchronized with keyframes.
+The bytes sent are compared with resending the printed board to every spectator after every move.
+
+Run from the project's root directory:
+    python benchmarks/bench_spectators.py --subscribers 10000 --size 50 --moves 500
+"""
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+import argparse
+import time
+from random import Random
+from typing import NamedTuple
+
+from source.array_board import ArrayBoard
+from source.spectate import SpectatorFeed
+
+
+class BroadcastReport(NamedTuple):
+    """
+    Results of a broadcast benchmark.
+    """
+    subscribers: int
+    moves: int
+    elapsed: float
+    # Bytes read by all subscribers, and the bytes of sending the printed board to every subscriber after every move instead
+    delta_bytes: int
+    frame_bytes: int
+    # Number of keyframes read by subscribers that fell behind
+    resyncs: int
+
+    @property
+    def moves_per_second(self) -> float:
+        """
+        Returns the number of moves broadcast (and read by all subscribers) per second.
+
+        Returns:
+            float: moves per second
+        """
+        return self.moves / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self) -> str:
+        """Returns a summary of the benchmark.
+
+        Returns:
+            str: Printable summary
+        """
+        ratio = self.frame_bytes / self.delta_bytes if self.delta_bytes else 0.0
+        return (f"subscribers: {self.subscribers}, moves: {self.moves}, moves per second: {self.moves_per_second:.0f}, "
+                f"deliveries per second: {self.moves_per_second * self.subscribers:.0f}, resyncs: {self.resyncs}, "
+                f"MB sent: {self.delta_bytes / 2**20:.1f} (printed boards: {self.frame_bytes / 2**20:.1f}, {ratio:.0f}x)")
+
+
+def run_broadcast(subscribers: int, moves: int, size: int = 50, density: float = 0.15, slow: float = 0.1, slow_interval: int = 500,
+                  seed: int = 0) -> BroadcastReport:
+    """
+    Plays random games on a feed and lets every subscriber read after every move, except for the slow subscribers, which only read every slow interval.
+
+    Args:
+        subscribers (int): number of subscribers
+        moves (int): number of moves to broadcast
+        size (int, optional): Width and height of the boards. Defaults to 50.
+        density (float, optional): Fraction of trapped cells. Defaults to 0.15.
+        slow (float, optional): Fraction of slow subscribers. Defaults to 0.1.
+        slow_interval (int, optional): Number of moves between two reads of a slow subscriber. Defaults to 500.
+        seed (int, optional): Seed of the boards and moves. Defaults to 0.
+
+    Returns:
+        BroadcastReport: throughput and bytes sent
+    """
+    rng = Random(seed)
+    feed = SpectatorFeed()
+    readers = [feed.subscribe() for _ in range(subscribers)]
+    fast = readers[int(subscribers * slow):]
+    delta_bytes = frame_bytes = 0
+    cells: list[tuple[int, int]] = []
+    board = None
+    start = time.perf_counter()
+    for move in range(moves):
+        if board is None or not cells:
+            board = ArrayBoard(size, size, density=density, seed=rng.getrandbits(32))
+            feed.attach(board)
+            cells = [divmod(cell, size) for cell in range(size * size)]
+            rng.shuffle(cells)
+        if not board.scan_field(*cells.pop()) or board.discoverable == 0:
+            cells = []
+        # Resending the printed board would send the same frame to every subscriber
+        frame_bytes += len(str(board)) * subscribers
+        for reader in fast if (move + 1) % slow_interval else readers:
+            delta_bytes += len(reader.read())
+    elapsed = time.perf_counter() - start
+    return BroadcastReport(subscribers, moves, elapsed, delta_bytes, frame_bytes, sum(reader.resyncs for reader in readers))
+
+
+def main() -> None:
+    """
+    Command line interface of the benchmark.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the spectator feed of the abandoned space station game.")
+    parser.add_argument("--subscribers", type=int, nargs="+", default=[100, 1000, 10000], help="numbers of subscribers")
+    parser.add_argument("--moves", type=int, default=500, help="number of moves to broadcast")
+    parser.add_argument("--size", type=int, default=50, help="width and height of the boards")
+    parser.add_argument("--slow", type=float, default=0.1, help="fraction of slow subscribers")
+    args = parser.parse_args()
+    for subscribers in args.subscribers:
+        print(run_broadcast(subscribers, args.moves, args.size, slow=args.slow))
+
+
+if __name__ == "__main__":
+    main()
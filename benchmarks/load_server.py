@@ -0,0 +1,153 @@
+"""
+Load generator for the game server: many concurrent clients play random games and the request rate and latencies are reported.
+
+Run from the project's root directory (without --port, a server is started in the same process):
+    python benchmarks/load_server.py --clients 1000 --duration 10
+    python benchmarks/load_server.py --port 8765 --clients 1000 --duration 10
+"""
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+import argparse
+import asyncio
+import time
+from random import Random
+from typing import NamedTuple
+
+from source.client import GameClient
+from source.server import DEFAULT_HOST, GameServer
+
+
+class LoadReport(NamedTuple):
+    """
+    Results of a load test.
+    """
+    clients: int
+    requests: int
+    elapsed: float
+    p50: float
+    p99: float
+
+    @property
+    def requests_per_second(self) -> float:
+        """
+        Returns the request throughput.
+
+        Returns:
+            float: number of requests answered per second
+        """
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self) -> str:
+        """Returns a summary of the load test.
+
+        Returns:
+            str: Printable summary
+        """
+        return (f"clients: {self.clients}, requests: {self.requests}, requests per second: {self.requests_per_second:.0f}, "
+                f"p50 latency: {self.p50 * 1000:.2f} ms, p99 latency: {self.p99 * 1000:.2f} ms")
+
+
+def percentile(latencies: list[float], fraction: float) -> float:
+    """
+    Returns a percentile of the latencies (nearest rank).
+
+    Args:
+        latencies (list[float]): sorted latencies in seconds
+        fraction (float): percentile between 0 and 1
+
+    Returns:
+        float: latency in seconds, 0 if there are no latencies
+    """
+    if not latencies:
+        return 0.0
+    return latencies[min(int(fraction * len(latencies)), len(latencies) - 1)]
+
+
+async def run_client(host: str, port: int, deadline: float, rng: Random, size: int, latencies: list[float]) -> None:
+    """
+    Plays random games until the deadline and records the latency of every request.
+
+    Args:
+        host (str): address of the server
+        port (int): port of the server
+        deadline (float): time.perf_counter() value at which to stop
+        rng (Random): random number generator of the client's moves
+        size (int): width and height of the boards
+        latencies (list[float]): list to append the latencies (in seconds) to
+    """
+    client = await GameClient.connect(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await client.new_game(size, size, 0.15, rng.getrandbits(32))
+            latencies.append(time.perf_counter() - start)
+            cells = [divmod(cell, size) for cell in range(size * size)]
+            rng.shuffle(cells)
+            outcome = "SAFE"
+            while outcome == "SAFE" and cells and time.perf_counter() < deadline:
+                start = time.perf_counter()
+                outcome, _ = await client.scan(*cells.pop())
+                latencies.append(time.perf_counter() - start)
+    finally:
+        await client.close()
+
+
+async def run_load(clients: int, duration: float, host: str = DEFAULT_HOST, port: int | None = None, size: int = 10,
+                   seed: int = 0) -> LoadReport:
+    """
+    Runs concurrent clients against a server for a given time.
+
+    Args:
+        clients (int): number of concurrent clients (sessions)
+        duration (float): duration of the test in seconds
+        host (str, optional): Address of the server. Defaults to DEFAULT_HOST.
+        port (int | None, optional): Port of the server. Defaults to None (start a server in this process).
+        size (int, optional): Width and height of the boards. Defaults to 10.
+        seed (int, optional): Seed of the clients' moves. Defaults to 0.
+
+    Returns:
+        LoadReport: number of requests, throughput and latency percentiles
+    """
+    server = None
+    if port is None:
+        server = GameServer(host, 0)
+        await server.start()
+        port = server.port
+    latencies: list[float] = []
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(
+            run_client(host, port, start + duration, Random(f"{seed}-{client}"), size, latencies)
+            for client in range(clients)
+        ))
+    finally:
+        elapsed = time.perf_counter() - start
+        if server is not None:
+            await server.close()
+    latencies.sort()
+    return LoadReport(clients, len(latencies), elapsed, percentile(latencies, 0.5), percentile(latencies, 0.99))
+
+
+def main() -> None:
+    """
+    Command line interface of the load generator.
+    """
+    parser = argparse.ArgumentParser(description="Load test the abandoned space station game server.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="address of the server")
+    parser.add_argument("--port", type=int, default=None, help="port of the server (default: start a server in this process)")
+    parser.add_argument("--clients", type=int, default=100, help="number of concurrent clients")
+    parser.add_argument("--duration", type=float, default=5, help="duration of the test in seconds")
+    parser.add_argument("--size", type=int, default=10, help="width and height of the boards")
+    args = parser.parse_args()
+    print(asyncio.run(run_load(args.clients, args.duration, args.host, args.port, args.size)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+Benchmark suite for the board: measures construction, trap placement, scanning and rendering across board sizes and trap densities.
+
+Run from the project's root directory:
+    python benchmarks/suite.py run --output results.json
+    python benchmarks/suite.py compare baseline.json results.json
+"""
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+import argparse
+import json
+import platform
+import time
+import tracemalloc
+from collections.abc import Callable
+from random import Random
+from typing import Any
+
+from source.board import Board
+from source.engines import BOARD_ENGINES, create_board
+
+# Default sweep (width and height of square boards, trap densities)
+DEFAULT_SIZES = [10, 100, 500, 1000, 2000, 4000]
+QUICK_SIZES = [10, 50, 100]
+DEFAULT_DENSITIES = [0.1, 0.2, 0.3]
+
+# Number of random cells scanned by the scan_field benchmark
+SCANS = 100
+
+# Relative slowdown (or memory growth) above which a result counts as a regression
+DEFAULT_THRESHOLD = 0.25
+
+# Measurements below this time are too noisy to be flagged as regressions
+MIN_SECONDS = 0.001
+
+
+def measure(setup: Callable[[], Any], operation: Callable[[Any], object]) -> tuple[float, float]:
+    """
+    Measures the time and the peak memory of an operation. The memory is measured in a second, untimed run, since tracing allocations slows the operation down.
+
+    Args:
+        setup (Callable[[], Any]): untimed preparation, its result is passed to the operation
+        operation (Callable[[Any], object]): operation to measure
+
+    Returns:
+        tuple[float, float]: time in seconds and peak memory in MB
+    """
+    prepared = setup()
+    start = time.perf_counter()
+    operation(prepared)
+    seconds = time.perf_counter() - start
+
+    prepared = setup()
+    tracemalloc.start()
+    operation(prepared)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak / 2**20
+
+
+def scan_cells(size: int, seed: int) -> list[tuple[int, int]]:
+    """
+    Returns the cells scanned by the scan_field benchmark.
+
+    Args:
+        size (int): width and height of the board
+        seed (int): seed for the choice of cells
+
+    Returns:
+        list[tuple[int, int]]: rows and columns to scan
+    """
+    rng = Random(seed)
+    return [(rng.randrange(size), rng.randrange(size)) for _ in range(SCANS)]
+
+
+def benchmark_board(engine: str, size: int, density: float, seed: int = 0) -> list[dict[str, Any]]:
+    """
+    Runs all board benchmarks for one engine, size and density.
+
+    Args:
+        engine (str): name of the board engine
+        size (int): width and height of the board
+        density (float): fraction of trapped cells
+        seed (int, optional): Seed of the boards. Defaults to 0.
+
+    Returns:
+        list[dict[str, Any]]: one result per operation
+    """
+    cells = scan_cells(size, seed)
+    num_traps = round(size * size * density)
+
+    def construct() -> Board:
+        return create_board(size, size, engine=engine, density=density, seed=seed)
+
+    def construct_and_print() -> Board:
+        board = construct()
+        str(board)
+        return board
+
+    def place_traps(board: Board) -> None:
+        board._create_cells()
+        board._place_traps(num_traps)
+
+    def scan(board: Board) -> None:
+        for row, col in cells:
+            board.scan_field(row, col)
+
+    def scan_and_print(board: Board) -> None:
+        for row, col in cells:
+            board.scan_field(row, col)
+            str(board)
+
+    # Operations with their untimed preparation
+    operations: dict[str, tuple[Callable[[], Any], Callable[[Any], object]]] = {
+        "construct": (lambda: None, lambda _: construct()),
+        "place_traps": (construct, place_traps),
+        "scan_field": (construct, scan),
+        "render": (construct, str),
+        "render_cached": (construct_and_print, scan_and_print),
+        "solution": (construct, lambda board: board.solution),
+    }
+
+    results = []
+    for operation, (setup, function) in operations.items():
+        seconds, peak_mb = measure(setup, function)
+        results.append({
+            "engine": engine,
+            "size": size,
+            "density": density,
+            "operation": operation,
+            "seconds": seconds,
+            "peak_mb": peak_mb,
+        })
+    return results
+
+
+def run(sizes: list[int], densities: list[float], engines: list[str], output: str | None) -> dict[str, Any]:
+    """
+    Runs the benchmark sweep and optionally saves the results as JSON.
+
+    Args:
+        sizes (list[int]): board sizes (width and height)
+        densities (list[float]): trap densities
+        engines (list[str]): board engines
+        output (str | None): path of the JSON file to write, None to not save the results
+
+    Returns:
+        dict[str, Any]: benchmark report
+    """
+    results = []
+    for size in sizes:
+        for density in densities:
+            for engine in engines:
+                for result in benchmark_board(engine, size, density):
+                    results.append(result)
+                    print(f"{engine:>6} {size:>5}x{size:<5} density {density:.2f} {result['operation']:>14}: "
+                          f"{result['seconds']:10.4f} s {result['peak_mb']:9.1f} MB", flush=True)
+    report = {"python": platform.python_version(), "machine": platform.machine(), "results": results}
+    if output is not None:
+        with open(output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    return report
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], threshold: float = DEFAULT_THRESHOLD) -> list[str]:
+    """
+    Compares two benchmark reports and returns the regressions: results that got slower or used more memory than the threshold allows.
+
+    Args:
+        baseline (dict[str, Any]): stored benchmark report
+        current (dict[str, Any]): new benchmark report
+        threshold (float, optional): Allowed relative growth. Defaults to DEFAULT_THRESHOLD.
+
+    Returns:
+        list[str]: descriptions of the regressions
+    """
+    def key(result: dict[str, Any]) -> tuple[str, int, float, str]:
+        return result["engine"], result["size"], result["density"], result["operation"]
+
+    baseline_results = {key(result): result for result in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        reference = baseline_results.get(key(result))
+        if reference is None:
+            continue
+        name = f"{result['engine']} {result['size']}x{result['size']} density {result['density']:.2f} {result['operation']}"
+        if result["seconds"] >= MIN_SECONDS and result["seconds"] > reference["seconds"] * (1 + threshold):
+            regressions.append(f"{name}: time {reference['seconds']:.4f} s -> {result['seconds']:.4f} s")
+        if result["peak_mb"] > reference["peak_mb"] * (1 + threshold) and result["peak_mb"] - reference["peak_mb"] > 1:
+            regressions.append(f"{name}: peak memory {reference['peak_mb']:.1f} MB -> {result['peak_mb']:.1f} MB")
+    return regressions
+
+
+def main() -> None:
+    """
+    Command line interface of the benchmark suite.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark suite for the abandoned space station board.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=None, help="board sizes (width and height)")
+    run_parser.add_argument("--densities", type=float, nargs="+", default=DEFAULT_DENSITIES, help="trap densities")
+    run_parser.add_argument("--engines", nargs="+", choices=BOARD_ENGINES, default=list(BOARD_ENGINES), help="board engines")
+    run_parser.add_argument("--quick", action="store_true", help="only benchmark small boards")
+    run_parser.add_argument("--output", default=None, help="JSON file to save the results to")
+
+    compare_parser = commands.add_parser("compare", help="compare results against a baseline")
+    compare_parser.add_argument("baseline", help="JSON file with the baseline results")
+    compare_parser.add_argument("current", help="JSON file with the new results")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed relative growth")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        sizes = args.sizes or (QUICK_SIZES if args.quick else DEFAULT_SIZES)
+        run(sizes, args.densities, args.engines, args.output)
+    else:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        with open(args.current, encoding="utf-8") as file:
+            current = json.load(file)
+        regressions = compare(baseline, current, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+Array-backed board module for the abandoned space station game
+"""
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+from source.board import Board
+
+# Printed characters for the cell codes of a rendered row: numbers of surrounding traps (0-8) for discovered cells and a question mark (16 and above) otherwise
+BOARD_CHARACTERS = bytes(ord(str(code)) if code < 9 else ord("?") for code in range(256))
+
+# Printed characters for the cell codes of a rendered solution row: numbers of surrounding traps (0-8) for safe cells and an X (16 and above) for traps
+SOLUTION_CHARACTERS = bytes(ord(str(code)) if code < 9 else ord("X") for code in range(256))
+
+
+class ArrayBoard(Board):
+    """
+    This class represents a board with the same public interface as the Board class, but stores its cells in flat, compact byte arrays (one byte per cell, row-major) instead of nested lists.
+    Only the discovered states are kept in one byte array per row, so that snapshots share them row by row like the rows of the Board class.
+    The number of surrounding traps is computed for the whole board at once by treating the trap array as one large integer with one byte per cell, so that all neighbor sums are done by a handful of shifts and additions.
+    """
+    def _create_cells(self) -> None:
+        """
+        Allocates the per-cell storage of the board as flat byte arrays of size width * height.
+        """
+        num_cells = self._width * self._height
+
+        # Bytes to indicate if there is a trap in a cell (1) or not (0)
+        self._traps = bytearray(num_cells)
+
+        # Number of traps surrounding a cell
+        self._surrounding = bytearray(num_cells)
+
+        # Bytes to indicate if a cell has been discovered (1) or not (0), one byte array per row
+        # Snapshots share the rows, so that a scan only copies the rows it modifies
+        self._discovered = [bytearray(self._width) for _ in range(self._height)]
+
+        # Snapshot generation of the board, and the generation in which each row of discovered states was copied (rows from older generations are shared with a snapshot)
+        self._snapshot_generation = 0
+        self._row_generation = [0] * self._height
+
+        # One row of undiscovered cell codes (16 per cell), used to render rows
+        self._undiscovered_codes = int.from_bytes(b"\x10" * self._width, "little")
+
+    def _place_traps(self, num_traps: int = 2) -> None:
+        """
+        Places traps on the board and computes the number of surrounding traps of every cell in one vectorized pass.
+        """
+        # The zero-regions depend on the trap positions, so they have to be labelled again
+        self._region_of = None
+
+        # Place traps randomly on the board, using flat cell indices
+        traps = self._sample_traps(num_traps)
+        for cell in traps:
+            self._traps[cell] = 1
+
+        if self._topology == "grid":
+            self._count_surrounding()
+        else:
+            # The shifted sums only add up the neighbors of a bounded grid, other topologies count each trap at its neighbors from the neighbor index
+            width = self._width
+            rows = self.neighbor_table.rows
+            surrounding = self._surrounding
+            for cell in traps:
+                row, col = divmod(cell, width)
+                base = row * width
+                for neighbor in rows[row][col]:
+                    surrounding[base + neighbor] += 1
+
+    def _count_surrounding(self) -> None:
+        """
+        Computes the number of surrounding traps for every cell from the trap array.
+        Each cell is one byte wide inside a single integer, and since a cell can have at most 8 surrounding traps, no sum ever overflows into the neighboring byte.
+        """
+        width = self._width
+        num_cells = width * self._height
+        if num_cells == 0:
+            return
+
+        # Byte masks that remove the values which would otherwise wrap around from one row into the next
+        not_first_col = int.from_bytes((b"\x00" + b"\x01" * (width - 1)) * self._height, "little")
+        not_last_col = int.from_bytes((b"\x01" * (width - 1) + b"\x00") * self._height, "little")
+        all_cells = (1 << (8 * num_cells)) - 1
+
+        traps = int.from_bytes(self._traps, "little")
+
+        # Horizontal sums: the cell itself plus its left and right neighbor
+        horizontal = traps + ((traps << 8) & not_first_col) + ((traps >> 8) & not_last_col)
+
+        # Vertical sums of the horizontal sums: the full 3x3 block around each cell
+        row_shift = 8 * width
+        block = horizontal + ((horizontal << row_shift) & all_cells) + (horizontal >> row_shift)
+
+        # Remove the cell itself from its 3x3 block
+        self._surrounding = bytearray((block - traps).to_bytes(num_cells, "little"))
+
+    def _render_row(self, row: int) -> str:
+        """
+        Returns the printed form of a row, followed by the separator.
+        The row is rendered without a per-cell loop: every cell gets a one byte code, and the codes are translated to the printed characters at once.
+
+        Args:
+            row (int): row to render
+
+        Returns:
+            str: printed row, undiscovered cells are shown as question marks
+        """
+        start = row * self._width
+        stop = start + self._width
+        surrounding = int.from_bytes(self._surrounding[start:stop], "little")
+        discovered = int.from_bytes(self._discovered[row], "little")
+        # Undiscovered cells get the code 16 + number of surrounding traps, discovered cells keep the number itself
+        codes = (surrounding + self._undiscovered_codes - (discovered << 4)).to_bytes(self._width, "little")
+        cells = " | ".join(codes.translate(BOARD_CHARACTERS).decode("ascii"))
+        return f"{row} | {cells} | \n{self._separator}"
+
+    def _render_solution_row(self, row: int) -> str:
+        """
+        Returns the solution of a row, followed by the separator.
+
+        Args:
+            row (int): row to render
+
+        Returns:
+            str: printed row, traps are shown as X's
+        """
+        start = row * self._width
+        stop = start + self._width
+        surrounding = int.from_bytes(self._surrounding[start:stop], "little")
+        traps = int.from_bytes(self._traps[start:stop], "little")
+        # Trapped cells get the code 16 + number of surrounding traps, all other cells keep the number itself
+        codes = (surrounding | traps << 4).to_bytes(self._width, "little")
+        cells = " | ".join(codes.translate(SOLUTION_CHARACTERS).decode("ascii"))
+        return f"{row} | {cells} | \n{self._separator}"
+
+    def _cell_trapped(self, row: int, col: int) -> bool:
+        """
+        Returns whether there is a trap in a cell.
+
+        Args:
+            row (int): row of the cell
+            col (int): column of the cell
+
+        Returns:
+            bool: True if the cell contains a trap
+        """
+        return bool(self._traps[row * self._width + col])
+
+    def _cell_discovered(self, row: int, col: int) -> bool:
+        """
+        Returns whether a cell has been discovered.
+
+        Args:
+            row (int): row of the cell
+            col (int): column of the cell
+
+        Returns:
+            bool: True if the cell has been discovered
+        """
+        return bool(self._discovered[row][col])
+
+    def _cell_surrounding(self, row: int, col: int) -> int:
+        """
+        Returns the number of traps surrounding a cell.
+
+        Args:
+            row (int): row of the cell
+            col (int): column of the cell
+
+        Returns:
+            int: number of surrounding traps
+        """
+        return int(self._surrounding[row * self._width + col])
+
+    def _blocked_cells(self) -> bytes:
+        """
+        Returns a flat mask (indexed by row * width + col) which is zero exactly for the safe cells without surrounding traps.
+
+        Returns:
+            bytes: one byte per cell, non-zero if the cell contains a trap or has surrounding traps
+        """
+        num_cells = self._width * self._height
+        blocked = int.from_bytes(self._traps, "little") | int.from_bytes(self._surrounding, "little")
+        return blocked.to_bytes(num_cells, "little")
+
+    def _flat_cells(self) -> tuple[bytes, bytes, bytes]:
+        """
+        Returns the cell storage as flat byte strings (indexed by row * width + col), e.g. to save the board.
+        The trap and surrounding arrays are returned as they are, without copying them, the rows of discovered states are joined.
+
+        Returns:
+            tuple[bytes, bytes, bytes]: traps (0 or 1), numbers of surrounding traps and discovered states (0 or 1), one byte per cell
+        """
+        return self._traps, self._surrounding, b"".join(self._discovered)
+
+    def _set_discovered(self, discovered: bytes) -> None:
+        """
+        Marks the cells of a flat mask (indexed by row * width + col) as discovered, e.g. to restore a saved state of the game.
+        The cells are revealed without notifying the reveal listeners and without changing the number of discoverable cells.
+
+        Args:
+            discovered (bytes): one byte per cell, 1 for the discovered cells
+        """
+        width = self._width
+        for row in range(self._height):
+            states = discovered[row * width:(row + 1) * width]
+            if 1 in states:
+                merged = int.from_bytes(self._discovered[row], "little") | int.from_bytes(states, "little")
+                self._own_row(row)[:] = merged.to_bytes(width, "little")
+        self._frame = None
+
+    def _reveal_span(self, row: int, start: int, stop: int) -> int:
+        """
+        Marks the cells of a row between two columns as discovered.
+
+        Args:
+            row (int): row of the cells
+            start (int): first column to reveal
+            stop (int): column after the last column to reveal
+
+        Returns:
+            int: number of cells that had not been discovered before
+        """
+        discovered = self._discovered[row]
+        revealed = stop - start - discovered.count(1, start, stop)
+        if not revealed:
+            return 0
+        self._own_row(row)[start:stop] = b"\x01" * (stop - start)
+        return revealed
+
+    def _restore_span(self, row: int, start: int, states: bytes) -> None:
+        """
+        Sets the discovered states of consecutive cells of a row, e.g. to hide the cells revealed by a move again.
+
+        Args:
+            row (int): row of the cells
+            start (int): first column
+            states (bytes): one byte per cell, 1 for a discovered cell
+        """
+        self._own_row(row)[start:start + len(states)] = states
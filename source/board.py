@@ -2,31 +2,171 @@
 Board module for the abandoned space station game
 """
 
-from random import randint
+import re
+from array import array
+from collections.abc import Callable, Iterable
+from functools import lru_cache
+from itertools import chain
+from random import Random
+from typing import Any, NamedTuple
 
+from source.topology import TOPOLOGIES, NeighborTable, neighbor_table
+
+# Printed cell contents, indexed by the number of surrounding traps
+CELL_LABELS = tuple(f"{count} | " for count in range(9))
+
+# Runs of consecutive cells without traps and without surrounding traps in the blocked-cells mask of a board
+ZERO_RUN = re.compile(rb"\x00+")
+
+# Runs of discovered cells in a flat mask of discovered cells
+DISCOVERED_RUN = re.compile(rb"\x01+")
+
+# Translation table that maps every non-zero byte to 1
+NON_ZERO = bytes(min(value, 1) for value in range(256))
+
+# Number of columns read at once when a flood fill extends a run of cells without surrounding traps to the left or right
+RUN_STEP = 64
+
+# Random number generator that draws the seeds of boards created without one, seeded once instead of once per board
+SEEDS = Random()
+
+
+
+@lru_cache(maxsize=32)
+def frame_parts(width: int) -> tuple[str, str]:
+    """
+    Returns the parts of the printed board that only depend on the board width, so they are built once per board size.
+
+    Args:
+        width (int): board width (number of columns)
+
+    Returns:
+        tuple[str, str]: header (column numbers and first separator) and separator between rows
+    """
+    separator = "  |" + "---|" * width + "\n"
+    header = " " * 4 + "".join([f"{col}   " for col in range(width)]) + "\n" + separator
+    return header, separator
+
+
+class ScanResult(NamedTuple):
+    """
+    Result of scanning several fields at once with Board.scan_many.
+    """
+    # Result of every scanned field in the given order, like the result of scan_field (False for a trap)
+    outcomes: list[bool]
+    # Rows and columns of all cells discovered by the scans
+    revealed: set[tuple[int, int]]
+
+
+class BoardSnapshot(NamedTuple):
+    """
+    State of a game on a board, taken with Board.snapshot and restored with Board.restore.
+    """
+    # Discovered states in the board's own storage, shared with the board until a scan modifies them
+    cells: Any
+    discoverable: int
+    # Flat indices of the flagged cells
+    flags: frozenset[int]
+
+
+class MoveRecord(NamedTuple):
+    """
+    Cells revealed by a move, recorded between Board.begin_move and Board.end_move and undone with Board.undo_move.
+    """
+    # Spans revealed by the move: row, first column and the discovered states of the span before the move (one byte per cell, 0 or 1)
+    spans: list[tuple[int, int, bytes]]
+    # Number of safe cells left to discover before the move
+    discoverable: int
 
 class Board:
     """
     This class represents a board for the game, containing information about the position of traps, the number of surrounding traps and the state of each cell (discovered or not).
     """
-    def __init__(self, width: int = 0, height: int = 0):
+    def __init__(self, width: int = 0, height: int = 0, density: float | None = None, seed: int | None = None, rng: Random | None = None,
+                 topology: str = "grid"):
         """
         Initializes the board based on the width and height parameters.
 
         Args:
             width (int, optional): Board width (number of columns). Defaults to 0.
             height (int, optional): Board height (number of rows). Defaults to 0.
+            density (float | None, optional): Fraction of cells that contain a trap. Defaults to None (random fraction between 1/10 and 1/3).
+            seed (int | None, optional): Seed for the board's random number generator, so that the same seed always produces the same board. Defaults to None (random seed).
+            rng (Random | None, optional): Random number generator to use instead of a seeded one. Defaults to None.
+            topology (str, optional): Name of the topology that decides which cells are neighbors, one of TOPOLOGIES. Defaults to "grid".
+
+        Raises:
+            ValueError: If the density is not between 0 and 1 or the topology name is unknown
         """
+        if density is not None and not 0 <= density <= 1:
+            raise ValueError("The trap density must be between 0 and 1.")
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"Unknown board topology '{topology}', expected one of: {', '.join(TOPOLOGIES)}")
+
+        if rng is None:
+            if seed is None:
+                # Draw a seed so that every board can be reproduced later on
+                seed = SEEDS.getrandbits(63)
+            rng = Random(seed)
+
+        # Requested size and density, which generate the same board again together with the seed
+        generation = (width, height, density)
+
         if width == 0:
             # Random width between 5 and 10 if not specified
             # (to avoid having a board with less than 5 columns)
             # Less than 5 columns are only allowed for testing purposes, thus the condition width == 0 instead of width < 5
-            width = randint(5, 10)
+            width = rng.randint(5, 10)
         if height == 0:
             # Random height between 5 and 10 if not specified
             # (to avoid having a board with less than 5 rows)
             # Less than 5 rows are only allowed for testing purposes, thus the condition height == 0 instead of height < 5
-            height = randint(5, 10)
+            height = rng.randint(5, 10)
+
+        # Size, topology, print cache, listeners, flags and zero-region index
+        self._init_state(width, height, topology, seed, rng, generation)
+
+        # Allocate the cell storage (traps, surrounding traps and discovered state)
+        self._create_cells()
+
+        # Determine random number of traps to place
+        num_cells = self._width * self._height
+        if density is None:
+            num_traps = rng.randint(num_cells//10, num_cells//3)
+        else:
+            num_traps = round(num_cells * density)
+
+        # Number of cells that can  be discovered safely (no traps)
+        self.discoverable = num_cells - num_traps
+
+        # Placing traps on the board
+        self._place_traps(num_traps)
+
+    def _init_state(self, width: int, height: int, topology: str, seed: int | None = None, rng: Random | None = None,
+                    generation: tuple[int, int, float | None] | None = None) -> None:
+        """
+        Sets the attributes every board has besides its cells and its number of discoverable cells.
+        Boards that take their cells from elsewhere (e.g. a file or shared memory) call it instead of Board.__init__.
+
+        Args:
+            width (int): board width (number of columns)
+            height (int): board height (number of rows)
+            topology (str): name of the topology of the board, one of TOPOLOGIES
+            seed (int | None, optional): Seed the board was generated from. Defaults to None (not generated from a seed).
+            rng (Random | None, optional): Random number generator of the board generation. Defaults to None (an unseeded one).
+            generation (tuple[int, int, float | None] | None, optional): Requested width, height and density. Defaults to None (the size, without a density).
+        """
+        # Seed the board was generated from (None if an external random number generator was injected)
+        self._seed = seed
+
+        # Requested size and density, which generate the same board again together with the seed
+        self._generation = generation if generation is not None else (width, height, None)
+
+        # First scan from which every safe cell can be deduced without guessing, set by the generator (None if unknown)
+        self.start: tuple[int, int] | None = None
+
+        # Random number generator used for the board generation
+        self._rng = rng if rng is not None else Random()
 
         # board width
         self._width = width
@@ -34,27 +174,119 @@ class Board:
         # board height
         self._height = height
 
-        # String to print the board
-        self._separator = "  |" + "---|" * self._width + "\n"
+        # Topology of the board, and the index of the neighbors of its cells (shared by all boards of the same shape, looked up on first use)
+        self._topology = topology
+        self._neighbor_table: NeighborTable | None = None
+
+        # Cached printed board: the header followed by one string per row, built on the first print
+        # Only the rows touched by scan_field since the last print (_dirty_rows) are rendered again
+        self._frame: list[str] | None = None
+        self._dirty_rows: set[int] = set()
+
+        # Functions called with (row, first column, column after the last) for every span of cells revealed by scan_field
+        self._reveal_listeners: list[Callable[[int, int, int], None]] = []
+
+        # Functions called with (row, column, result) for every call of scan_field
+        self._scan_listeners: list[Callable[[int, int, bool], None]] = []
 
+        # Cells (row, column) discovered during scan_many, None outside of scan_many
+        self._batch_revealed: set[tuple[int, int]] | None = None
+
+        # Record of the move between begin_move and end_move, None outside of a move
+        self._move: MoveRecord | None = None
+
+        # Flat indices (row * width + col) of the cells flagged as traps by the player
+        self._flags: set[int] = set()
+
+        # Index of the zero-regions (connected cells without surrounding traps), built once on the first scan
+        # _region_of maps each flat cell index (row * width + col) to the id of its zero-region (-1 if the cell has surrounding traps)
+        # _region_runs lists the horizontal runs (row, first column, column after the last) of each zero-region
+        self._region_of: array[int] | None = None
+        self._region_runs: list[list[tuple[int, int, int]]] = []
+
+    def _create_cells(self) -> None:
+        """
+        Allocates the per-cell storage of the board as nested lists (one list per row).
+        """
         # Booleans to indicate if there is a trap in a cell
-        self._traps = [[False for _ in range(width)] for _ in range(height)]
+        self._traps = [[False for _ in range(self._width)] for _ in range(self._height)]
 
         # Number of traps surrounding a cell
-        self._surrounding = [[0 for _ in range(width)] for _ in range(height)]
+        self._surrounding = [[0 for _ in range(self._width)] for _ in range(self._height)]
 
         # Booleans to indicate if a cell has been discovered
-        self._discovered = [[False for _ in range(width)] for _ in range(height)]
+        self._discovered = [[False for _ in range(self._width)] for _ in range(self._height)]
 
-        # Determine random number of traps to place
-        num_cells = self._width * self._height
-        num_traps = randint(num_cells//10, num_cells//3)
+        # Snapshot generation of the board (increased by every snapshot and restore), and the generation in which each row of discovered states was copied
+        # A row from an older generation is shared with a snapshot, and is copied before it is modified
+        self._snapshot_generation = 0
+        self._row_generation = [0] * self._height
 
-        # Number of cells that can  be discovered safely (no traps)
-        self.discoverable = num_cells - num_traps
+    @property
+    def _header(self) -> str:
+        """
+        Returns the header of the printed board. It is built on the first print, so that boards which are never printed in full do not pay for it.
 
-        # Placing traps on the board
-        self._place_traps(num_traps)
+        Returns:
+            str: column numbers and first separator
+        """
+        return frame_parts(self._width)[0]
+
+    @property
+    def _separator(self) -> str:
+        """
+        Returns the separator between the printed rows.
+
+        Returns:
+            str: separator line
+        """
+        return frame_parts(self._width)[1]
+
+    @property
+    def seed(self) -> int | None:
+        """
+        Returns the seed the board was generated from.
+
+        Returns:
+            int | None: board seed, None if the board was generated with an injected random number generator
+        """
+        return self._seed
+
+    @property
+    def topology(self) -> str:
+        """
+        Returns the name of the board's topology.
+
+        Returns:
+            str: name of the topology, one of TOPOLOGIES
+        """
+        return self._topology
+
+    @property
+    def neighbor_table(self) -> NeighborTable:
+        """
+        Returns the index of the neighbors of the board's cells.
+
+        Returns:
+            NeighborTable: neighbor index of the board's topology and size
+        """
+        table = self._neighbor_table
+        if table is None:
+            table = self._neighbor_table = neighbor_table(self._topology, self._width, self._height)
+        return table
+
+    def neighbors(self, row: int, col: int) -> list[tuple[int, int]]:
+        """
+        Returns the neighbors of a cell in the board's topology.
+
+        Args:
+            row (int): row of the cell
+            col (int): column of the cell
+
+        Returns:
+            list[tuple[int, int]]: rows and columns of the neighboring cells
+        """
+        return self.neighbor_table.cell_neighbors(row, col)
 
     @property
     def width(self) -> int:
@@ -82,62 +314,94 @@ class Board:
         Returns:
             str: Printable board in string form.
         """
-        # Initialize the board string with the column numbers
-        printed_board = " " * 4
-        for col in range(self.width):
-            printed_board += str(col) + " " * 3
-        printed_board += "\n" + self._separator
-
-        # Add the rows to the board string
-        for row in range(self.height):
-            # Add the row number to the board string
-            printed_board += str(row) + " | "
-            for col in range(self.width):
-                if self._discovered[row][col]:
-                    # If the cell is discovered, print the number of surrounding traps
-                    printed_board += str(self._surrounding[row][col]) + " | "
-                else:
-                    # If the cell is not discovered, print a question mark
-                    printed_board += "? | "
-            # Add a separator between rows
-            printed_board += "\n"
-            printed_board += self._separator
-        return printed_board
+        frame = self._frame
+        if frame is None:
+            # Render the whole board on the first print
+            frame = [self._header] + [self._shift_row(row, self._render_row(row)) for row in range(self.height)]
+            self._frame = frame
+        else:
+            # Only render the rows again that changed since the last print
+            for row in self._dirty_rows:
+                frame[row + 1] = self._shift_row(row, self._render_row(row))
+        self._dirty_rows.clear()
+        return "".join(frame)
+
+    def _shift_row(self, row: int, rendered: str) -> str:
+        """
+        Shifts the odd rows of a hexagonal board right by half a cell, so that every cell is printed between its neighbors in the adjacent rows.
+
+        Args:
+            row (int): row index
+            rendered (str): printed row followed by the separator
+
+        Returns:
+            str: printed row, shifted if needed
+        """
+        if self._topology == "hex" and row % 2:
+            return "  " + rendered
+        return rendered
+
+    def _render_row(self, row: int) -> str:
+        """
+        Returns the printed form of a row, followed by the separator.
+
+        Args:
+            row (int): row to render
+
+        Returns:
+            str: printed row, undiscovered cells are shown as question marks
+        """
+        # Print the number of surrounding traps for discovered cells and a question mark otherwise
+        cells = "".join([CELL_LABELS[count] if known else "? | " for count, known in zip(self._surrounding[row], self._discovered[row])])
+        return f"{row} | {cells}\n{self._separator}"
+
+    def _render_solution_row(self, row: int) -> str:
+        """
+        Returns the solution of a row, followed by the separator.
+
+        Args:
+            row (int): row to render
+
+        Returns:
+            str: printed row, traps are shown as X's
+        """
+        # Print the traps as X's and the numbers of surrounding traps for all other cells
+        cells = "".join(["X | " if trap else CELL_LABELS[count] for count, trap in zip(self._surrounding[row], self._traps[row])])
+        return f"{row} | {cells}\n{self._separator}"
+
+    def _sample_traps(self, num_traps: int) -> list[int]:
+        """
+        Draws the flat indices (row * width + col) of the trapped cells without replacement, so that no draw is wasted on a cell that already contains a trap.
+
+        Args:
+            num_traps (int): number of traps to draw
+
+        Returns:
+            list[int]: flat indices of the trapped cells
+        """
+        return self._rng.sample(range(self._width * self._height), num_traps)
 
     def _place_traps(self, num_traps: int = 2) -> None:
         """
         Places traps on the board.
         """
-        # Place traps randomly on the board
-        traps: set[tuple[int, int]] = set()
-        while len(traps) < num_traps:
-            # Generate random row and column indices for the trap
-            row = randint(0, self.height - 1)
-            col = randint(0, self.width - 1)
-            # Add the trap to the set of traps if it is not already in the set (by definition of the set type)
-            traps.add((row, col))
+        # The zero-regions depend on the trap positions, so they have to be labelled again
+        self._region_of = None
 
         # Update the traps and surrounding attributes of the board
-        for row, col in traps:
+        width = self._width
+        rows = self.neighbor_table.rows
+        # The numbers of surrounding traps are counted in one flat list and split into rows at the end, so every neighbor is a single index without any border checks
+        counts = [0] * (width * self._height)
+        for cell in self._sample_traps(num_traps):
+            row, col = divmod(cell, width)
             # Set the trap boolean at the given row and column index to True
             self._traps[row][col] = True
-            # Increment the surrounding attribute of the board for the neighboring cells of the trapped cell
-            if row > 0:
-                self._surrounding[row - 1][col] += 1
-            if row < self.height - 1:
-                self._surrounding[row + 1][col] += 1
-            if col > 0:
-                self._surrounding[row][col - 1] += 1
-            if col < self.width - 1:
-                self._surrounding[row][col + 1] += 1
-            if row > 0 and col > 0:
-                self._surrounding[row - 1][col - 1] += 1
-            if row > 0 and col < self.width - 1:
-                self._surrounding[row - 1][col + 1] += 1
-            if row < self.height - 1 and col > 0:
-                self._surrounding[row + 1][col - 1] += 1
-            if row < self.height - 1 and col < self.width - 1:
-                self._surrounding[row + 1][col + 1] += 1
+            # Increment the number of surrounding traps of the neighboring cells of the trapped cell
+            base = row * width
+            for neighbor in rows[row][col]:
+                counts[base + neighbor] += 1
+        self._surrounding = [counts[start:start + width] for start in range(0, width * self._height, width)]
 
     @property
     def solution(self) -> str:
@@ -147,27 +411,495 @@ class Board:
         Returns:
             str: String representation of the board solution
         """
-        # Initialize the board string with the column numbers
-        printed_board = " " * 4
-        for col in range(self.width):
-            printed_board += str(col) + " " * 3
-        printed_board += "\n" + self._separator
-
-        # Print the board with the numbers of traps surrounding each field and the traps themselves
-        for row in range(self.height):
-            # Print the row number
-            printed_board += str(row) + " | "
-            for col in range(self.width):
-                if self._traps[row][col]:
-                    # Print the traps as X's
-                    printed_board += "X | "
+        return "".join([self._header] + [self._shift_row(row, self._render_solution_row(row)) for row in range(self.height)])
+
+    def revealed_count(self, row: int, col: int) -> int | None:
+        """
+        Returns what a player can see in a cell: the number of surrounding traps once the cell is discovered.
+
+        Args:
+            row (int): row of the cell
+            col (int): column of the cell
+
+        Returns:
+            int | None: number of surrounding traps of a discovered safe cell, None if the cell is undiscovered or a trap
+        """
+        if not self._cell_discovered(row, col) or self._cell_trapped(row, col):
+            return None
+        return self._cell_surrounding(row, col)
+
+    def _cell_trapped(self, row: int, col: int) -> bool:
+        """
+        Returns whether there is a trap in a cell.
+
+        Args:
+            row (int): row of the cell
+            col (int): column of the cell
+
+        Returns:
+            bool: True if the cell contains a trap
+        """
+        return bool(self._traps[row][col])
+
+    def _cell_discovered(self, row: int, col: int) -> bool:
+        """
+        Returns whether a cell has been discovered.
+
+        Args:
+            row (int): row of the cell
+            col (int): column of the cell
+
+        Returns:
+            bool: True if the cell has been discovered
+        """
+        return bool(self._discovered[row][col])
+
+    def _cell_surrounding(self, row: int, col: int) -> int:
+        """
+        Returns the number of traps surrounding a cell.
+
+        Args:
+            row (int): row of the cell
+            col (int): column of the cell
+
+        Returns:
+            int: number of surrounding traps
+        """
+        return int(self._surrounding[row][col])
+
+    def _blocked_cells(self) -> bytes:
+        """
+        Returns a flat mask (indexed by row * width + col) which is zero exactly for the safe cells without surrounding traps.
+
+        Returns:
+            bytes: one byte per cell, non-zero if the cell contains a trap or has surrounding traps
+        """
+        return b"".join(bytes(trap | count for trap, count in zip(traps, surrounding)) for traps, surrounding in zip(self._traps, self._surrounding))
+
+    def _reveal_span(self, row: int, start: int, stop: int) -> int:
+        """
+        Marks the cells of a row between two columns as discovered.
+
+        Args:
+            row (int): row of the cells
+            start (int): first column to reveal
+            stop (int): column after the last column to reveal
+
+        Returns:
+            int: number of cells that had not been discovered before
+        """
+        revealed = stop - start - sum(self._discovered[row][start:stop])
+        if not revealed:
+            return 0
+        self._own_row(row)[start:stop] = [True] * (stop - start)
+        return revealed
+
+    def _own_row(self, row: int) -> Any:
+        """
+        Returns the discovered states of a row to modify them. A row that is shared with a snapshot is copied first, so the snapshots keep the original row (copy on write).
+
+        Args:
+            row (int): row of the cells
+
+        Returns:
+            Any: discovered states of the row, owned by the board
+        """
+        discovered = self._discovered[row]
+        if self._row_generation[row] != self._snapshot_generation:
+            discovered = self._discovered[row] = discovered[:]
+            self._row_generation[row] = self._snapshot_generation
+        return discovered
+
+    def _discovered_span(self, row: int, start: int, stop: int) -> bytes:
+        """
+        Returns the discovered states of the cells of a row between two columns.
+
+        Args:
+            row (int): row of the cells
+            start (int): first column
+            stop (int): column after the last column
+
+        Returns:
+            bytes: one byte per cell, 1 for a discovered cell
+        """
+        return bytes(self._discovered[row][start:stop])
+
+    def _restore_span(self, row: int, start: int, states: bytes) -> None:
+        """
+        Sets the discovered states of consecutive cells of a row, e.g. to hide the cells revealed by a move again.
+
+        Args:
+            row (int): row of the cells
+            start (int): first column
+            states (bytes): one byte per cell, 1 for a discovered cell
+        """
+        self._own_row(row)[start:start + len(states)] = [bool(state) for state in states]
+
+    def _blocked_span(self, row: int, start: int, stop: int) -> bytes:
+        """
+        Returns a mask of the cells of a row between two columns which is zero exactly for the safe cells without surrounding traps.
+
+        Args:
+            row (int): row of the cells
+            start (int): first column
+            stop (int): column after the last column
+
+        Returns:
+            bytes: one byte per cell, 1 if the cell contains a trap or has surrounding traps, 0 otherwise
+        """
+        return bytes(self._cell_trapped(row, col) or self._cell_surrounding(row, col) > 0 for col in range(start, stop))
+
+    def _flat_cells(self) -> tuple[bytes, bytes, bytes]:
+        """
+        Returns the cell storage as flat byte strings (indexed by row * width + col), e.g. to save the board.
+
+        Returns:
+            tuple[bytes, bytes, bytes]: traps (0 or 1), numbers of surrounding traps and discovered states (0 or 1), one byte per cell
+        """
+        return (bytes(chain.from_iterable(self._traps)), bytes(chain.from_iterable(self._surrounding)),
+                bytes(chain.from_iterable(self._discovered)))
+
+    def _set_discovered(self, discovered: bytes) -> None:
+        """
+        Marks the cells of a flat mask (indexed by row * width + col) as discovered, e.g. to restore a saved state of the game.
+        The cells are revealed without notifying the reveal listeners and without changing the number of discoverable cells.
+
+        Args:
+            discovered (bytes): one byte per cell, 1 for the discovered cells
+        """
+        width = self._width
+        for match in DISCOVERED_RUN.finditer(discovered):
+            cell, stop = match.span()
+            while cell < stop:
+                row, col = divmod(cell, width)
+                row_stop = min(stop - row * width, width)
+                self._reveal_span(row, col, row_stop)
+                cell = row * width + row_stop
+        self._frame = None
+
+    def snapshot(self) -> BoardSnapshot:
+        """
+        Takes a snapshot of the game state (discovered cells, number of safe cells left to discover and flags), e.g. to undo moves or to try out moves.
+        The snapshot shares the storage of the discovered cells with the board, and only the parts modified by later scans are copied, so taking a snapshot does not copy every cell.
+
+        Returns:
+            BoardSnapshot: state of the game, to be restored with restore
+        """
+        return BoardSnapshot(self._snapshot_cells(), self.discoverable, frozenset(self._flags))
+
+    def restore(self, snapshot: BoardSnapshot) -> None:
+        """
+        Restores the game state of a snapshot taken from this board. The snapshot stays valid, so it can be restored any number of times.
+        The reveal and scan listeners are not notified, so objects that follow the reveals (e.g. a Solver) have to be created again.
+
+        Args:
+            snapshot (BoardSnapshot): snapshot taken with snapshot
+        """
+        self._restore_cells(snapshot.cells)
+        self.discoverable = snapshot.discoverable
+        self._flags = set(snapshot.flags)
+        self._frame = None
+        self._dirty_rows.clear()
+
+    def begin_move(self) -> None:
+        """
+        Starts recording the cells revealed by the following scans as one move, until end_move, e.g. to undo the move.
+        Unlike a snapshot, the record of a move only keeps the spans the move revealed, so recording every move of a game takes at most a few bytes per revealed cell.
+        """
+        self._move = MoveRecord([], self.discoverable)
+
+    def end_move(self) -> MoveRecord:
+        """
+        Stops recording the current move.
+
+        Returns:
+            MoveRecord: cells revealed since begin_move, to be undone with undo_move (no spans if nothing was revealed)
+        """
+        move = self._move if self._move is not None else MoveRecord([], self.discoverable)
+        self._move = None
+        return move
+
+    def undo_move(self, move: MoveRecord) -> None:
+        """
+        Hides the cells revealed by a recorded move and restores the number of safe cells left to discover.
+        Moves are undone in the reverse order they were made, starting with the last one, since a record only holds the cells its move changed.
+        The reveal and scan listeners are not notified, so objects that follow the reveals (e.g. a Solver) have to be created again.
+
+        Args:
+            move (MoveRecord): record returned by end_move
+        """
+        # Spans of a move may overlap, so the earliest state of a cell is written last
+        for row, start, states in reversed(move.spans):
+            self._restore_span(row, start, states)
+            self._dirty_rows.add(row)
+        self.discoverable = move.discoverable
+
+    def _snapshot_cells(self) -> Any:
+        """
+        Returns the discovered states for a snapshot. The rows are shared with the snapshot, each row is copied by the first scan that modifies it.
+
+        Returns:
+            Any: tuple of the rows of discovered states
+        """
+        self._snapshot_generation += 1
+        return tuple(self._discovered)
+
+    def _restore_cells(self, cells: Any) -> None:
+        """
+        Restores the discovered states of a snapshot, sharing the rows with the snapshot.
+
+        Args:
+            cells (Any): tuple of the rows of discovered states
+        """
+        self._discovered = list(cells)
+        self._snapshot_generation += 1
+
+    def _label_zero_regions(self) -> "array[int]":
+        """
+        Labels the connected regions of safe cells without surrounding traps with a union-find over the horizontal runs of such cells.
+        Revealing a zero-region is then a bulk operation over its precomputed runs and their numbered border instead of a flood fill.
+
+        Returns:
+            array[int]: zero-region id of each flat cell index (-1 for cells with surrounding traps)
+        """
+        width = self._width
+        blocked = self._blocked_cells()
+
+        runs: list[tuple[int, int, int]] = []
+        # Union-find forest over the run indices
+        parent: list[int] = []
+
+        def find(run: int) -> int:
+            while parent[run] != run:
+                # Path halving keeps the trees flat
+                parent[run] = parent[parent[run]]
+                run = parent[run]
+            return run
+
+        previous_row: list[int] = []
+        for row in range(self._height):
+            base = row * width
+            current_row = []
+            for match in ZERO_RUN.finditer(blocked, base, base + width):
+                current_row.append(len(runs))
+                parent.append(len(runs))
+                runs.append((row, match.start() - base, match.end() - base))
+
+            # Runs of neighboring rows are connected if they overlap or touch diagonally
+            upper = lower = 0
+            while upper < len(previous_row) and lower < len(current_row):
+                _, upper_start, upper_stop = runs[previous_row[upper]]
+                _, lower_start, lower_stop = runs[current_row[lower]]
+                if upper_start <= lower_stop and lower_start <= upper_stop:
+                    parent[find(previous_row[upper])] = find(current_row[lower])
+                if upper_stop < lower_stop:
+                    upper += 1
                 else:
-                    # Print the numbers of traps surrounding each field if there is not trap in that cell
-                    printed_board += str(self._surrounding[row][col]) + " | "
-            # Print the separator after each row
-            printed_board += "\n"
-            printed_board += self._separator
-        return printed_board
+                    lower += 1
+            previous_row = current_row
+
+        region_of = array("i", [-1]) * (width * self._height)
+        region_ids: dict[int, int] = {}
+        region_runs: list[list[tuple[int, int, int]]] = []
+        for index, run in enumerate(runs):
+            root = find(index)
+            if root not in region_ids:
+                region_ids[root] = len(region_runs)
+                region_runs.append([])
+            region = region_ids[root]
+            region_runs[region].append(run)
+            row, start, stop = run
+            region_of[row * width + start:row * width + stop] = array("i", [region]) * (stop - start)
+
+        self._region_of = region_of
+        self._region_runs = region_runs
+        return region_of
+
+    def add_reveal_listener(self, listener: Callable[[int, int, int], None]) -> None:
+        """
+        Registers a function that is called for every span of cells revealed by scan_field, e.g. to update a solver incrementally.
+
+        Args:
+            listener (Callable[[int, int, int], None]): function called with the row, the first column and the column after the last column of the revealed cells
+        """
+        self._reveal_listeners.append(listener)
+
+    def remove_reveal_listener(self, listener: Callable[[int, int, int], None]) -> None:
+        """
+        Unregisters a function registered with add_reveal_listener.
+
+        Args:
+            listener (Callable[[int, int, int], None]): function to unregister
+        """
+        self._reveal_listeners.remove(listener)
+
+    def add_scan_listener(self, listener: Callable[[int, int, bool], None]) -> None:
+        """
+        Registers a function that is called for every call of scan_field, e.g. to record the moves of a game.
+
+        Args:
+            listener (Callable[[int, int, bool], None]): function called with the row and column of the scanned field and the result of the scan
+        """
+        self._scan_listeners.append(listener)
+
+    def remove_scan_listener(self, listener: Callable[[int, int, bool], None]) -> None:
+        """
+        Unregisters a function registered with add_scan_listener.
+
+        Args:
+            listener (Callable[[int, int, bool], None]): function to unregister
+        """
+        self._scan_listeners.remove(listener)
+
+    def _reveal(self, row: int, start: int, stop: int) -> int:
+        """
+        Reveals the cells of a row between two columns, marks the row for printing and notifies the reveal listeners.
+
+        Args:
+            row (int): row of the cells
+            start (int): first column to reveal
+            stop (int): column after the last column to reveal
+
+        Returns:
+            int: number of cells that had not been discovered before
+        """
+        batch = self._batch_revealed
+        if batch is not None:
+            # Collect the cells of the span that are not discovered yet, before they are revealed
+            batch.update((row, col) for col in range(start, stop) if not self._cell_discovered(row, col))
+        move = self._move
+        # Keep the states of the span before the reveal, to undo the move
+        before = self._discovered_span(row, start, stop) if move is not None else b""
+        revealed = self._reveal_span(row, start, stop)
+        if revealed:
+            if move is not None:
+                move.spans.append((row, start, before))
+            self._dirty_rows.add(row)
+            for listener in self._reveal_listeners:
+                listener(row, start, stop)
+        return revealed
+
+    def _reveal_region(self, region: int) -> int:
+        """
+        Reveals a zero-region together with its numbered border.
+
+        Args:
+            region (int): id of the zero-region
+
+        Returns:
+            int: number of cells that had not been discovered before
+        """
+        revealed = 0
+        last_row = self._height - 1
+        for row, start, stop in self._region_runs[region]:
+            # Every run reveals itself and the adjacent cells in the rows above and below
+            start = max(start - 1, 0)
+            stop = min(stop + 1, self._width)
+            for neighbor_row in range(max(row - 1, 0), min(row + 1, last_row) + 1):
+                revealed += self._reveal(neighbor_row, start, stop)
+        return revealed
+
+    def _zero_run(self, row: int, col: int) -> tuple[int, int]:
+        """
+        Returns the run of consecutive cells without surrounding traps that contains a cell, reading the row in steps of RUN_STEP columns.
+
+        Args:
+            row (int): row of the cell
+            col (int): column of a safe cell without surrounding traps
+
+        Returns:
+            tuple[int, int]: first column of the run and column after its last column
+        """
+        start = col
+        while start > 0:
+            low = max(start - RUN_STEP, 0)
+            blocked = self._blocked_span(row, low, start).rfind(1)
+            if blocked >= 0:
+                start = low + blocked + 1
+                break
+            start = low
+        stop = col
+        while stop < self._width:
+            high = min(stop + RUN_STEP, self._width)
+            blocked = self._blocked_span(row, stop, high).find(1)
+            if blocked >= 0:
+                stop += blocked
+                break
+            stop = high
+        return start, stop
+
+    def _flood_reveal(self, cells: list[tuple[int, int]]) -> int:
+        """
+        Reveals safe fields together with the trivially safe fields around them, by one flood fill over the horizontal runs of their zero-regions.
+        Unlike the zero-region index, which labels the whole board, the flood fill only reads the cells of the zero-regions and their borders, so boards that do not keep all cells at hand use it instead.
+
+        Args:
+            cells (list[tuple[int, int]]): rows and columns of the safe fields
+
+        Returns:
+            int: number of cells that had not been discovered before
+        """
+        if self._topology != "grid":
+            return self._neighbor_reveal(cells)
+        revealed = 0
+        stack = []
+        for row, col in cells:
+            if self._cell_surrounding(row, col):
+                revealed += self._reveal(row, col, col + 1)
+            else:
+                stack.append((row, col))
+
+        # First cells (row, column) of the runs already revealed, shared by all fields so that overlapping zero-regions are only filled once
+        visited: set[tuple[int, int]] = set()
+        while stack:
+            run_row, run_col = stack.pop()
+            start, stop = self._zero_run(run_row, run_col)
+            if (run_row, start) in visited:
+                continue
+            visited.add((run_row, start))
+
+            # The run reveals itself and the adjacent cells in the rows above and below
+            border_start = max(start - 1, 0)
+            border_stop = min(stop + 1, self._width)
+            for neighbor_row in range(max(run_row - 1, 0), min(run_row + 2, self._height)):
+                revealed += self._reveal(neighbor_row, border_start, border_stop)
+                if neighbor_row == run_row:
+                    continue
+                # Runs of the neighboring rows that overlap or touch the run diagonally belong to the same zero-region
+                for match in ZERO_RUN.finditer(self._blocked_span(neighbor_row, border_start, border_stop)):
+                    stack.append((neighbor_row, border_start + match.start()))
+        return revealed
+
+    def _neighbor_reveal(self, cells: list[tuple[int, int]]) -> int:
+        """
+        Reveals safe fields together with the trivially safe fields around them, by a flood fill over the cells in the neighbor index.
+        Unlike the flood fill over horizontal runs, it spreads to the neighbors of any topology (e.g. across the borders of a torus).
+
+        Args:
+            cells (list[tuple[int, int]]): rows and columns of the safe fields
+
+        Returns:
+            int: number of cells that had not been discovered before
+        """
+        width = self._width
+        rows = self.neighbor_table.rows
+        revealed = 0
+        # Flat indices of the cells already queued, shared by all fields so that overlapping zero-regions are only filled once
+        seen = {row * width + col for row, col in cells}
+        stack = list(seen)
+        while stack:
+            cell = stack.pop()
+            row, col = divmod(cell, width)
+            revealed += self._reveal(row, col, col + 1)
+            if self._cell_surrounding(row, col):
+                continue
+            base = row * width
+            for neighbor in rows[row][col]:
+                neighbor += base
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    stack.append(neighbor)
+        return revealed
 
     def scan_field(self, row: int, col: int) -> bool:
         """
@@ -180,60 +912,172 @@ class Board:
         Returns:
             bool: Boolean indicating whether the field is safe or not
         """
-        if self._discovered[row][col]:
-            # Avoid scanning the same field twice
-            return True
+        safe = self._scan(row, col)
+        for listener in self._scan_listeners:
+            listener(row, col, safe)
+        return safe
 
-        # Check if the field is a trap; if it is, return False
-        if self._traps[row][col]:
-            self._discovered[row][col] = True
-            self.discoverable -= 1
-            return False
+    def scan_many(self, cells: Iterable[tuple[int, int]]) -> ScanResult:
+        """
+        Scans several fields at once. The results and the discovered cells are the same as those of calling scan_field for every field in order,
+        but the fields are checked in one pass and the zero-regions of all safe fields are revealed together, so every zero-region is filled only once.
 
-        # If the field is not a trap reveal all trivially safe fields surrounding the field that can be deduced from the current field
-        # Trivially safe fields are fields that cannot be traps because they are adjacent to a field that has zero surrounding traps
-        # Use a queue to keep track of the fields to be revealed
-        # Use a set to keep track of the fields that have already been checked to avoid infinite loops
-        queue = set()
-        checked = set()
-        queue.add((row, col))
-        while queue:
-            # Get the next field to be revealed from the queue
-            row, col = queue.pop()
+        Args:
+            cells (Iterable[tuple[int, int]]): rows and columns of the fields to scan, e.g. a list of tuples or an array with two columns
 
-            # Reveal the field
-            self._discovered[row][col] = True
+        Raises:
+            ValueError: If a field is outside of the board
 
-            # Decrement the number of discoverable fields
-            self.discoverable -= 1
+        Returns:
+            ScanResult: result of every field (False for a trap) and all cells discovered by the scans
+        """
+        fields = [(int(row), int(col)) for row, col in cells]
+        for row, col in fields:
+            if not (0 <= row < self._height and 0 <= col < self._width):
+                raise ValueError(f"The field ({row}, {col}) is outside of the board.")
+
+        outcomes = []
+        safe_fields = []
+        self._batch_revealed = revealed = set()
+        try:
+            for row, col in fields:
+                if not self._cell_trapped(row, col):
+                    # Safe fields are revealed together below, scanning one twice does not change its result
+                    outcomes.append(True)
+                    if not self._cell_discovered(row, col):
+                        safe_fields.append((row, col))
+                elif self._cell_discovered(row, col):
+                    # A trap that has already been revealed is not scanned again
+                    outcomes.append(True)
+                else:
+                    self.discoverable -= self._reveal(row, col, col + 1)
+                    outcomes.append(False)
+            if safe_fields:
+                self.discoverable -= self._reveal_safe(safe_fields)
+        finally:
+            self._batch_revealed = None
+
+        for listener in self._scan_listeners:
+            for (row, col), safe in zip(fields, outcomes):
+                listener(row, col, safe)
+        return ScanResult(outcomes, revealed)
+
+    def flag(self, row: int, col: int) -> None:
+        """
+        Flags an undiscovered field as a trap. Flags are only a note of the player: scan_field still scans flagged fields, chord does not.
+
+        Args:
+            row (int): row of the field
+            col (int): column of the field
+
+        Raises:
+            ValueError: If the field is outside of the board or already discovered
+        """
+        if not (0 <= row < self._height and 0 <= col < self._width):
+            raise ValueError(f"The field ({row}, {col}) is outside of the board.")
+        if self._cell_discovered(row, col):
+            raise ValueError("Discovered fields cannot be flagged.")
+        self._flags.add(row * self._width + col)
+
+    def unflag(self, row: int, col: int) -> None:
+        """
+        Removes the flag of a field, if it has one.
 
-            # Add the field to the set of checked fields
-            checked.add((row, col))
+        Args:
+            row (int): row of the field
+            col (int): column of the field
+        """
+        self._flags.discard(row * self._width + col)
 
-            if self._surrounding[row][col] == 0:
-                # Add the surrounding fields to the queue if they have not been checked yet
+    def is_flagged(self, row: int, col: int) -> bool:
+        """
+        Returns whether a field is flagged as a trap.
 
-                if row > 0 and (row - 1, col) not in checked:
-                    queue.add((row - 1, col))
+        Args:
+            row (int): row of the field
+            col (int): column of the field
 
-                if row < self.height - 1 and (row + 1, col) not in checked:
-                    queue.add((row + 1, col))
+        Returns:
+            bool: True if the field is flagged
+        """
+        return row * self._width + col in self._flags
+
+    def chord(self, row: int, col: int) -> ScanResult:
+        """
+        Scans all unflagged, undiscovered neighbors of a discovered field whose number of surrounding traps equals its number of flagged neighbors, in one call of scan_many.
+        If a flag is wrong, a trap is scanned and its result is False.
+
+        Args:
+            row (int): row of the discovered field
+            col (int): column of the discovered field
 
-                if col > 0 and (row, col - 1) not in checked:
-                    queue.add((row, col - 1))
+        Returns:
+            ScanResult: results of the scanned neighbors, empty if the field is undiscovered, a trap or its number does not match the flags
+        """
+        count = self.revealed_count(row, col)
+        if count is None:
+            return ScanResult([], set())
+        neighbors = self.neighbors(row, col)
+        flagged = sum(self.is_flagged(neighbor_row, neighbor_col) for neighbor_row, neighbor_col in neighbors)
+        if flagged != count:
+            return ScanResult([], set())
+        return self.scan_many([(neighbor_row, neighbor_col) for neighbor_row, neighbor_col in neighbors
+                               if not self.is_flagged(neighbor_row, neighbor_col) and not self._cell_discovered(neighbor_row, neighbor_col)])
 
-                if col < self.width - 1 and (row, col + 1) not in checked:
-                    queue.add((row, col + 1))
+    def _scan(self, row: int, col: int) -> bool:
+        """
+        Scans a field on the board without notifying the scan listeners.
 
-                if row > 0 and col > 0 and (row - 1, col - 1) not in checked:
-                    queue.add((row - 1, col - 1))
+        Args:
+            row (int): row of the field to be scanned
+            col (int): column of the field to be scanned
 
-                if row > 0 and col < self.width - 1 and (row - 1, col + 1) not in checked:
-                    queue.add((row - 1, col + 1))
+        Returns:
+            bool: Boolean indicating whether the field is safe or not
+        """
+        if self._cell_discovered(row, col):
+            # Avoid scanning the same field twice
+            return True
 
-                if row < self.height - 1 and col > 0 and (row + 1, col - 1) not in checked:
-                    queue.add((row + 1, col - 1))
+        # Check if the field is a trap; if it is, return False
+        if self._cell_trapped(row, col):
+            self.discoverable -= self._reveal(row, col, col + 1)
+            return False
 
-                if row < self.height - 1 and col < self.width - 1 and (row + 1, col + 1) not in checked:
-                    queue.add((row + 1, col + 1))
+        # If the field is not a trap reveal all trivially safe fields surrounding the field that can be deduced from the current field
+        # Trivially safe fields are fields that cannot be traps because they are adjacent to a field that has zero surrounding traps
+        self.discoverable -= self._reveal_safe([(row, col)])
         return True
+
+    def _reveal_safe(self, cells: list[tuple[int, int]]) -> int:
+        """
+        Reveals safe fields together with the trivially safe fields around them.
+        Those fields are exactly the zero-regions of the fields and their numbered borders, which are labelled once per board, and every zero-region is revealed only once.
+
+        Args:
+            cells (list[tuple[int, int]]): rows and columns of the safe fields
+
+        Returns:
+            int: number of cells that had not been discovered before
+        """
+        if self._topology != "grid":
+            # The zero-region index connects the runs of adjacent rows like the cells of a bounded grid
+            return self._neighbor_reveal(cells)
+        region_of = self._region_of
+        if region_of is None:
+            if all(self._cell_surrounding(row, col) for row, col in cells):
+                # Fields with surrounding traps only reveal themselves, so the index is not built until a field opens a zero-region
+                return sum(self._reveal(row, col, col + 1) for row, col in cells)
+            region_of = self._label_zero_regions()
+        revealed = 0
+        regions: dict[int, None] = {}
+        for row, col in cells:
+            region = region_of[row * self._width + col]
+            if region < 0:
+                # The field has surrounding traps, so only the field itself is revealed
+                revealed += self._reveal(row, col, col + 1)
+            else:
+                regions[region] = None
+        for region in regions:
+            revealed += self._reveal_region(region)
+        return revealed
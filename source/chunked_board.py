@@ -0,0 +1,479 @@
+"""
+Chunked board module for the abandoned space station game, generates the cells of huge boards lazily
+"""
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+from random import Random
+from typing import Any
+
+from source.array_board import BOARD_CHARACTERS, SOLUTION_CHARACTERS
+from source.board import NON_ZERO, Board
+
+# Default width and height of a chunk in cells
+CHUNK_SIZE = 64
+
+
+class ChunkedBoard(Board):
+    """
+    This class represents a board with the same public interface as the Board class, whose cells are split into square chunks that are only generated once they are touched by scan_field or by printing.
+    The traps of a chunk are drawn from a random number generator seeded with the board's chunk seed and the chunk position, so every chunk is the same no matter in which order the chunks are generated, and the numbers of surrounding traps at the chunk borders stay consistent.
+    Memory therefore grows with the explored area (plus a ring of chunks whose traps are generated), not with the size of the board.
+    """
+    def __init__(self, width: int = 0, height: int = 0, density: float | None = None, seed: int | None = None, rng: Random | None = None,
+                 topology: str = "grid", chunk_size: int = CHUNK_SIZE):
+        """
+        Initializes the board without generating any chunk.
+
+        Args:
+            width (int, optional): Board width (number of columns). Defaults to 0.
+            height (int, optional): Board height (number of rows). Defaults to 0.
+            density (float | None, optional): Fraction of cells that contain a trap. Defaults to None (random fraction between 1/10 and 1/3).
+            seed (int | None, optional): Seed for the board's random number generator. Defaults to None (random seed).
+            rng (Random | None, optional): Random number generator to use instead of a seeded one. Defaults to None.
+            topology (str, optional): Name of the topology, only "grid" is supported since the chunks count their surrounding traps in a bounded grid. Defaults to "grid".
+            chunk_size (int, optional): Width and height of a chunk in cells. Defaults to CHUNK_SIZE.
+
+        Raises:
+            ValueError: If the density is not between 0 and 1 or the topology is not "grid"
+        """
+        if topology != "grid":
+            raise ValueError("Chunked boards only support the grid topology.")
+        # Width and height of a chunk
+        self._chunk_size = chunk_size
+        super().__init__(width, height, density=density, seed=seed, rng=rng, topology=topology)
+
+    def _create_cells(self) -> None:
+        """
+        Sets up the empty chunk storage: no cell is allocated until its chunk is touched.
+        """
+        # Number of chunks per row of chunks
+        self._chunk_cols = -(-self._width // self._chunk_size)
+
+        # Traps (one byte per cell, 0 or 1) of the chunks generated so far, indexed by (chunk row, chunk column)
+        # Traps are also generated for the neighbors of touched chunks, to count the surrounding traps at the chunk borders
+        self._chunk_traps: dict[tuple[int, int], bytearray] = {}
+
+        # Numbers of surrounding traps and discovered states of the touched chunks
+        self._chunk_surrounding: dict[tuple[int, int], bytearray] = {}
+        self._chunk_discovered: dict[tuple[int, int], bytearray] = {}
+
+        # Chunks whose discovered states are shared with a snapshot, and are copied before they are modified
+        self._shared_chunks: set[tuple[int, int]] = set()
+
+    def _place_traps(self, num_traps: int = 2) -> None:
+        """
+        Decides how many traps the board has and draws the seed of the chunks, the traps themselves are placed when their chunks are generated.
+        """
+        self._region_of = None
+        self._num_traps = num_traps
+        self._chunk_seed = self._rng.getrandbits(63)
+
+    @property
+    def generated_chunks(self) -> int:
+        """
+        Returns the number of chunks that have been touched so far.
+
+        Returns:
+            int: number of chunks with generated surrounding traps and discovered states
+        """
+        return len(self._chunk_surrounding)
+
+    def _chunk_shape(self, chunk: tuple[int, int]) -> tuple[int, int]:
+        """
+        Returns the size of a chunk, which is smaller than the chunk size at the right and bottom border of the board.
+
+        Args:
+            chunk (tuple[int, int]): chunk row and chunk column
+
+        Returns:
+            tuple[int, int]: width and height of the chunk
+        """
+        size = self._chunk_size
+        return min(size, self._width - chunk[1] * size), min(size, self._height - chunk[0] * size)
+
+    def _traps_before(self, chunk: tuple[int, int]) -> int:
+        """
+        Returns the number of traps in the chunks before a chunk (in row-major order of the chunks).
+        The traps are spread proportionally to the number of cells, so every chunk gets its share of the board's traps without generating the other chunks.
+
+        Args:
+            chunk (tuple[int, int]): chunk row and chunk column
+
+        Returns:
+            int: number of traps in the previous chunks
+        """
+        chunk_row, chunk_col = chunk
+        size = self._chunk_size
+        cells_before = min(chunk_row * size, self._height) * self._width + chunk_col * size * min(size, self._height - chunk_row * size)
+        num_cells = self._width * self._height
+        return cells_before * self._num_traps // num_cells if num_cells else 0
+
+    def _traps_of(self, chunk: tuple[int, int]) -> bytearray:
+        """
+        Returns the traps of a chunk, generating them on first use.
+
+        Args:
+            chunk (tuple[int, int]): chunk row and chunk column
+
+        Returns:
+            bytearray: one byte per cell of the chunk (row-major), 1 for a trap
+        """
+        traps = self._chunk_traps.get(chunk)
+        if traps is None:
+            width, height = self._chunk_shape(chunk)
+            if chunk[1] + 1 < self._chunk_cols:
+                following = (chunk[0], chunk[1] + 1)
+            else:
+                following = (chunk[0] + 1, 0)
+            num_traps = self._traps_before(following) - self._traps_before(chunk)
+            traps = bytearray(width * height)
+            # The generator only depends on the chunk position, so chunks can be generated in any order
+            for cell in Random(f"{self._chunk_seed}-{chunk[0]}-{chunk[1]}").sample(range(width * height), num_traps):
+                traps[cell] = 1
+            self._chunk_traps[chunk] = traps
+        return traps
+
+    def _touch(self, chunk: tuple[int, int]) -> None:
+        """
+        Generates the numbers of surrounding traps and the discovered states of a chunk, if it has not been touched yet.
+        The traps of the chunk and its neighbors are copied into a grid with a one cell margin, whose neighbor sums are computed at once like in ArrayBoard.
+
+        Args:
+            chunk (tuple[int, int]): chunk row and chunk column
+        """
+        if chunk in self._chunk_surrounding:
+            return
+        size = self._chunk_size
+        width, height = self._chunk_shape(chunk)
+        top = chunk[0] * size
+        left = chunk[1] * size
+
+        # Traps of the chunk with a margin of one cell on every side (cells outside the board stay 0)
+        padded_width = width + 2
+        padded = bytearray(padded_width * (height + 2))
+        for padded_row in range(height + 2):
+            row = top + padded_row - 1
+            if not 0 <= row < self._height:
+                continue
+            start = max(left - 1, 0)
+            stop = min(left + width + 1, self._width)
+            offset = padded_row * padded_width + start - (left - 1)
+            padded[offset:offset + stop - start] = self._trap_span(row, start, stop)
+
+        # Neighbor sums of the padded grid, values that wrap around from one row into the next only affect the margin
+        num_padded = len(padded)
+        traps = int.from_bytes(padded, "little")
+        horizontal = traps + (traps << 8) + (traps >> 8)
+        row_shift = 8 * padded_width
+        block = horizontal + (horizontal << row_shift) + (horizontal >> row_shift)
+        counts = ((block - traps) & ((1 << (8 * num_padded)) - 1)).to_bytes(num_padded, "little")
+
+        surrounding = bytearray(width * height)
+        for row in range(height):
+            offset = (row + 1) * padded_width + 1
+            surrounding[row * width:(row + 1) * width] = counts[offset:offset + width]
+        self._chunk_surrounding[chunk] = surrounding
+        self._chunk_discovered[chunk] = bytearray(width * height)
+
+    def _segments(self, row: int, start: int, stop: int) -> list[tuple[tuple[int, int], int, int]]:
+        """
+        Splits the cells of a row between two columns into the parts that lie in the same chunk.
+
+        Args:
+            row (int): row of the cells
+            start (int): first column
+            stop (int): column after the last column
+
+        Returns:
+            list[tuple[tuple[int, int], int, int]]: chunk, and flat indices of the first cell and after the last cell inside the chunk's storage
+        """
+        size = self._chunk_size
+        chunk_row, local_row = divmod(row, size)
+        segments = []
+        col = start
+        while col < stop:
+            chunk_col, local_col = divmod(col, size)
+            chunk = (chunk_row, chunk_col)
+            width = min(size, self._width - chunk_col * size)
+            count = min(width - local_col, stop - col)
+            first = local_row * width + local_col
+            segments.append((chunk, first, first + count))
+            col += count
+        return segments
+
+    def _trap_span(self, row: int, start: int, stop: int) -> bytes:
+        """
+        Returns the traps of the cells of a row between two columns, without touching their chunks.
+
+        Args:
+            row (int): row of the cells
+            start (int): first column
+            stop (int): column after the last column
+
+        Returns:
+            bytes: one byte per cell, 1 for a trap
+        """
+        return b"".join(self._traps_of(chunk)[first:last] for chunk, first, last in self._segments(row, start, stop))
+
+    def _span(self, cells: dict[tuple[int, int], bytearray], row: int, start: int, stop: int) -> bytes:
+        """
+        Returns the values of the cells of a row between two columns from the storage of their chunks, touching the chunks.
+
+        Args:
+            cells (dict[tuple[int, int], bytearray]): storage of the chunks (surrounding traps or discovered states)
+            row (int): row of the cells
+            start (int): first column
+            stop (int): column after the last column
+
+        Returns:
+            bytes: one byte per cell
+        """
+        parts = []
+        for chunk, first, last in self._segments(row, start, stop):
+            self._touch(chunk)
+            parts.append(cells[chunk][first:last])
+        return b"".join(parts)
+
+    def _cell(self, row: int, col: int) -> tuple[tuple[int, int], int]:
+        """
+        Returns the chunk of a cell and the cell's index inside the chunk's storage.
+
+        Args:
+            row (int): row of the cell
+            col (int): column of the cell
+
+        Returns:
+            tuple[tuple[int, int], int]: chunk and flat index inside the chunk
+        """
+        size = self._chunk_size
+        chunk_row, local_row = divmod(row, size)
+        chunk_col, local_col = divmod(col, size)
+        width = min(size, self._width - chunk_col * size)
+        return (chunk_row, chunk_col), local_row * width + local_col
+
+    def _cell_trapped(self, row: int, col: int) -> bool:
+        """
+        Returns whether there is a trap in a cell.
+
+        Args:
+            row (int): row of the cell
+            col (int): column of the cell
+
+        Returns:
+            bool: True if the cell contains a trap
+        """
+        chunk, index = self._cell(row, col)
+        return bool(self._traps_of(chunk)[index])
+
+    def _cell_discovered(self, row: int, col: int) -> bool:
+        """
+        Returns whether a cell has been discovered. Cells of untouched chunks are undiscovered, so they are not generated.
+
+        Args:
+            row (int): row of the cell
+            col (int): column of the cell
+
+        Returns:
+            bool: True if the cell has been discovered
+        """
+        chunk, index = self._cell(row, col)
+        discovered = self._chunk_discovered.get(chunk)
+        return discovered is not None and bool(discovered[index])
+
+    def _cell_surrounding(self, row: int, col: int) -> int:
+        """
+        Returns the number of traps surrounding a cell.
+
+        Args:
+            row (int): row of the cell
+            col (int): column of the cell
+
+        Returns:
+            int: number of surrounding traps
+        """
+        chunk, index = self._cell(row, col)
+        self._touch(chunk)
+        return self._chunk_surrounding[chunk][index]
+
+    def _render_row(self, row: int) -> str:
+        """
+        Returns the printed form of a row, followed by the separator.
+
+        Args:
+            row (int): row to render
+
+        Returns:
+            str: printed row, undiscovered cells are shown as question marks
+        """
+        surrounding = self._span(self._chunk_surrounding, row, 0, self._width)
+        discovered = self._span(self._chunk_discovered, row, 0, self._width)
+        # Undiscovered cells get the code 16 + number of surrounding traps, discovered cells keep the number itself
+        undiscovered = int.from_bytes(b"\x10" * self._width, "little")
+        codes = (int.from_bytes(surrounding, "little") + undiscovered - (int.from_bytes(discovered, "little") << 4)).to_bytes(self._width, "little")
+        cells = " | ".join(codes.translate(BOARD_CHARACTERS).decode("ascii"))
+        return f"{row} | {cells} | \n{self._separator}"
+
+    def _render_solution_row(self, row: int) -> str:
+        """
+        Returns the solution of a row, followed by the separator.
+
+        Args:
+            row (int): row to render
+
+        Returns:
+            str: printed row, traps are shown as X's
+        """
+        surrounding = self._span(self._chunk_surrounding, row, 0, self._width)
+        traps = self._trap_span(row, 0, self._width)
+        # Trapped cells get the code 16 + number of surrounding traps, all other cells keep the number itself
+        codes = (int.from_bytes(surrounding, "little") | int.from_bytes(traps, "little") << 4).to_bytes(self._width, "little")
+        cells = " | ".join(codes.translate(SOLUTION_CHARACTERS).decode("ascii"))
+        return f"{row} | {cells} | \n{self._separator}"
+
+    def _blocked_span(self, row: int, start: int, stop: int) -> bytes:
+        """
+        Returns a mask of the cells of a row between two columns which is zero exactly for the safe cells without surrounding traps.
+
+        Args:
+            row (int): row of the cells
+            start (int): first column
+            stop (int): column after the last column
+
+        Returns:
+            bytes: one byte per cell, 1 if the cell contains a trap or has surrounding traps, 0 otherwise
+        """
+        traps = int.from_bytes(self._trap_span(row, start, stop), "little")
+        surrounding = int.from_bytes(self._span(self._chunk_surrounding, row, start, stop), "little")
+        return (traps | surrounding).to_bytes(stop - start, "little").translate(NON_ZERO)
+
+    def _blocked_cells(self) -> bytes:
+        """
+        Returns a flat mask (indexed by row * width + col) which is zero exactly for the safe cells without surrounding traps. This touches every chunk.
+
+        Returns:
+            bytes: one byte per cell, non-zero if the cell contains a trap or has surrounding traps
+        """
+        return b"".join(self._blocked_span(row, 0, self._width) for row in range(self._height))
+
+    def _flat_cells(self) -> tuple[bytes, bytes, bytes]:
+        """
+        Returns the cell storage as flat byte strings (indexed by row * width + col). This touches every chunk.
+
+        Returns:
+            tuple[bytes, bytes, bytes]: traps (0 or 1), numbers of surrounding traps and discovered states (0 or 1), one byte per cell
+        """
+        rows = range(self._height)
+        return (b"".join(self._trap_span(row, 0, self._width) for row in rows),
+                b"".join(self._span(self._chunk_surrounding, row, 0, self._width) for row in rows),
+                b"".join(self._span(self._chunk_discovered, row, 0, self._width) for row in rows))
+
+    def _reveal_span(self, row: int, start: int, stop: int) -> int:
+        """
+        Marks the cells of a row between two columns as discovered.
+
+        Args:
+            row (int): row of the cells
+            start (int): first column to reveal
+            stop (int): column after the last column to reveal
+
+        Returns:
+            int: number of cells that had not been discovered before
+        """
+        revealed = 0
+        for chunk, first, last in self._segments(row, start, stop):
+            self._touch(chunk)
+            discovered = self._chunk_discovered[chunk]
+            undiscovered = last - first - discovered.count(1, first, last)
+            if not undiscovered:
+                continue
+            revealed += undiscovered
+            self._own_chunk(chunk)[first:last] = b"\x01" * (last - first)
+        return revealed
+
+    def _own_chunk(self, chunk: tuple[int, int]) -> bytearray:
+        """
+        Returns the discovered states of a touched chunk to modify them. A chunk that is shared with a snapshot is copied first, so the snapshots keep the original chunk (copy on write).
+
+        Args:
+            chunk (tuple[int, int]): chunk row and chunk column
+
+        Returns:
+            bytearray: discovered states of the chunk, owned by the board
+        """
+        discovered = self._chunk_discovered[chunk]
+        if chunk in self._shared_chunks:
+            self._shared_chunks.discard(chunk)
+            discovered = self._chunk_discovered[chunk] = bytearray(discovered)
+        return discovered
+
+    def _discovered_span(self, row: int, start: int, stop: int) -> bytes:
+        """
+        Returns the discovered states of the cells of a row between two columns, touching their chunks.
+
+        Args:
+            row (int): row of the cells
+            start (int): first column
+            stop (int): column after the last column
+
+        Returns:
+            bytes: one byte per cell, 1 for a discovered cell
+        """
+        return self._span(self._chunk_discovered, row, start, stop)
+
+    def _restore_span(self, row: int, start: int, states: bytes) -> None:
+        """
+        Sets the discovered states of consecutive cells of a row, e.g. to hide the cells revealed by a move again.
+
+        Args:
+            row (int): row of the cells
+            start (int): first column
+            states (bytes): one byte per cell, 1 for a discovered cell
+        """
+        offset = 0
+        for chunk, first, last in self._segments(row, start, start + len(states)):
+            self._touch(chunk)
+            self._own_chunk(chunk)[first:last] = states[offset:offset + last - first]
+            offset += last - first
+
+    def _snapshot_cells(self) -> Any:
+        """
+        Returns the discovered states for a snapshot. The chunks are shared with the snapshot, each chunk is copied by the first scan that modifies it.
+
+        Returns:
+            Any: discovered states of the touched chunks
+        """
+        self._shared_chunks = set(self._chunk_discovered)
+        return dict(self._chunk_discovered)
+
+    def _restore_cells(self, cells: Any) -> None:
+        """
+        Restores the discovered states of a snapshot, sharing the chunks with the snapshot.
+        Chunks touched after the snapshot keep their surrounding traps, with all their cells undiscovered.
+
+        Args:
+            cells (Any): discovered states of the touched chunks
+        """
+        self._chunk_discovered = dict(cells)
+        self._shared_chunks = set(cells)
+        for chunk in self._chunk_surrounding:
+            if chunk not in self._chunk_discovered:
+                self._chunk_discovered[chunk] = bytearray(len(self._chunk_surrounding[chunk]))
+
+    def _reveal_safe(self, cells: list[tuple[int, int]]) -> int:
+        """
+        Reveals safe fields together with the trivially safe fields around them by a flood fill, so only the chunks around their zero-regions are generated.
+
+        Args:
+            cells (list[tuple[int, int]]): rows and columns of the safe fields
+
+        Returns:
+            int: number of cells that had not been discovered before
+        """
+        return self._flood_reveal(cells)
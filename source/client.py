@@ -0,0 +1,262 @@
+"""
+Client module for the abandoned space station game server
+"""
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+import argparse
+import asyncio
+from collections.abc import AsyncIterator
+
+from source.server import DEFAULT_HOST, DEFAULT_PORT, MAX_CELLS
+from source.spectate import SpectatorView
+
+# Longest line the client reads, enough for a keyframe of the largest board of a spectator feed
+LINE_LIMIT = MAX_CELLS + 1024
+
+
+class ServerError(Exception):
+    """
+    Raised when the server answers a command with an error.
+    """
+
+
+class GameClient:
+    """
+    This class talks to a game server over one connection, i.e. one game session.
+    """
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Initializes the client on an open connection, use GameClient.connect to open one.
+
+        Args:
+            reader (asyncio.StreamReader): stream of the server's responses
+            writer (asyncio.StreamWriter): stream of the commands
+        """
+        self._reader = reader
+        self._writer = writer
+
+    @classmethod
+    async def connect(cls, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> "GameClient":
+        """
+        Connects to a game server.
+
+        Args:
+            host (str, optional): Address of the server. Defaults to DEFAULT_HOST.
+            port (int, optional): Port of the server. Defaults to DEFAULT_PORT.
+
+        Returns:
+            GameClient: client with a new session
+        """
+        reader, writer = await asyncio.open_connection(host, port, limit=LINE_LIMIT)
+        return cls(reader, writer)
+
+    async def _request(self, command: str) -> str:
+        """
+        Sends a command and reads the first line of its response.
+
+        Args:
+            command (str): command without the line break
+
+        Raises:
+            ServerError: If the server answers with an error
+            ConnectionError: If the server closed the connection
+
+        Returns:
+            str: first line of the response, without the line break
+        """
+        self._writer.write(f"{command}\n".encode("utf-8"))
+        await self._writer.drain()
+        return await self._read_line()
+
+    async def _read_line(self) -> str:
+        """
+        Reads a line of a response.
+
+        Raises:
+            ServerError: If the line is an error
+            ConnectionError: If the server closed the connection
+
+        Returns:
+            str: line without the line break
+        """
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("The server closed the connection.")
+        response = line.decode("utf-8").rstrip("\n")
+        if response.startswith("ERR "):
+            raise ServerError(response[4:])
+        return response
+
+    async def new_game(self, width: int = 0, height: int = 0, density: float | None = None, seed: int | None = None,
+                       no_guess: bool = False) -> tuple[int, int, int]:
+        """
+        Starts a new game.
+
+        Args:
+            width (int, optional): Board width. Defaults to 0 (random width).
+            height (int, optional): Board height. Defaults to 0 (random height).
+            density (float | None, optional): Fraction of trapped cells. Defaults to None (random fraction).
+            seed (int | None, optional): Seed of the board, requires a density. Defaults to None (random seed).
+            no_guess (bool, optional): Whether the board can be solved without guessing, the server scans its start before the game begins. Defaults to False.
+
+        Returns:
+            tuple[int, int, int]: width and height of the board and number of safe cells left
+        """
+        args = [str(width), str(height)]
+        if density is not None:
+            args.append(str(density))
+            if seed is not None:
+                args.append(str(seed))
+        if no_guess:
+            args.append("NOGUESS")
+        # A board without guessing is followed by the row and column of its start, which the rendered board shows as well
+        _, width, height, discoverable, *_ = (await self._request("NEW " + " ".join(args))).split()
+        return int(width), int(height), int(discoverable)
+
+    async def scan(self, row: int, col: int) -> tuple[str, int]:
+        """
+        Scans a cell.
+
+        Args:
+            row (int): row of the cell
+            col (int): column of the cell
+
+        Returns:
+            tuple[str, int]: outcome (SAFE, WON or TRAP) and number of safe cells left to discover (0 once the game is over)
+        """
+        outcome, *left = (await self._request(f"SCAN {row} {col}")).split()
+        return outcome, int(left[0]) if left else 0
+
+    async def render(self) -> str:
+        """
+        Returns the printed board of the current game.
+
+        Returns:
+            str: printed board, undiscovered cells are shown as question marks
+        """
+        _, count = (await self._request("RENDER")).split()
+        lines = [await self._read_line() for _ in range(int(count))]
+        return "\n".join(lines) + "\n"
+
+    async def session_id(self) -> int:
+        """
+        Returns the id of the session, which spectators watch its games with.
+
+        Returns:
+            int: id of the session
+        """
+        _, session_id = (await self._request("SESSION")).split()
+        return int(session_id)
+
+    async def watch(self, session_id: int) -> AsyncIterator[str]:
+        """
+        Watches the games of another session. The connection only receives the frames of the session's spectator feed afterwards.
+
+        Args:
+            session_id (int): id of the watched session
+
+        Yields:
+            str: frames (see source/spectate.py) without the line break, until the watched session ends
+        """
+        await self._request(f"WATCH {session_id}")
+        while True:
+            line = await self._reader.readline()
+            if not line:
+                return
+            frame = line.decode("utf-8").rstrip("\n")
+            yield frame
+            if frame.startswith("CLOSED "):
+                return
+
+    async def close(self) -> None:
+        """
+        Ends the session and closes the connection.
+        """
+        try:
+            await self._request("QUIT")
+        except (ConnectionError, ServerError):
+            pass
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def play(host: str, port: int) -> None:
+    """
+    Plays games on a server from the terminal.
+
+    Args:
+        host (str): address of the server
+        port (int): port of the server
+    """
+    client = await GameClient.connect(host, port)
+    try:
+        print(f"Others can watch your games with: python source/client.py --port {port} --watch {await client.session_id()}")
+        while True:
+            await client.new_game()
+            outcome = "SAFE"
+            while outcome == "SAFE":
+                print(await client.render())
+                print("Enter the row and column of the cell you want to scan (e.g. 1 2), or q to quit: ")
+                line = await asyncio.to_thread(input)
+                if line.strip().lower() == "q":
+                    return
+                try:
+                    row, col = map(int, line.split())
+                    outcome, _ = await client.scan(row, col)
+                except (ValueError, ServerError) as error:
+                    print(f"Invalid input: {error}")
+            print(await client.render())
+            print("Congratulations! You have found all the safe cells!" if outcome == "WON" else "Oh no, you stepped on a trap! Game over.")
+    finally:
+        await client.close()
+
+
+async def spectate(host: str, port: int, session_id: int) -> None:
+    """
+    Prints the board of another session's games after every move.
+
+    Args:
+        host (str): address of the server
+        port (int): port of the server
+        session_id (int): id of the watched session
+    """
+    client = await GameClient.connect(host, port)
+    view = SpectatorView()
+    try:
+        async for frame in client.watch(session_id):
+            view.apply(frame)
+            if frame.startswith(("KEY ", "DELTA ")):
+                print(view)
+            if frame.startswith("END ") and view.result is not None:
+                print(f"The game was {view.result.lower()}.")
+    finally:
+        await client.close()
+
+
+def main() -> None:
+    """
+    Command line interface of the client.
+    """
+    parser = argparse.ArgumentParser(description="Play abandoned space station games on a server.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="address of the server")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port of the server")
+    parser.add_argument("--watch", type=int, default=None, metavar="SESSION", help="watch the games of a session instead of playing")
+    args = parser.parse_args()
+    try:
+        asyncio.run(play(args.host, args.port) if args.watch is None else spectate(args.host, args.port, args.watch))
+    except (KeyboardInterrupt, EOFError):
+        pass
+
+
+if __name__ == "__main__":
+    main()
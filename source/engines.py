@@ -0,0 +1,46 @@
+"""
+Board engine selection for the abandoned space station game
+"""
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+from source.array_board import ArrayBoard
+from source.board import Board
+from source.chunked_board import ChunkedBoard
+
+# Available board storage engines, selectable by name
+BOARD_ENGINES: dict[str, type[Board]] = {
+    "list": Board,
+    "array": ArrayBoard,
+    "chunked": ChunkedBoard,
+}
+
+
+def create_board(width: int = 0, height: int = 0, engine: str = "list", density: float | None = None, seed: int | None = None,
+                 topology: str = "grid") -> Board:
+    """
+    Creates a new board using the given storage engine.
+
+    Args:
+        width (int, optional): Board width (number of columns). Defaults to 0.
+        height (int, optional): Board height (number of rows). Defaults to 0.
+        engine (str, optional): Name of the storage engine, one of BOARD_ENGINES. Defaults to "list".
+        density (float | None, optional): Fraction of cells that contain a trap. Defaults to None (random fraction).
+        seed (int | None, optional): Seed for the board generation. Defaults to None (random seed).
+        topology (str, optional): Name of the board topology, one of TOPOLOGIES. Defaults to "grid".
+
+    Raises:
+        ValueError: If the engine or topology name is unknown, or the engine does not support the topology
+
+    Returns:
+        Board: Newly created board
+    """
+    if engine not in BOARD_ENGINES:
+        raise ValueError(f"Unknown board engine '{engine}', expected one of: {', '.join(BOARD_ENGINES)}")
+    return BOARD_ENGINES[engine](width, height, density=density, seed=seed, topology=topology)
@@ -4,25 +4,64 @@ Game module for the abandoned space station game
 
 import os
 import sys
+import time
+from enum import Enum
 
 this_path = os.path.dirname(__file__)
 this_path = os.path.join(this_path, '..')
 os.environ['PYTHONPATH'] = this_path
 sys.path.append(os.environ['PYTHONPATH'])
 
-from source.board import Board
-from source.helpers import clear, wait
+from source.board import Board, MoveRecord
+from source.generator import generate_board
+from source.helpers import wait
+from source.hints import HintEngine
+from source.journal import Journal
+from source.pool import BoardPool
+from source.results import ResultStore, game_record
+from source.script import Script
+from source.terminal import Terminal
+from source.timers import Scheduler
+
+
+class GameState(Enum):
+    """
+    States of a game session. The session moves from one state to the next until it reaches the EXIT state.
+    """
+    MAIN_MENU = "main_menu"
+    PLAYING = "playing"
+    EXIT = "exit"
+
 
 class Game:
     """
     A class representing the game, its state and methods to create a user interface based on the board state.
     """
-    def __init__(self, wait_time: float = 5):
+    def __init__(self, wait_time: float = 5, scheduler: Scheduler | None = None, journal: Journal | None = None,
+                 board_pool: BoardPool | None = None, terminal: Terminal | None = None, results: ResultStore | None = None,
+                 script: Script | None = None, no_guess: bool = False):
         """
-        Initializes the game with a new board.
+        Initializes the game and runs the session until the user quits.
+
+        Args:
+            wait_time (float, optional): Time in seconds before returning to the main menu after a game. Defaults to 5.
+            scheduler (Scheduler | None, optional): Scheduler for the timed events of the game. Defaults to None (scheduler with the real clock).
+            journal (Journal | None, optional): Journal to record the moves of the games to. Defaults to None (no recording).
+            board_pool (BoardPool | None, optional): Pool that generates the boards ahead of time. Defaults to None (boards are generated when a game starts).
+            terminal (Terminal | None, optional): Terminal the screens are drawn to. Defaults to None (terminal on the standard output).
+            results (ResultStore | None, optional): Store the outcomes of the games are recorded to. Defaults to None (no recording).
+            script (Script | None, optional): Script to read the input from instead of the keyboard, no screens are drawn and no time is waited between games. Defaults to None (interactive session).
+            no_guess (bool, optional): Whether the games are played on boards that can be solved without guessing, a board pool decides this by itself. Defaults to False.
         """
-        # Initialize the board
-        self._board = Board()
+        # The board is only created once a game starts
+        self._board: Board | None = None
+
+        # Hint engine of the current game, created on the first hint
+        self._hints: HintEngine | None = None
+
+        # Records of the moves of the current game that revealed cells, to undo moves
+        # A record only keeps the spans its move revealed, so the history of a game never holds more than a few bytes per cell of the board
+        self._history: list[MoveRecord] = []
 
         # Initialize the game state
         # self._game_over = True does not mean the user lost, it means the game is over
@@ -31,92 +70,270 @@ class Game:
         # Initialize the wait time (as an optional attribute so it can be set to zero for testing)
         self._wait_time = wait_time
 
-        # Initialize the main menu
-        self.main_menu()
+        # Initialize the scheduler that runs timed events (such as the return to the main menu) without busy-waiting
+        self._scheduler = scheduler if scheduler is not None else Scheduler()
+
+        # Initialize the journal that records the boards and moves of the games
+        self._journal = journal
+
+        # Initialize the pool of boards generated ahead of time, and start generating the first board while the user reads the main menu
+        self._board_pool = board_pool
+        if board_pool is not None:
+            board_pool.prefetch()
+
+        # Initialize the terminal that redraws the screens without clearing them through a shell
+        self._terminal = terminal if terminal is not None else Terminal()
+
+        # Initialize the store of the game outcomes, which writes them in the background
+        self._results = results
 
-    def main_menu(self) -> None:
+        # Initialize the script of a non-interactive session
+        self._script = script
+
+        # Whether boards created without a pool can be solved without guessing
+        self._no_guess = no_guess
+
+        # Run the session, starting in the main menu
+        self.run()
+
+    def run(self, state: GameState = GameState.MAIN_MENU) -> None:
+        """
+        Runs the session as a state machine: each menu returns the next state instead of calling the next menu, so the stack depth stays constant no matter how many games are played.
+
+        Args:
+            state (GameState, optional): State to start in. Defaults to GameState.MAIN_MENU.
+        """
+        handlers = {
+            GameState.MAIN_MENU: self.main_menu,
+            GameState.PLAYING: self.play_menu,
+        }
+        # The EXIT state has no handler and ends the session
+        try:
+            while state in handlers:
+                state = handlers[state]()
+        except EOFError:
+            # The input ended (e.g. the end of a script or of a pipe), which ends the session like quitting
+            return
+
+    def main_menu(self) -> GameState:
         """
         Prints the introduction to the game.
+
+        Returns:
+            GameState: PLAYING if the user wants to start a game, EXIT otherwise
         """
-        clear()
         # Intro
-        print("Welcome to the abandoned space station game!")
-        print("You are an astronaut on an abandoned space station.")
-        print("Be careful, the station is full of traps and hazards.\n")
-        print("Your mission is to find locate all all safe zones on the station, while avoiding the traps.\n")
-        print("Unfortunately, your means of communicating with the ground station are limited.")
-        print("Your only tool is a scanner that can detect the presence of traps around you.")
-        print("However, that means you need to be inside the zone that you want to scan, so you must be careful not to step on any traps.")
-        print("If you step on a trap, you will be killed and the game will be over.\n")
-        print("Do you want to start the game? (y/n) ")
-
-        valid_action = False
-        while not valid_action:
-            choice = str(input())
+        self._draw(
+            "Welcome to the abandoned space station game!\n"
+            "You are an astronaut on an abandoned space station.\n"
+            "Be careful, the station is full of traps and hazards.\n\n"
+            "Your mission is to find locate all all safe zones on the station, while avoiding the traps.\n\n"
+            "Unfortunately, your means of communicating with the ground station are limited.\n"
+            "Your only tool is a scanner that can detect the presence of traps around you.\n"
+            "However, that means you need to be inside the zone that you want to scan, so you must be careful not to step on any traps.\n"
+            "If you step on a trap, you will be killed and the game will be over.\n\n"
+            "Do you want to start the game? (y/n) \n"
+        )
+
+        while True:
+            choice = self.read_input()
             try:
                 choice = choice.lower()
                 assert choice in ["y", "n"]
-                valid_action = True
                 if choice == "y":
-                    self.play_menu()
-                else:
+                    return GameState.PLAYING
+                if self._script is None:
                     print("Goodbye!")
+                return GameState.EXIT
             except AssertionError:
-                print("\nInvalid input. Please enter 'y' or 'n'. ")
+                self._invalid_input("\nInvalid input. Please enter 'y' or 'n'. ")
+
+    def read_input(self) -> str:
+        """
+        Reads a line of user input.
+
+        Returns:
+            str: the line entered by the user
+        """
+        if self._script is not None:
+            return self._script.read_line()
+        return str(input())
+
+    def _draw(self, text: str) -> None:
+        """
+        Draws a screen, unless the session is scripted.
+
+        Args:
+            text (str): content of the screen
+        """
+        if self._script is None:
+            self._terminal.draw(text)
+
+    def _say(self, message: str) -> None:
+        """
+        Prints a message below the current screen, unless the session is scripted.
+
+        Args:
+            message (str): message to print
+        """
+        if self._script is None:
+            print(message)
+            # Messages below the screen may scroll it
+            self._terminal.invalidate()
+
+    def _invalid_input(self, message: str) -> None:
+        """
+        Tells the user that an input was rejected. A scripted session counts the rejected lines instead.
+
+        Args:
+            message (str): explanation of the valid inputs
+        """
+        if self._script is not None:
+            self._script.invalid()
+        else:
+            self._say(message)
 
     def display_board_and_instructions(self) -> None:
         """
         Displays the board of the game and instructions
         """
-        clear()
-        print("Here is the map of the space station:")
-        print(self._board)
-        print("Question marks represent cells that you have not scanned yet.")
-        print("Numbers represent the number of traps around the cell.\n")
-        print("Let's start!")
-        print("Enter the row and column of the cell you want to scan (e.g. 1 2): ")
+        # The whole screen is drawn as one frame, so only the rows of the board that changed since the last move are rewritten
+        if self._script is not None:
+            # Scripted sessions do not render the board at all
+            return
+        self._terminal.draw(
+            "Here is the map of the space station:\n"
+            f"{self._board}\n"
+            "Question marks represent cells that you have not scanned yet.\n"
+            "Numbers represent the number of traps around the cell.\n\n"
+            "Let's start!\n"
+            "Enter the row and column of the cell you want to scan (e.g. 1 2), h for a hint or u to undo your last move: \n"
+        )
+
+    def show_hint(self) -> None:
+        """
+        Prints the undiscovered cell of the current board with the lowest probability of being a trap.
+        """
+        if self._board is None:
+            return
+        if self._hints is None:
+            # The engine follows the scans from now on, so later hints only count the frontier components that changed
+            self._hints = HintEngine(self._board)
+        hint = self._hints.safest_cell()
+        if hint is not None:
+            (row, col), probability = hint
+            self._say(f"Hint: the cell {row} {col} is a trap with a probability of {probability:.1%}.")
 
-    def play_menu(self) -> None:
+    def undo(self) -> bool:
+        """
+        Restores the board of the current game to its state before the last move.
+
+        Returns:
+            bool: True if a move was undone, False if there is no move to undo
+        """
+        if self._board is None or not self._history:
+            self._say("There is no move to undo.")
+            return False
+        self._board.undo_move(self._history.pop())
+        if self._hints is not None:
+            # The hint engine follows the reveals, which are not replayed backwards
+            self._hints.detach()
+            self._hints = None
+        if self._journal is not None:
+            # A checkpoint records the restored state, so replaying the journal continues from there
+            self._journal.checkpoint()
+        return True
+
+    def play_menu(self) -> GameState:
         """
         Displays the board of the game and handles user interactions.
+
+        Returns:
+            GameState: MAIN_MENU, to return to the main menu once the game is over
         """
         self._game_over = False
-        self._board = Board()
+        # Create the board only now that the game actually starts (or take the one generated in the background)
+        if self._board_pool is not None:
+            board = self._board_pool.get()
+        elif self._no_guess:
+            board, _ = generate_board(workers=1)
+        else:
+            board = Board()
+        self._board = board
+        if self._hints is not None:
+            # The hint engine of the previous game stops following its board
+            self._hints.detach()
+            self._hints = None
+        # Moves of the previous game do not fit the new board
+        self._history = []
+        if self._journal is not None:
+            self._journal.record_game(board)
+        if board.start is not None:
+            # A board without guessing is opened for the player at its start, from where every safe cell can be deduced
+            # The scan is made after the board is recorded, so replaying the journal makes it too
+            board.scan_field(*board.start)
+        # Number of traps, scans and start time of the game, recorded with its outcome
+        traps = board.width * board.height - board.discoverable
+        moves = 0
+        won = False
+        start_time = time.perf_counter()
         while not self._game_over:
             self.display_board_and_instructions()
             valid_action = False
             while not valid_action:
                 try:
                     # Read the row and column from the user
-                    cell = str(input())
+                    cell = self.read_input()
+                    command = cell.strip().lower()
+                    if command == "h":
+                        self.show_hint()
+                        continue
+                    if command == "u":
+                        # Draw the board again once a move was undone
+                        valid_action = self.undo()
+                        continue
                     row, col = map(int, cell.split())
-                    assert 0 <= row < self._board.height and 0 <= col < self._board.width
+                    assert 0 <= row < board.height and 0 <= col < board.width
                     valid_action = True
 
-                    # Scan the field
-                    success = self._board.scan_field(row, col)
+                    # Scan the field, recording the cells it reveals to undo the move
+                    board.begin_move()
+                    try:
+                        success = board.scan_field(row, col)
+                    finally:
+                        move = board.end_move()
+                    # Scanning a discovered cell reveals nothing, so there is nothing to undo
+                    if move.spans:
+                        self._history.append(move)
+                    moves += 1
+                    if self._script is not None:
+                        self._script.moved()
 
                     if not success:
                         # Game over
                         self._game_over = True
-                        # Clear the screen and print the defeat message
-                        clear()
-                        print("Oh no, you stepped on a trap! Game over.")
-                        print("\nThe solution was:")
-                        print(self._board.solution)
+                        # Draw the defeat message (the solution is only rendered if a screen is drawn)
+                        if self._script is None:
+                            self._terminal.draw(f"Oh no, you stepped on a trap! Game over.\n\nThe solution was:\n{board.solution}\n")
                     else:
-                        if self._board.discoverable == 0:
+                        if board.discoverable == 0:
                             self._game_over = True
-                            # Clear the screen and print the victory message
-                            clear()
-                            print("Congratulations! You have found all the safe cells!")
-                            print("\nThe final solution is:")
-                            print(self._board.solution)
+                            won = True
+                            # Draw the victory message
+                            if self._script is None:
+                                self._terminal.draw(f"Congratulations! You have found all the safe cells!\n\nThe final solution is:\n{board.solution}\n")
                 except ValueError:
-                    print("Invalid input. Please enter two integer numbers separated by a space.")
+                    self._invalid_input("Invalid input. Please enter two integer numbers separated by a space.")
                 except AssertionError:
-                    print("Invalid input. Please enter a valid row and column.")
+                    self._invalid_input("Invalid input. Please enter a valid row and column.")
+        if self._results is not None:
+            # Scripted games are kept apart from the players' games, so they do not take over the leaderboards
+            mode = "game" if self._script is None else "script"
+            self._results.record(game_record(mode, board, traps, moves, won, time.perf_counter() - start_time))
+        if self._script is not None:
+            # Scripted sessions report the result and start the next game right away
+            self._script.game_over(board, won, moves)
+            return GameState.MAIN_MENU
         print("\nYou'll automatically return to the main menu in 5 seconds.")
-        self._board = Board()
-        wait(self._wait_time)
-        self.main_menu()
+        wait(self._wait_time, self._scheduler)
+        return GameState.MAIN_MENU
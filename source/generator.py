@@ -0,0 +1,290 @@
+"""
+Generator module for the abandoned space station game, generates boards that can be solved without guessing
+"""
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+import argparse
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from random import Random
+from typing import NamedTuple
+
+from source.board import ZERO_RUN, Board
+from source.engines import BOARD_ENGINES, create_board
+from source.solver import Solver
+
+# Number of openings of a layout tried as the first scan before the layout is abandoned
+DEFAULT_STARTS = 4
+
+# Number of candidate layouts checked by a worker at once
+DEFAULT_CHUNK_SIZE = 4
+
+# Number of candidate layouts checked before the generation gives up
+DEFAULT_MAX_CANDIDATES = 10000
+
+
+class GeneratedBoard(NamedTuple):
+    """
+    Board that can be solved without guessing, generated again with create_board from its seed.
+    """
+    seed: int
+    # Row and column of the first scan, from which every safe cell can be deduced
+    start: tuple[int, int]
+
+
+class GenerationStats(NamedTuple):
+    """
+    Aggregate statistics of a board generation.
+    """
+    boards: int
+    candidates: int
+    starts: int
+    elapsed: float
+
+    @property
+    def boards_per_second(self) -> float:
+        """
+        Returns the generation throughput.
+
+        Returns:
+            float: number of solvable boards generated per second
+        """
+        return self.boards / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def success_rate(self) -> float:
+        """
+        Returns the fraction of the checked layouts that can be solved without guessing.
+
+        Returns:
+            float: success rate between 0 and 1
+        """
+        return self.boards / self.candidates if self.candidates else 0.0
+
+    def __str__(self) -> str:
+        """Returns a summary of the statistics.
+
+        Returns:
+            str: Printable summary
+        """
+        return (f"boards: {self.boards}, candidates: {self.candidates}, solves: {self.starts}, "
+                f"success rate: {self.success_rate:.2%}, boards per second: {self.boards_per_second:.1f}")
+
+
+def candidate_seed(seed: int, index: int) -> int:
+    """
+    Returns the seed of a candidate layout. It only depends on the generation seed and the candidate's position, so the generated boards do not depend on the number of workers.
+
+    Args:
+        seed (int): seed of the generation
+        index (int): position of the candidate
+
+    Returns:
+        int: seed of the candidate board
+    """
+    return Random(f"{seed}-{index}").getrandbits(63)
+
+
+def find_start(board: Board, max_starts: int = DEFAULT_STARTS) -> tuple[tuple[int, int] | None, int]:
+    """
+    Looks for a first scan from which the solver discovers every safe cell of a board. The board is left as it was.
+    Only openings (safe cells without surrounding traps) are tried, since any other first scan reveals a single number which rarely allows a deduction.
+    The layout is kept while several openings are tried: the board is restored from a snapshot instead of being generated again, and an opening that was discovered by an earlier attempt is skipped, since the solver got stuck with at least as much knowledge.
+
+    Args:
+        board (Board): undiscovered board
+        max_starts (int, optional): Number of openings to try. Defaults to DEFAULT_STARTS.
+
+    Returns:
+        tuple[tuple[int, int] | None, int]: row and column of the first scan (None if the board cannot be solved from the tried openings) and number of tried openings
+    """
+    width = board.width
+    num_cells = width * board.height
+    empty = board.snapshot()
+    # Cells discovered by any of the failed attempts
+    tried = bytes(num_cells)
+    starts = 0
+    for run in ZERO_RUN.finditer(board._blocked_cells()):
+        for cell in range(*run.span()):
+            if tried[cell]:
+                continue
+            if starts == max_starts:
+                return None, starts
+            starts += 1
+            row, col = divmod(cell, width)
+            solver = Solver(board)
+            board.scan_field(row, col)
+            # The solver stops as soon as it cannot deduce a safe cell, so an attempt is abandoned at the first guess it would need
+            solved = solver.solve()
+            solver.detach()
+            discovered = board._flat_cells()[2]
+            board.restore(empty)
+            if solved:
+                return (row, col), starts
+            tried = (int.from_bytes(tried, "little") | int.from_bytes(discovered, "little")).to_bytes(num_cells, "little")
+    return None, starts
+
+
+class GenerationTask(NamedTuple):
+    """
+    Batch of candidate layouts checked by a single worker.
+    """
+    width: int
+    height: int
+    density: float | None
+    engine: str
+    seed: int
+    start: int
+    count: int
+    # Number of solvable boards after which the batch stops
+    limit: int
+    max_starts: int
+
+
+def check_candidates(task: GenerationTask) -> tuple[list[GeneratedBoard], int, int]:
+    """
+    Checks a batch of candidate layouts in order, until the batch is exhausted or enough solvable boards are found.
+    No work is carried over from one candidate to the next: every candidate is a new layout with other numbers, so neither the deductions of the solver nor the cells discovered for a dropped candidate hold for the next one.
+    Only the openings of the same candidate share work (see find_start), and setting up the solver is a small part of a check compared to the deductions themselves.
+
+    Args:
+        task (GenerationTask): batch of candidates to check
+
+    Returns:
+        tuple[list[GeneratedBoard], int, int]: solvable boards in the order of the candidates, number of checked candidates and number of solver runs
+    """
+    boards = []
+    starts = 0
+    checked = 0
+    for index in range(task.start, task.start + task.count):
+        checked += 1
+        seed = candidate_seed(task.seed, index)
+        board = create_board(task.width, task.height, engine=task.engine, density=task.density, seed=seed)
+        start, attempts = find_start(board, task.max_starts)
+        starts += attempts
+        if start is not None:
+            boards.append(GeneratedBoard(seed, start))
+            if len(boards) == task.limit:
+                break
+    return boards, checked, starts
+
+
+def generate_boards(count: int, width: int = 10, height: int = 10, density: float | None = None, seed: int | None = None,
+                    workers: int | None = None, engine: str = "list", chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    max_candidates: int = DEFAULT_MAX_CANDIDATES, max_starts: int = DEFAULT_STARTS) -> tuple[list[GeneratedBoard], GenerationStats]:
+    """
+    Generates boards that can be solved without guessing, checking candidate layouts in parallel on a pool of worker processes.
+    The candidates are sent to the workers in waves of a few batches per worker, and the generation stops after the first wave that completes the boards, so little work is wasted once enough boards are found.
+    The generated boards are the first solvable candidates in order, so they only depend on the seed.
+
+    Args:
+        count (int): number of boards to generate
+        width (int, optional): Board width. Defaults to 10.
+        height (int, optional): Board height. Defaults to 10.
+        density (float | None, optional): Fraction of trapped cells. Defaults to None (random fraction per candidate).
+        seed (int | None, optional): Seed of the generation. Defaults to None (random seed).
+        workers (int | None, optional): Number of worker processes, 1 checks the candidates in the current process. Defaults to None (one per CPU core).
+        engine (str, optional): Name of the board engine. Defaults to "list".
+        chunk_size (int, optional): Number of candidates per batch sent to a worker. Defaults to DEFAULT_CHUNK_SIZE.
+        max_candidates (int, optional): Number of candidates checked before giving up. Defaults to DEFAULT_MAX_CANDIDATES.
+        max_starts (int, optional): Number of openings tried per candidate. Defaults to DEFAULT_STARTS.
+
+    Raises:
+        ValueError: If the engine name is unknown
+        RuntimeError: If fewer boards than requested are found among the candidates
+
+    Returns:
+        tuple[list[GeneratedBoard], GenerationStats]: generated boards and statistics of the generation
+    """
+    if engine not in BOARD_ENGINES:
+        raise ValueError(f"Unknown board engine '{engine}', expected one of: {', '.join(BOARD_ENGINES)}")
+    if seed is None:
+        seed = Random().getrandbits(63)
+    wave = 2 * (workers or os.cpu_count() or 1)
+
+    boards: list[GeneratedBoard] = []
+    candidates = 0
+    starts = 0
+    next_candidate = 0
+    start_time = time.perf_counter()
+    executor: Executor | None = None if workers == 1 else ProcessPoolExecutor(max_workers=workers)
+    try:
+        while len(boards) < count:
+            if next_candidate >= max_candidates:
+                raise RuntimeError(f"Only {len(boards)} of {count} boards could be solved without guessing among {max_candidates} candidates.")
+            tasks = []
+            while len(tasks) < wave and next_candidate < max_candidates:
+                size = min(chunk_size, max_candidates - next_candidate)
+                tasks.append(GenerationTask(width, height, density, engine, seed, next_candidate, size, count - len(boards), max_starts))
+                next_candidate += size
+            results = executor.map(check_candidates, tasks) if executor is not None else map(check_candidates, tasks)
+            for found, checked, attempts in results:
+                candidates += checked
+                starts += attempts
+                boards.extend(found[:count - len(boards)])
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    elapsed = time.perf_counter() - start_time
+
+    return boards, GenerationStats(len(boards), candidates, starts, elapsed)
+
+
+def generate_board(width: int = 10, height: int = 10, density: float | None = None, seed: int | None = None,
+                   workers: int | None = None, engine: str = "list", max_candidates: int = DEFAULT_MAX_CANDIDATES) -> tuple[Board, tuple[int, int]]:
+    """
+    Generates a board that can be solved without guessing.
+    The board is returned undiscovered (e.g. to be recorded by a journal), the player has to start with the returned first scan, which is also stored as the board's start.
+
+    Args:
+        width (int, optional): Board width. Defaults to 10.
+        height (int, optional): Board height. Defaults to 10.
+        density (float | None, optional): Fraction of trapped cells. Defaults to None (random fraction).
+        seed (int | None, optional): Seed of the generation. Defaults to None (random seed).
+        workers (int | None, optional): Number of worker processes. Defaults to None (one per CPU core).
+        engine (str, optional): Name of the board engine. Defaults to "list".
+        max_candidates (int, optional): Number of candidates checked before giving up. Defaults to DEFAULT_MAX_CANDIDATES.
+
+    Raises:
+        ValueError: If the engine name is unknown
+        RuntimeError: If none of the candidates can be solved without guessing
+
+    Returns:
+        tuple[Board, tuple[int, int]]: board and row and column of its first scan
+    """
+    (generated,), _ = generate_boards(1, width, height, density, seed, workers, engine, max_candidates=max_candidates)
+    board = create_board(width, height, engine=engine, density=density, seed=generated.seed)
+    board.start = generated.start
+    return board, generated.start
+
+
+def main() -> None:
+    """
+    Command line interface of the generator, reports the generation throughput for each board size and density.
+    """
+    parser = argparse.ArgumentParser(description="Generate boards of the abandoned space station game that can be solved without guessing.")
+    parser.add_argument("--boards", type=int, default=20, help="number of boards to generate per size and density")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 20, 30], help="widths and heights of the square boards")
+    parser.add_argument("--densities", type=float, nargs="+", default=[0.1, 0.15, 0.2], help="fractions of trapped cells")
+    parser.add_argument("--seed", type=int, default=0, help="generation seed")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--engine", default="list", help="board engine")
+    args = parser.parse_args()
+    for size in args.sizes:
+        for density in args.densities:
+            try:
+                _, stats = generate_boards(args.boards, size, size, density, args.seed, args.workers, args.engine)
+                print(f"{size}x{size}, density {density}: {stats}")
+            except RuntimeError as error:
+                print(f"{size}x{size}, density {density}: {error}")
+
+
+if __name__ == "__main__":
+    main()
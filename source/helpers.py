@@ -3,24 +3,30 @@ Helper functions
 """
 
 import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+from source.terminal import Terminal
+from source.timers import Scheduler
 
 def clear() -> None:
     """
-    Clears the console
+    Clears the console with ANSI escape sequences (instead of running a shell command), if the standard output is a terminal
     """
-    os.system('cls' if os.name=='nt' else 'clear')
+    Terminal().clear()
 
-def wait(seconds: float) -> None:
+def wait(seconds: float, scheduler: Scheduler | None = None) -> None:
     """
-    Waits for a given number of seconds and is required since the time module is not allowed.
-    """
-    # Get the current time in seconds
-    # os.times() returns a tuple, the 5th element is the elapsed time
-    start_time = os.times()[4]
+    Waits for a given number of seconds. The waiting process sleeps on the scheduler's event loop instead of busy-waiting, so it does not occupy the CPU.
 
-    # Busy-wait loop
-    while True:
-        current_time = os.times()[4]
-        elapsed_time = current_time - start_time
-        if elapsed_time >= seconds:
-            break
+    Args:
+        seconds (float): time to wait in seconds
+        scheduler (Scheduler | None, optional): Scheduler to wait on, whose pending timed events are run in the meantime. Defaults to None (new scheduler with the real clock).
+    """
+    if scheduler is None:
+        scheduler = Scheduler()
+    scheduler.wait(seconds)
@@ -0,0 +1,351 @@
+"""
+Hints module for the abandoned space station game, computes the exact probability of every frontier cell being a trap
+"""
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+from collections import deque
+from math import comb
+
+from source.board import Board
+from source.solver import TRAP, UNKNOWN, Solver
+
+# Constraint of a revealed cell: flat indices of its undetermined neighbors and number of traps among them
+Constraint = tuple[tuple[int, ...], int]
+
+# Identifies a frontier component by its cells and constraints, so that components which did not change since the last hint are found in the cache
+ComponentKey = tuple[tuple[int, ...], tuple[Constraint, ...]]
+
+
+def pack(coefficients: list[int], bits: int) -> int:
+    """
+    Packs the coefficients of a polynomial into one integer, `bits` bits per coefficient, so that polynomials are added, shifted and multiplied as integers.
+
+    Args:
+        coefficients (list[int]): non-negative coefficients, starting with the constant one
+        bits (int): number of bits per coefficient, large enough for every coefficient of the results
+
+    Returns:
+        int: packed polynomial
+    """
+    packed = 0
+    for coefficient in reversed(coefficients):
+        packed = (packed << bits) | coefficient
+    return packed
+
+
+def unpack(packed: int, bits: int, length: int) -> list[int]:
+    """
+    Unpacks the coefficients of a polynomial packed with pack.
+
+    Args:
+        packed (int): packed polynomial
+        bits (int): number of bits per coefficient
+        length (int): number of coefficients to unpack
+
+    Returns:
+        list[int]: coefficients, starting with the constant one
+    """
+    mask = (1 << bits) - 1
+    return [(packed >> (bits * index)) & mask for index in range(length)]
+
+
+def count_component(cells: tuple[int, ...], constraints: tuple[Constraint, ...]) -> tuple[list[int], list[list[int]]]:
+    """
+    Counts the trap placements of a frontier component that satisfy all its constraints, per number of traps, and for every cell the placements in which it is a trap.
+    The cells are assigned one after the other in breadth-first order, and only the values of the cells that still appear in an open constraint are kept as state, so placements with the same state are counted together.
+    A forward pass counts the placements of the assigned cells and a backward pass the completions of the remaining ones, and their product gives the counts of every cell.
+
+    Args:
+        cells (tuple[int, ...]): flat indices of the undetermined cells of the component
+        constraints (tuple[Constraint, ...]): constraints over the cells
+
+    Returns:
+        tuple[list[int], list[list[int]]]: number of placements per number of traps, and per cell (in the order of cells) number of placements with a trap in the cell per number of traps
+    """
+    # Breadth-first order over the constraints keeps the cells of a constraint close together, which keeps the state small
+    constraints_of: dict[int, list[int]] = {cell: [] for cell in cells}
+    for number, (constraint_cells, _) in enumerate(constraints):
+        for cell in constraint_cells:
+            constraints_of[cell].append(number)
+    order: list[int] = []
+    seen = {cells[0]}
+    queue = deque([cells[0]])
+    while queue:
+        cell = queue.popleft()
+        order.append(cell)
+        for number in constraints_of[cell]:
+            for other in constraints[number][0]:
+                if other not in seen:
+                    seen.add(other)
+                    queue.append(other)
+    position = {cell: index for index, cell in enumerate(order)}
+    size = len(order)
+
+    # Cell positions of each constraint, the position of its last cell, and the positions of the cells still needed after each step
+    members = [sorted(position[cell] for cell in constraint_cells) for constraint_cells, _ in constraints]
+    last = [positions[-1] for positions in members]
+    touching: list[list[int]] = [[] for _ in range(size)]
+    for number, positions in enumerate(members):
+        for index in positions:
+            touching[index].append(number)
+    active_after = [[index for index in range(step + 1) if any(last[number] > step for number in touching[index])] for step in range(size)]
+
+    # Packed polynomials over the number of traps, every coefficient is at most the number of placements 2 ** size
+    bits = size + 2
+    forward: list[dict[tuple[int, ...], int]] = [{(): 1}]
+    transitions: list[list[tuple[tuple[int, ...], int, tuple[int, ...]]]] = []
+    previous_active: list[int] = []
+    for step in range(size):
+        states: dict[tuple[int, ...], int] = {}
+        moves = []
+        for state, count in forward[step].items():
+            values = dict(zip(previous_active, state))
+            for value in (0, 1):
+                values[step] = value
+                valid = True
+                for number in touching[step]:
+                    # Traps among the assigned cells of the constraint, and number of its cells that are not assigned yet
+                    traps = sum(values[index] for index in members[number] if index <= step)
+                    open_cells = sum(1 for index in members[number] if index > step)
+                    if not traps <= constraints[number][1] <= traps + open_cells:
+                        valid = False
+                        break
+                if not valid:
+                    continue
+                following = tuple(values[index] for index in active_after[step])
+                states[following] = states.get(following, 0) + (count << (bits * value))
+                moves.append((state, value, following))
+        forward.append(states)
+        transitions.append(moves)
+        previous_active = active_after[step]
+
+    # Number of completions of each state by the remaining cells
+    backward: dict[tuple[int, ...], int] = {(): 1}
+    cell_counts: list[list[int]] = [[] for _ in range(size)]
+    for step in reversed(range(size)):
+        completions: dict[tuple[int, ...], int] = {}
+        trapped = 0
+        for state, value, following in transitions[step]:
+            rest = backward.get(following, 0)
+            completions[state] = completions.get(state, 0) + (rest << (bits * value))
+            if value:
+                trapped += (forward[step][state] * rest) << bits
+        cell_counts[step] = unpack(trapped, bits, size + 1)
+        backward = completions
+
+    totals = unpack(forward[size].get((), 0), bits, size + 1)
+    by_cell = dict(zip(order, cell_counts))
+    return totals, [by_cell[cell] for cell in cells]
+
+
+class HintEngine:
+    """
+    This class computes the exact probability of the undiscovered cells of a board being traps, given the revealed numbers and the total number of traps.
+    The cells that the Solver can deduce are certain, the remaining cells next to revealed numbers are split into components that share no constraint and are counted independently.
+    The counts of a component are cached until one of its cells or constraints changes, so after a scan only the components around the revealed cells are counted again.
+    """
+    def __init__(self, board: Board, solver: Solver | None = None):
+        """
+        Initializes the engine with the current state of a board.
+
+        Args:
+            board (Board): board to compute hints for, possibly in the middle of a game
+            solver (Solver | None, optional): Solver of the board to take the deductions from. Defaults to None (new solver).
+        """
+        self._board = board
+        self._solver = solver if solver is not None else Solver(board)
+        self._width = board.width
+
+        # Total number of traps: every cell is either a trap, a safe cell left to discover or a discovered cell
+        # (a revealed trap is discovered and also no longer counted as discoverable, so it cancels out)
+        discovered = sum(board._flat_cells()[2])
+        self._num_traps = board.width * board.height - board.discoverable - discovered
+
+        # Counts of the components of the last hint
+        self._cache: dict[ComponentKey, tuple[list[int], list[list[int]]]] = {}
+
+        # Number of components counted (not found in the cache) so far
+        self._counted = 0
+
+    @property
+    def counted(self) -> int:
+        """
+        Returns the number of frontier components counted so far, i.e. the number of cache misses.
+
+        Returns:
+            int: number of counted components
+        """
+        return self._counted
+
+    def detach(self) -> None:
+        """
+        Stops the solver of the engine from listening to the board's reveals.
+        """
+        self._solver.detach()
+
+    def _components(self) -> list[ComponentKey]:
+        """
+        Splits the undetermined cells next to revealed numbers into components connected by shared constraints.
+
+        Returns:
+            list[ComponentKey]: cells and constraints of each component
+        """
+        solver = self._solver
+        state = solver._state
+        parent: dict[int, int] = {}
+
+        def find(cell: int) -> int:
+            """Returns the representative of a cell's component."""
+            while parent[cell] != cell:
+                parent[cell] = parent[parent[cell]]
+                cell = parent[cell]
+            return cell
+
+        constraints: list[Constraint] = []
+        for cell in solver._frontier:
+            neighbors = tuple(neighbor for neighbor in solver._neighbors(cell) if state[neighbor] == UNKNOWN)
+            if not neighbors:
+                continue
+            constraints.append((neighbors, solver._remaining[cell]))
+            for neighbor in neighbors:
+                parent.setdefault(neighbor, neighbor)
+            root = find(neighbors[0])
+            for neighbor in neighbors[1:]:
+                parent[find(neighbor)] = root
+
+        cells: dict[int, list[int]] = {}
+        for cell in parent:
+            cells.setdefault(find(cell), []).append(cell)
+        grouped: dict[int, list[Constraint]] = {}
+        for constraint in constraints:
+            grouped.setdefault(find(constraint[0][0]), []).append(constraint)
+        return [(tuple(sorted(cells[root])), tuple(sorted(set(grouped[root])))) for root in cells]
+
+    def probabilities(self) -> dict[tuple[int, int], float]:
+        """
+        Returns the probability of being a trap of every undiscovered cell next to a discovered number.
+
+        Raises:
+            ValueError: If no placement of the traps matches the revealed numbers
+
+        Returns:
+            dict[tuple[int, int], float]: probability per row and column of the cell
+        """
+        return self._compute()[0]
+
+    def interior_probability(self) -> float:
+        """
+        Returns the probability of being a trap of an undiscovered cell that is not next to a discovered number (all these cells have the same probability).
+
+        Raises:
+            ValueError: If no placement of the traps matches the revealed numbers
+
+        Returns:
+            float: probability, 0 if there is no such cell
+        """
+        return self._compute()[1]
+
+    def safest_cell(self) -> tuple[tuple[int, int], float] | None:
+        """
+        Returns the undiscovered cell with the lowest probability of being a trap, preferring cells next to discovered numbers on ties.
+
+        Raises:
+            ValueError: If no placement of the traps matches the revealed numbers
+
+        Returns:
+            tuple[tuple[int, int], float] | None: row and column of the cell and its probability, None if no cell is undiscovered
+        """
+        probabilities, interior = self._compute()
+        best = min(probabilities.items(), key=lambda item: item[1], default=None)
+        if best is not None and best[1] <= interior:
+            return best
+        state = self._solver._state
+        for cell, knowledge in enumerate(state):
+            if knowledge == UNKNOWN and divmod(cell, self._width) not in probabilities:
+                return divmod(cell, self._width), interior
+        return best
+
+    def _compute(self) -> tuple[dict[tuple[int, int], float], float]:
+        """
+        Computes the probabilities of the frontier cells and of the interior cells.
+        Every combination of component placements with K traps in total leaves the other traps to the interior cells, in comb(interior cells, traps - K) ways.
+
+        Raises:
+            ValueError: If no placement of the traps matches the revealed numbers
+
+        Returns:
+            tuple[dict[tuple[int, int], float], float]: probability per frontier cell and probability of an interior cell
+        """
+        solver = self._solver
+        solver.deduce()
+        state = solver._state
+        width = self._width
+
+        # Deduced cells are certain (revealed traps are known as well, but they are not undiscovered)
+        probabilities = {divmod(cell, width): 0.0 for cell in solver._pending_safe}
+        cell = state.find(TRAP)
+        while cell >= 0:
+            if not self._board._cell_discovered(*divmod(cell, width)):
+                probabilities[divmod(cell, width)] = 1.0
+            cell = state.find(TRAP, cell + 1)
+
+        # Count the components, reusing the counts of unchanged ones
+        components = self._components()
+        cache: dict[ComponentKey, tuple[list[int], list[list[int]]]] = {}
+        for key in components:
+            counts = self._cache.get(key)
+            if counts is None:
+                counts = count_component(*key)
+                self._counted += 1
+            cache[key] = counts
+        # Only the components of this hint are kept, the others have changed
+        self._cache = cache
+
+        frontier = sum(len(cells) for cells, _ in components)
+        interior = state.count(UNKNOWN) - frontier
+        traps = self._num_traps - state.count(TRAP)
+        # The traps of a placement are split between the frontier components and the interior cells: ways[total] = comb(interior, traps - total)
+        # Each binomial follows from the previous one, comb(n, k - 1) = comb(n, k) * k / (n - k + 1), which is much cheaper than computing them one by one
+        ways = [0] * (frontier + 1)
+        first = max(traps - interior, 0)
+        if first <= frontier and traps >= 0:
+            way = comb(interior, traps - first)
+            for total in range(first, min(traps, frontier) + 1):
+                ways[total] = way
+                way = way * (traps - total) // (interior - traps + total + 1)
+
+        # Product of the polynomials of all components, as packed integers (every coefficient is at most 2 ** frontier)
+        bits = frontier + 2
+        product = 1
+        for key in components:
+            product *= pack(cache[key][0], bits)
+        totals = unpack(product, bits, frontier + 1)
+        weight = sum(count * way for count, way in zip(totals, ways))
+        if weight == 0:
+            raise ValueError("No placement of the traps matches the revealed numbers.")
+
+        for key in components:
+            cells, _ = key
+            counts, cell_counts = cache[key]
+            # Placements of the other components, by exact division of the packed product
+            others = unpack(product // pack(counts, bits), bits, frontier - len(cells) + 1)
+            # Weight of each number of traps of this component, over all placements of the other components and the interior
+            weights = [sum(count * ways[own + total] for total, count in enumerate(others) if count and own + total <= frontier)
+                       for own in range(len(cells) + 1)]
+            for cell, by_traps in zip(cells, cell_counts):
+                probabilities[divmod(cell, width)] = sum(count * own_weight for count, own_weight in zip(by_traps, weights)) / weight
+
+        interior_probability = 0.0
+        if interior:
+            # Expected number of interior traps divided by the number of interior cells
+            interior_weight = sum(count * way * (traps - total) for total, (count, way) in enumerate(zip(totals, ways)))
+            interior_probability = interior_weight / (weight * interior)
+        return probabilities, interior_probability
+
@@ -0,0 +1,366 @@
+"""
+Journal module for the abandoned space station game, records the moves of games to an append-only file and replays them
+"""
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+import argparse
+import math
+import struct
+from types import TracebackType
+from typing import Any, NamedTuple
+
+from source.board import Board
+from source.engines import BOARD_ENGINES, create_board
+from source.storage import pack_bits, unpack_bits
+
+# File layout: a header followed by records, each starting with a one byte tag
+# Game record: engine index, requested width and height, density (NaN if random) and seed of a new board
+# Move record: row, column and result (1 if safe) of a call of scan_field
+# Checkpoint record: number of moves of the game so far, safe cells left to discover, size of the packed discovered cells, followed by the packed discovered cells
+HEADER = struct.Struct("<4sH")
+MAGIC = b"ASSJ"
+VERSION = 1
+GAME = struct.Struct("<cBIIdq")
+MOVE = struct.Struct("<cIIB")
+CHECKPOINT = struct.Struct("<cQQI")
+GAME_TAG = b"G"
+MOVE_TAG = b"M"
+CHECKPOINT_TAG = b"C"
+
+# Number of buffered bytes that are written to the file at once
+BATCH_SIZE = 64 * 1024
+
+# Number of moves between two checkpoints of a game
+CHECKPOINT_INTERVAL = 10_000
+
+
+class Journal:
+    """
+    This class records games to an append-only journal: the generation parameters and seed of every board, every call of scan_field and periodic checkpoints of the discovered cells.
+    Records are collected in memory and written in batches, so recording a move does not cost a system call.
+    """
+    def __init__(self, path: str, checkpoint_interval: int = CHECKPOINT_INTERVAL, batch_size: int = BATCH_SIZE):
+        """
+        Opens a journal for appending, creating it if it does not exist.
+
+        Args:
+            path (str): path of the journal file
+            checkpoint_interval (int, optional): Number of moves between two checkpoints. Defaults to CHECKPOINT_INTERVAL.
+            batch_size (int, optional): Number of buffered bytes written at once. Defaults to BATCH_SIZE.
+        """
+        self._checkpoint_interval = checkpoint_interval
+        self._batch_size = batch_size
+        # Unbuffered file, every batch is written with a single system call
+        self._file = open(path, "ab", buffering=0)  # pylint: disable=consider-using-with
+        self._batch = bytearray()
+        if self._file.tell() == 0:
+            self._batch += HEADER.pack(MAGIC, VERSION)
+
+        # Board of the game being recorded and its number of moves
+        self._board: Board | None = None
+        self._moves = 0
+
+        # Number of batches written so far
+        self._writes = 0
+
+    def __enter__(self) -> "Journal":
+        """
+        Returns the journal, so that it is closed at the end of a with block.
+
+        Returns:
+            Journal: this journal
+        """
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None) -> None:
+        """
+        Closes the journal at the end of a with block.
+
+        Args:
+            exc_type (type[BaseException] | None): type of the raised exception, if any
+            exc_value (BaseException | None): raised exception, if any
+            traceback (TracebackType | None): traceback of the raised exception, if any
+        """
+        self.close()
+
+    @property
+    def writes(self) -> int:
+        """
+        Returns the number of batches written to the file so far.
+
+        Returns:
+            int: number of write system calls
+        """
+        return self._writes
+
+    def record_game(self, board: Board) -> None:
+        """
+        Starts recording a new game: records the board's generation parameters and seed and listens to its scans.
+        The board has to be recorded before it is scanned, since only the seed and the moves are stored.
+
+        Args:
+            board (Board): new board, generated from a seed by one of the board engines
+
+        Raises:
+            ValueError: If the board cannot be generated again from its seed
+        """
+        engines = [engine for engine, board_class in BOARD_ENGINES.items() if type(board) is board_class]  # pylint: disable=unidiomatic-typecheck
+        if board.seed is None or not engines or not -2**63 <= board.seed < 2**63 or board.topology != "grid":
+            raise ValueError("Only grid boards generated by a board engine from a 64-bit seed can be recorded.")
+        self.stop()
+        width, height, density = board._generation
+        self._append(GAME.pack(GAME_TAG, list(BOARD_ENGINES).index(engines[0]), width, height,
+                               math.nan if density is None else density, board.seed))
+        self._board = board
+        self._moves = 0
+        board.add_scan_listener(self._on_scan)
+
+    def stop(self) -> None:
+        """
+        Stops listening to the scans of the recorded board.
+        """
+        if self._board is not None:
+            self._board.remove_scan_listener(self._on_scan)
+            self._board = None
+
+    def _on_scan(self, row: int, col: int, safe: bool) -> None:
+        """
+        Records a move of the recorded game, followed by a checkpoint every checkpoint interval.
+
+        Args:
+            row (int): row of the scanned field
+            col (int): column of the scanned field
+            safe (bool): result of the scan
+        """
+        self._append(MOVE.pack(MOVE_TAG, row, col, safe))
+        self._moves += 1
+        if self._moves % self._checkpoint_interval == 0 and self._board is not None:
+            self.checkpoint()
+
+    def checkpoint(self) -> None:
+        """
+        Records the discovered cells of the recorded game, so that replaying can start from here instead of from the first move.
+        """
+        if self._board is None:
+            return
+        discovered = pack_bits(self._board._flat_cells()[2])
+        self._append(CHECKPOINT.pack(CHECKPOINT_TAG, self._moves, self._board.discoverable, len(discovered)) + discovered)
+
+    def _append(self, record: bytes) -> None:
+        """
+        Adds a record to the batch and writes the batch once it is full.
+
+        Args:
+            record (bytes): packed record
+        """
+        self._batch += record
+        if len(self._batch) >= self._batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes the buffered records to the file.
+        """
+        if self._batch:
+            self._file.write(self._batch)
+            self._batch.clear()
+            self._writes += 1
+
+    def close(self) -> None:
+        """
+        Stops recording, writes the buffered records and closes the file.
+        """
+        self.stop()
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+class GameEntry(NamedTuple):
+    """
+    Recorded game of a journal, with the positions of its records in the file.
+    """
+    engine: str
+    width: int
+    height: int
+    density: float | None
+    seed: int
+    # Offset of the first record after the game record
+    offset: int
+    # Offset after the last record of the game
+    end: int
+    moves: int
+    # Number of moves and offset of each checkpoint record
+    checkpoints: list[tuple[int, int]]
+
+
+class JournalReader:
+    """
+    This class reads a journal and rebuilds the state of its games by replaying the moves directly on a board, without the user interface.
+    Replaying to a given move starts from the closest earlier checkpoint instead of from the beginning of the game.
+    """
+    def __init__(self, path: str):
+        """
+        Reads a journal and indexes its games and checkpoints.
+
+        Args:
+            path (str): path of the journal file
+
+        Raises:
+            ValueError: If the file is not a journal
+        """
+        with open(path, "rb") as file:
+            self._data = file.read()
+        if len(self._data) < HEADER.size or HEADER.unpack_from(self._data) != (MAGIC, VERSION):
+            raise ValueError(f"'{path}' is not a journal (version {VERSION}).")
+        self._games = self._index()
+
+    @property
+    def games(self) -> list[GameEntry]:
+        """
+        Returns the recorded games.
+
+        Returns:
+            list[GameEntry]: games in the order they were recorded
+        """
+        return self._games
+
+    def _index(self) -> list[GameEntry]:
+        """
+        Reads the records once to find the games and their checkpoints. A record cut off at the end of the file (e.g. after a crash) ends the journal.
+
+        Raises:
+            ValueError: If the journal contains an unknown record
+
+        Returns:
+            list[GameEntry]: recorded games
+        """
+        data = self._data
+        games: list[GameEntry] = []
+        current: dict[str, Any] | None = None
+        offset = HEADER.size
+        move_size = MOVE.size
+        while offset < len(data):
+            tag = data[offset:offset + 1]
+            if tag == MOVE_TAG:
+                if offset + move_size > len(data):
+                    break
+                offset += move_size
+                if current is not None:
+                    current["moves"] += 1
+            elif tag == GAME_TAG:
+                if offset + GAME.size > len(data):
+                    break
+                if current is not None:
+                    games.append(GameEntry(**current, end=offset))
+                _, engine, width, height, density, seed = GAME.unpack_from(data, offset)
+                offset += GAME.size
+                current = {"engine": list(BOARD_ENGINES)[engine], "width": width, "height": height,
+                           "density": None if math.isnan(density) else density, "seed": seed, "offset": offset,
+                           "moves": 0, "checkpoints": []}
+            elif tag == CHECKPOINT_TAG:
+                if offset + CHECKPOINT.size > len(data):
+                    break
+                _, moves, _, size = CHECKPOINT.unpack_from(data, offset)
+                if offset + CHECKPOINT.size + size > len(data):
+                    break
+                if current is not None:
+                    current["checkpoints"].append((moves, offset))
+                offset += CHECKPOINT.size + size
+            else:
+                raise ValueError(f"Unknown journal record at offset {offset}.")
+        if current is not None:
+            games.append(GameEntry(**current, end=min(offset, len(data))))
+        return games
+
+    def replay(self, game: int = -1, moves: int | None = None) -> Board:
+        """
+        Rebuilds the board of a recorded game after a given number of moves.
+
+        Args:
+            game (int, optional): Index of the game. Defaults to -1 (last game).
+            moves (int | None, optional): Number of moves to replay. Defaults to None (all moves).
+
+        Raises:
+            ValueError: If a replayed move does not have the recorded result
+
+        Returns:
+            Board: board in the state after the moves
+        """
+        entry = self._games[game]
+        if moves is None or moves > entry.moves:
+            moves = entry.moves
+        board = create_board(entry.width, entry.height, engine=entry.engine, density=entry.density, seed=entry.seed)
+
+        # Start from the last checkpoint before the requested move
+        replayed = 0
+        offset = entry.offset
+        for checkpoint_moves, checkpoint_offset in entry.checkpoints:
+            if checkpoint_moves > moves:
+                break
+            replayed, offset = checkpoint_moves, checkpoint_offset
+        if replayed:
+            offset = self._restore(board, offset)
+
+        data = self._data
+        scan = board.scan_field
+        while replayed < moves:
+            tag = data[offset:offset + 1]
+            if tag == MOVE_TAG:
+                _, row, col, safe = MOVE.unpack_from(data, offset)
+                if scan(row, col) != bool(safe):
+                    raise ValueError(f"Move {replayed + 1} ({row} {col}) does not match the journal.")
+                replayed += 1
+                offset += MOVE.size
+            else:
+                # Skip the checkpoints between the moves
+                offset += CHECKPOINT.size + CHECKPOINT.unpack_from(data, offset)[3]
+        return board
+
+    def _restore(self, board: Board, offset: int) -> int:
+        """
+        Restores the discovered cells of a checkpoint on a new board.
+
+        Args:
+            board (Board): new board of the game
+            offset (int): offset of the checkpoint record
+
+        Returns:
+            int: offset of the first record after the checkpoint
+        """
+        _, _, discoverable, size = CHECKPOINT.unpack_from(self._data, offset)
+        start = offset + CHECKPOINT.size
+        discovered = unpack_bits(self._data[start:start + size], 0, board.width * board.height)
+        board._set_discovered(discovered)
+        board.discoverable = discoverable
+        return start + size
+
+
+def main() -> None:
+    """
+    Command line interface of the replay tool.
+    """
+    parser = argparse.ArgumentParser(description="Replay games recorded in an abandoned space station journal.")
+    parser.add_argument("journal", help="journal file")
+    parser.add_argument("--game", type=int, default=None, help="index of the game to replay (default: list the games)")
+    parser.add_argument("--moves", type=int, default=None, help="number of moves to replay (default: all)")
+    args = parser.parse_args()
+    reader = JournalReader(args.journal)
+    if args.game is None:
+        for index, entry in enumerate(reader.games):
+            print(f"game {index}: engine {entry.engine}, seed {entry.seed}, {entry.moves} moves, {len(entry.checkpoints)} checkpoints")
+        return
+    board = reader.replay(args.game, args.moves)
+    print(board)
+    print(f"Safe cells left to discover: {board.discoverable}")
+
+
+if __name__ == "__main__":
+    main()
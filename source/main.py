@@ -10,13 +10,67 @@ this_path = os.path.join(this_path, '..')
 os.environ['PYTHONPATH'] = this_path
 sys.path.append(os.environ['PYTHONPATH'])
 
+import argparse
+
 from source.game import Game
+from source.journal import Journal
+from source.metrics import METRICS
+from source.pool import BoardPool
+from source.results import ResultStore
+from source.script import Script
+
+def play(script: Script | None = None, no_guess: bool = False) -> None:
+    """
+    Main function to play the game.
+    If the environment variable SPACE_STATION_METRICS is set, the game is instrumented and the metrics are written as JSON to the file it names when the game ends.
+    If the environment variable SPACE_STATION_JOURNAL is set, the moves of all games are recorded to the journal file it names.
+    If the environment variable SPACE_STATION_RESULTS is set, the outcomes of all games are recorded to the SQLite database it names.
+
+    Args:
+        script (Script | None, optional): Script to read the input from instead of the keyboard. Defaults to None (interactive session).
+        no_guess (bool, optional): Whether to play on boards that can be solved without guessing. Defaults to False.
+    """
+    metrics_path = os.environ.get("SPACE_STATION_METRICS")
+    if metrics_path:
+        METRICS.enable()
+    journal_path = os.environ.get("SPACE_STATION_JOURNAL")
+    journal = Journal(journal_path) if journal_path else None
+    results_path = os.environ.get("SPACE_STATION_RESULTS")
+    results = ResultStore(results_path) if results_path else None
+    # Boards are generated in the background while the user reads the menus and plays
+    # A script leaves no idle time to generate boards in, so a background thread would only compete with the game for the interpreter
+    board_pool = BoardPool(no_guess=no_guess) if script is None else None
+    try:
+        Game(journal=journal, board_pool=board_pool, results=results, script=script, no_guess=no_guess)
+    finally:
+        if board_pool is not None:
+            board_pool.close()
+        if results is not None:
+            results.close()
+        if journal is not None:
+            journal.close()
+        if metrics_path:
+            METRICS.disable()
+            with open(metrics_path, "w", encoding="utf-8") as file:
+                file.write(METRICS.to_json())
 
-def play() -> None:
+def main() -> None:
     """
-    Main function to play the game
+    Command line interface: plays interactively, or reads the input of a whole session from a file or a pipe.
     """
-    Game()
+    parser = argparse.ArgumentParser(description="Play the abandoned space station game.")
+    parser.add_argument("--script", default=None, help="file with the input lines of the session, - for the standard input")
+    parser.add_argument("--summary-every", type=int, default=0, help="number of moves between two summaries of a scripted session")
+    parser.add_argument("--no-games", action="store_true", help="do not write the result of every game of a scripted session")
+    parser.add_argument("--no-guess", action="store_true", help="play on boards that can be solved without guessing, opened at their start")
+    args = parser.parse_args()
+    if args.script is None:
+        play(no_guess=args.no_guess)
+        return
+    with (open(args.script, encoding="utf-8") if args.script != "-" else sys.stdin) as stream:
+        script = Script(stream, summary_interval=args.summary_every, report_games=not args.no_games)
+        play(script, no_guess=args.no_guess)
+        script.finish()
 
 if __name__ == "__main__":
-    play()
+    main()
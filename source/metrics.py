@@ -0,0 +1,268 @@
+"""
+Metrics module for the abandoned space station game, opt-in instrumentation of the board and the game
+"""
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+import json
+import time
+from collections.abc import Callable
+from typing import Any
+
+from source.array_board import ArrayBoard
+from source.board import Board, ScanResult
+from source.game import Game
+
+# Upper bounds (in seconds) of the timing histogram buckets; the last bucket holds everything slower
+BUCKETS = (0.00001, 0.0001, 0.001, 0.01, 0.1, 1.0, 10.0)
+
+
+class Histogram:
+    """
+    This class represents a timing histogram with fixed buckets, together with the number, sum, minimum and maximum of the observed durations.
+    """
+    def __init__(self) -> None:
+        """
+        Initializes an empty histogram.
+        """
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.minimum = float("inf")
+        self.maximum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """
+        Records a duration.
+
+        Args:
+            seconds (float): observed duration in seconds
+        """
+        bucket = 0
+        while bucket < len(BUCKETS) and seconds > BUCKETS[bucket]:
+            bucket += 1
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total += seconds
+        self.minimum = min(self.minimum, seconds)
+        self.maximum = max(self.maximum, seconds)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Returns the histogram as a JSON-compatible dictionary.
+
+        Returns:
+            dict[str, Any]: count, sum, mean, minimum, maximum and bucket counts (keyed by upper bound)
+        """
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.minimum if self.count else 0.0,
+            "max": self.maximum,
+            "buckets": {f"<={bound:g}": count for bound, count in zip(BUCKETS, self.counts)} | {"+inf": self.counts[-1]},
+        }
+
+
+class Metrics:
+    """
+    This class collects counters and timing histograms of the game's hot paths.
+    Instrumentation is opt-in: enabling wraps the measured methods of Board, ArrayBoard and Game, and disabling restores the original methods, so there is no overhead at all while metrics are disabled.
+    """
+    def __init__(self) -> None:
+        """
+        Initializes an empty, disabled metrics registry.
+        """
+        self.counters: dict[str, int] = {}
+        self.histograms: dict[str, Histogram] = {}
+
+        # Original methods replaced while the instrumentation is enabled
+        self._originals: list[tuple[type, str, Callable[..., Any]]] = []
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Returns whether the instrumentation is enabled.
+
+        Returns:
+            bool: True if the measured methods are wrapped
+        """
+        return bool(self._originals)
+
+    def count(self, name: str, value: int = 1) -> None:
+        """
+        Increments a counter.
+
+        Args:
+            name (str): counter name
+            value (int, optional): Increment. Defaults to 1.
+        """
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name: str, seconds: float) -> None:
+        """
+        Records a duration in a timing histogram.
+
+        Args:
+            name (str): histogram name
+            seconds (float): observed duration in seconds
+        """
+        if name not in self.histograms:
+            self.histograms[name] = Histogram()
+        self.histograms[name].observe(seconds)
+
+    def reset(self) -> None:
+        """
+        Removes all recorded values.
+        """
+        self.counters.clear()
+        self.histograms.clear()
+
+    def enable(self) -> None:
+        """
+        Starts measuring scan_field and scan_many (calls, scanned fields, revealed cells, time), trap placement, rendering, displaying the board and waiting for user input.
+        """
+        if self.enabled:
+            return
+        self._wrap(Board, "scan_field", "board.scan_field", self._scan_field_wrapper)
+        self._wrap(Board, "scan_many", "board.scan_many", self._scan_many_wrapper)
+        self._wrap(Board, "_place_traps", "board.place_traps", self._timed_wrapper)
+        self._wrap(ArrayBoard, "_place_traps", "board.place_traps", self._timed_wrapper)
+        self._wrap(Board, "__str__", "board.render", self._timed_wrapper)
+        self._wrap(Game, "display_board_and_instructions", "game.display", self._timed_wrapper)
+        self._wrap(Game, "read_input", "game.input_wait", self._timed_wrapper)
+
+    def disable(self) -> None:
+        """
+        Stops measuring and restores the original methods. The recorded values are kept.
+        """
+        while self._originals:
+            cls, method_name, original = self._originals.pop()
+            setattr(cls, method_name, original)
+
+    def _wrap(self, cls: type, method_name: str, metric: str, wrapper: Callable[[Callable[..., Any], str], Callable[..., Any]]) -> None:
+        """
+        Replaces a method of a class by a measuring wrapper.
+
+        Args:
+            cls (type): class whose method is replaced
+            method_name (str): name of the method
+            metric (str): name prefix of the recorded metrics
+            wrapper (Callable[[Callable[..., Any], str], Callable[..., Any]]): function creating the wrapper from the original method and the metric name
+        """
+        original = cls.__dict__[method_name]
+        self._originals.append((cls, method_name, original))
+        setattr(cls, method_name, wrapper(original, metric))
+
+    def _timed_wrapper(self, original: Callable[..., Any], metric: str) -> Callable[..., Any]:
+        """
+        Creates a wrapper that counts the calls of a method and records their durations.
+
+        Args:
+            original (Callable[..., Any]): original method
+            metric (str): name prefix of the recorded metrics
+
+        Returns:
+            Callable[..., Any]: measuring method
+        """
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self.observe(f"{metric}.seconds", time.perf_counter() - start)
+                self.count(f"{metric}.calls")
+        return timed
+
+    def _scan_field_wrapper(self, original: Callable[..., Any], metric: str) -> Callable[..., Any]:
+        """
+        Creates a wrapper for scan_field that additionally counts the revealed cells and the scanned traps.
+
+        Args:
+            original (Callable[..., Any]): original scan_field method
+            metric (str): name prefix of the recorded metrics
+
+        Returns:
+            Callable[..., Any]: measuring method
+        """
+        def scan_field(board: Board, row: int, col: int) -> bool:
+            discoverable = board.discoverable
+            start = time.perf_counter()
+            safe = original(board, row, col)
+            self.observe(f"{metric}.seconds", time.perf_counter() - start)
+            self.count(f"{metric}.calls")
+            if safe:
+                self.count(f"{metric}.revealed_cells", discoverable - board.discoverable)
+            else:
+                self.count(f"{metric}.traps")
+            return bool(safe)
+        return scan_field
+
+    def _scan_many_wrapper(self, original: Callable[..., Any], metric: str) -> Callable[..., Any]:
+        """
+        Creates a wrapper for scan_many that additionally counts the scanned fields, the revealed cells and the scanned traps.
+        The batch is timed as a whole, since its fields are not scanned one after the other.
+
+        Args:
+            original (Callable[..., Any]): original scan_many method
+            metric (str): name prefix of the recorded metrics
+
+        Returns:
+            Callable[..., Any]: measuring method
+        """
+        def scan_many(board: Board, cells: Any) -> ScanResult:
+            start = time.perf_counter()
+            result: ScanResult = original(board, cells)
+            self.observe(f"{metric}.seconds", time.perf_counter() - start)
+            self.count(f"{metric}.calls")
+            # Every scanned trap is revealed as well, like with scan_field only the safe cells count as revealed
+            traps = result.outcomes.count(False)
+            self.count(f"{metric}.fields", len(result.outcomes))
+            self.count(f"{metric}.revealed_cells", len(result.revealed) - traps)
+            self.count(f"{metric}.traps", traps)
+            return result
+        return scan_many
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Returns the recorded values.
+
+        Returns:
+            dict[str, Any]: counters and histograms as JSON-compatible dictionaries
+        """
+        return {
+            "counters": dict(sorted(self.counters.items())),
+            "histograms": {name: histogram.to_dict() for name, histogram in sorted(self.histograms.items())},
+        }
+
+    def to_json(self) -> str:
+        """
+        Returns the recorded values as JSON.
+
+        Returns:
+            str: JSON snapshot
+        """
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_text(self) -> str:
+        """
+        Returns the recorded values as a human-readable text snapshot.
+
+        Returns:
+            str: one line per counter and histogram
+        """
+        lines = [f"{name} {value}" for name, value in sorted(self.counters.items())]
+        for name, histogram in sorted(self.histograms.items()):
+            values = histogram.to_dict()
+            lines.append(f"{name} count={values['count']} mean={values['mean']:.6f} min={values['min']:.6f} max={values['max']:.6f}")
+        return "\n".join(lines)
+
+
+# Metrics registry of the process
+METRICS = Metrics()
@@ -0,0 +1,231 @@
+"""
+Board pool module for the abandoned space station game, generates boards ahead of time so new games start instantly
+"""
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+import queue
+import threading
+from collections import OrderedDict, deque
+
+from source.board import Board
+from source.engines import BOARD_ENGINES, create_board
+from source.generator import generate_board
+
+# Boards are pooled per requested width, height and density
+PoolKey = tuple[int, int, float | None]
+
+# Default number of boards kept ready per key and in total
+DEFAULT_PER_KEY = 1
+DEFAULT_CAPACITY = 8
+
+
+class BoardPool:
+    """
+    This class keeps boards ready for new games. A background thread generates the boards ahead of time (e.g. while the player reads the menu or plays the current game), so taking a board from the pool does not wait for the trap placement.
+    The pool is bounded: once it holds more boards than its capacity, the boards of the least recently used keys are evicted. If no board is ready, one is generated synchronously.
+    A no-guess pool only holds boards that can be solved without guessing from their start, which makes their generation much slower and the pool all the more worthwhile.
+    """
+    def __init__(self, engine: str = "list", per_key: int = DEFAULT_PER_KEY, capacity: int = DEFAULT_CAPACITY, no_guess: bool = False):
+        """
+        Initializes the pool and starts its background thread.
+
+        Args:
+            engine (str, optional): Name of the board engine. Defaults to "list".
+            per_key (int, optional): Number of boards kept ready per width, height and density. Defaults to DEFAULT_PER_KEY.
+            capacity (int, optional): Maximum number of boards kept ready in total. Defaults to DEFAULT_CAPACITY.
+            no_guess (bool, optional): Whether to generate boards that can be solved without guessing (see source/generator.py). Defaults to False.
+
+        Raises:
+            ValueError: If the engine name is unknown
+        """
+        if engine not in BOARD_ENGINES:
+            raise ValueError(f"Unknown board engine '{engine}', expected one of: {', '.join(BOARD_ENGINES)}")
+        self._engine = engine
+        self._per_key = per_key
+        self._capacity = capacity
+        self._no_guess = no_guess
+
+        # Ready boards per key, ordered from the least to the most recently used key
+        self._boards: OrderedDict[PoolKey, deque[Board]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Keys of the boards to generate in the background (None stops the thread)
+        self._requests: queue.Queue[PoolKey | None] = queue.Queue()
+
+        # Number of boards taken from the pool (hits) and generated synchronously (misses), and number of evicted boards
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        self._thread = threading.Thread(target=self._generate, name="board-pool", daemon=True)
+        self._thread.start()
+
+    @property
+    def hits(self) -> int:
+        """
+        Returns the number of boards that were ready when requested.
+
+        Returns:
+            int: number of pool hits
+        """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """
+        Returns the number of boards that had to be generated synchronously.
+
+        Returns:
+            int: number of pool misses
+        """
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        """
+        Returns the number of ready boards that were dropped to stay within the capacity.
+
+        Returns:
+            int: number of evicted boards
+        """
+        return self._evictions
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Returns the fraction of requested boards that were ready.
+
+        Returns:
+            float: hit rate between 0 and 1
+        """
+        requests = self._hits + self._misses
+        return self._hits / requests if requests else 0.0
+
+    @property
+    def ready(self) -> int:
+        """
+        Returns the number of boards ready in the pool.
+
+        Returns:
+            int: number of pooled boards
+        """
+        with self._lock:
+            return sum(len(boards) for boards in self._boards.values())
+
+    def prefetch(self, width: int = 0, height: int = 0, density: float | None = None) -> None:
+        """
+        Asks the background thread to generate boards of a given kind, up to the number of boards kept per key.
+
+        Args:
+            width (int, optional): Board width. Defaults to 0 (random width).
+            height (int, optional): Board height. Defaults to 0 (random height).
+            density (float | None, optional): Fraction of trapped cells. Defaults to None (random fraction).
+        """
+        key = (width, height, density)
+        with self._lock:
+            missing = self._per_key - len(self._boards.get(key, ()))
+        for _ in range(missing):
+            self._requests.put(key)
+
+    def get(self, width: int = 0, height: int = 0, density: float | None = None) -> Board:
+        """
+        Returns a new board, taken from the pool if one is ready and generated synchronously otherwise.
+        A replacement is generated in the background, so the next game of the same kind starts instantly.
+
+        Args:
+            width (int, optional): Board width. Defaults to 0 (random width).
+            height (int, optional): Board height. Defaults to 0 (random height).
+            density (float | None, optional): Fraction of trapped cells. Defaults to None (random fraction).
+
+        Returns:
+            Board: board that has not been played yet, with its start set if the pool is a no-guess pool
+        """
+        key = (width, height, density)
+        with self._lock:
+            boards = self._boards.get(key)
+            board = boards.popleft() if boards else None
+            if boards is not None:
+                self._boards.move_to_end(key)
+        if board is not None:
+            self._hits += 1
+        else:
+            self._misses += 1
+            board = self._create(width, height, density)
+        self._requests.put(key)
+        return board
+
+    def wait(self) -> None:
+        """
+        Waits until the background thread has generated all requested boards.
+        """
+        self._requests.join()
+
+    def close(self) -> None:
+        """
+        Stops the background thread and drops the ready boards.
+        """
+        if self._thread.is_alive():
+            self._requests.put(None)
+            self._thread.join()
+        with self._lock:
+            self._boards.clear()
+
+    def _generate(self) -> None:
+        """
+        Background thread: generates the requested boards and adds them to the pool.
+        """
+        while True:
+            key = self._requests.get()
+            try:
+                if key is None:
+                    return
+                with self._lock:
+                    if len(self._boards.get(key, ())) >= self._per_key:
+                        continue
+                width, height, density = key
+                # The board is generated outside of the lock, so taking boards from the pool never waits for a generation
+                board = self._create(width, height, density)
+                with self._lock:
+                    self._boards.setdefault(key, deque()).append(board)
+                    self._boards.move_to_end(key)
+                    self._evict()
+            finally:
+                self._requests.task_done()
+
+    def _create(self, width: int, height: int, density: float | None) -> Board:
+        """
+        Generates a board of the pool.
+
+        Args:
+            width (int): Board width (0 for a random width)
+            height (int): Board height (0 for a random height)
+            density (float | None): Fraction of trapped cells (None for a random fraction)
+
+        Returns:
+            Board: new board
+        """
+        if self._no_guess:
+            # The candidates are checked in this thread, a process pool per board would cost more than it saves on game-sized boards
+            board, _ = generate_board(width, height, density, engine=self._engine, workers=1)
+            return board
+        return create_board(width, height, engine=self._engine, density=density)
+
+    def _evict(self) -> None:
+        """
+        Drops the boards of the least recently used keys until the pool is within its capacity. Must be called with the lock held.
+        """
+        total = sum(len(boards) for boards in self._boards.values())
+        while total > self._capacity:
+            key, boards = next(iter(self._boards.items()))
+            boards.popleft()
+            total -= 1
+            self._evictions += 1
+            if not boards:
+                del self._boards[key]
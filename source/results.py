@@ -0,0 +1,413 @@
+"""
+Results module for the abandoned space station game, stores the outcomes of games in a local SQLite database and queries leaderboards
+"""
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+import argparse
+import queue
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from types import TracebackType
+from typing import NamedTuple
+
+from source.board import Board
+
+# Maximum number of games written in one transaction
+BATCH_SIZE = 10_000
+
+# Page cache of the background thread's connection, in KiB
+CACHE_KIB = 64 * 1024
+
+# Number of games shown by a leaderboard
+DEFAULT_LIMIT = 10
+
+# Games of every mode, and per-size totals that are kept up to date in the same transaction as the games, so the totals are never counted from the games table
+# The leaderboard indexes only hold won games and are ordered like the leaderboards, so the first rows of a leaderboard are read from an index without sorting
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    mode TEXT NOT NULL,
+    seed INTEGER,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    traps INTEGER NOT NULL,
+    moves INTEGER NOT NULL,
+    won INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    finished REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_leaderboard ON games (mode, duration, moves) WHERE won = 1;
+CREATE INDEX IF NOT EXISTS games_size_leaderboard ON games (mode, width, height, duration, moves) WHERE won = 1;
+CREATE TABLE IF NOT EXISTS sizes (
+    mode TEXT NOT NULL,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    games INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    moves INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    PRIMARY KEY (mode, width, height)
+) WITHOUT ROWID;
+"""
+
+INSERT_GAME = "INSERT INTO games (mode, seed, width, height, traps, moves, won, duration, finished) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+UPDATE_SIZE = """
+INSERT INTO sizes (mode, width, height, games, wins, moves, duration) VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (mode, width, height) DO UPDATE SET
+    games = games + excluded.games, wins = wins + excluded.wins, moves = moves + excluded.moves, duration = duration + excluded.duration
+"""
+GAME_COLUMNS = "mode, seed, width, height, traps, moves, won, duration, finished"
+
+
+class GameRecord(NamedTuple):
+    """
+    Outcome of a finished game.
+    """
+    # Where the game was played: "game" (interactive), "script" (scripted input), "simulation" (headless) or "server"
+    mode: str
+    # Seed of the board, None if the board cannot be generated again
+    seed: int | None
+    width: int
+    height: int
+    traps: int
+    moves: int
+    won: bool
+    # Time in seconds from the creation of the board to the end of the game
+    duration: float
+    # Time at which the game ended, in seconds since the epoch
+    finished: float
+
+
+class SizeStats(NamedTuple):
+    """
+    Totals of the games of one mode and board size.
+    """
+    mode: str
+    width: int
+    height: int
+    games: int
+    wins: int
+    moves: int
+    duration: float
+
+    @property
+    def win_rate(self) -> float:
+        """
+        Returns the fraction of games won.
+
+        Returns:
+            float: win rate between 0 and 1
+        """
+        return self.wins / self.games if self.games else 0.0
+
+    @property
+    def moves_per_game(self) -> float:
+        """
+        Returns the average number of moves per game.
+
+        Returns:
+            float: average number of moves
+        """
+        return self.moves / self.games if self.games else 0.0
+
+
+def game_record(mode: str, board: Board, traps: int, moves: int, won: bool, duration: float) -> GameRecord:
+    """
+    Returns the record of a finished game.
+
+    Args:
+        mode (str): where the game was played
+        board (Board): board of the game
+        traps (int): number of traps of the board
+        moves (int): number of scans of the game
+        won (bool): whether all safe cells were discovered
+        duration (float): duration of the game in seconds
+
+    Returns:
+        GameRecord: record to store
+    """
+    return GameRecord(mode, board.seed, board.width, board.height, traps, moves, won, duration, time.time())
+
+
+class ResultStore:
+    """
+    This class stores the outcomes of games in a SQLite database.
+    Recording a game only hands it to a background thread, which writes all games recorded in the meantime (up to the batch size) in a single transaction, so neither the game loop nor the server waits for the disk.
+    Leaderboards and per-size totals are read through a separate connection, which the write-ahead log lets read while the background thread writes.
+    """
+    def __init__(self, path: str, batch_size: int = BATCH_SIZE):
+        """
+        Opens a result database, creating it if it does not exist, and starts the background thread.
+
+        Args:
+            path (str): path of the database file
+            batch_size (int, optional): Maximum number of games written in one transaction. Defaults to BATCH_SIZE.
+        """
+        self._path = path
+        self._batch_size = batch_size
+
+        # The schema is created before any connection reads or writes
+        with sqlite3.connect(path) as connection:
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.executescript(SCHEMA)
+        connection.close()
+
+        # Connection of the queries, which may be used from any thread (one at a time)
+        self._reader = sqlite3.connect(path, check_same_thread=False)
+        self._reader_lock = threading.Lock()
+
+        # Batches of games to write (None stops the thread)
+        self._pending: queue.Queue[list[GameRecord] | None] = queue.Queue()
+
+        # Number of transactions committed so far
+        self._transactions = 0
+
+        # First error of a failed transaction since the last flush, raised by flush or close (the thread goes on with the next games)
+        self._error: Exception | None = None
+
+        self._thread = threading.Thread(target=self._write, name="result-store", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "ResultStore":
+        """
+        Returns the store, so that it is closed at the end of a with block.
+
+        Returns:
+            ResultStore: this store
+        """
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None) -> None:
+        """
+        Closes the store at the end of a with block.
+
+        Args:
+            exc_type (type[BaseException] | None): type of the raised exception, if any
+            exc_value (BaseException | None): raised exception, if any
+            traceback (TracebackType | None): traceback of the raised exception, if any
+        """
+        self.close()
+
+    @property
+    def transactions(self) -> int:
+        """
+        Returns the number of transactions committed so far.
+
+        Returns:
+            int: number of write transactions
+        """
+        return self._transactions
+
+    def record(self, game: GameRecord) -> None:
+        """
+        Hands a finished game to the background thread.
+
+        Args:
+            game (GameRecord): outcome of the game
+        """
+        self._pending.put([game])
+
+    def record_many(self, games: Iterable[GameRecord]) -> None:
+        """
+        Hands many finished games (e.g. of a headless simulation) to the background thread.
+
+        Args:
+            games (Iterable[GameRecord]): outcomes of the games
+        """
+        games = list(games)
+        if games:
+            self._pending.put(games)
+
+    def flush(self) -> None:
+        """
+        Waits until all recorded games are written.
+
+        Raises:
+            sqlite3.Error: If a transaction failed since the last flush (e.g. the disk is full or the database is locked), its games are lost
+        """
+        self._pending.join()
+        self._raise_error()
+
+    def close(self) -> None:
+        """
+        Writes the recorded games, stops the background thread and closes the database.
+
+        Raises:
+            sqlite3.Error: If a transaction failed since the last flush, its games are lost
+        """
+        if self._thread.is_alive():
+            self._pending.put(None)
+            self._thread.join()
+        self._reader.close()
+        self._raise_error()
+
+    def _raise_error(self) -> None:
+        """
+        Raises the error of a failed transaction of the background thread, once.
+        """
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def leaderboard(self, limit: int = DEFAULT_LIMIT, mode: str = "game", width: int | None = None, height: int | None = None) -> list[GameRecord]:
+        """
+        Returns the fastest won games, ties are broken by the number of moves.
+
+        Args:
+            limit (int, optional): Number of games. Defaults to DEFAULT_LIMIT.
+            mode (str, optional): Where the games were played. Defaults to "game".
+            width (int | None, optional): Only games on boards of this width and height. Defaults to None (all sizes).
+            height (int | None, optional): Height of the boards, required with the width. Defaults to None (all sizes).
+
+        Raises:
+            ValueError: If only one of width and height is given
+
+        Returns:
+            list[GameRecord]: games from the fastest to the slowest
+        """
+        if (width is None) != (height is None):
+            raise ValueError("The width and height of the boards must be given together.")
+        if width is None:
+            query = f"SELECT {GAME_COLUMNS} FROM games WHERE mode = ? AND won = 1 ORDER BY duration, moves LIMIT ?"
+            parameters: tuple[object, ...] = (mode, limit)
+        else:
+            query = (f"SELECT {GAME_COLUMNS} FROM games WHERE mode = ? AND width = ? AND height = ? AND won = 1 "
+                     "ORDER BY duration, moves LIMIT ?")
+            parameters = (mode, width, height, limit)
+        with self._reader_lock:
+            rows = self._reader.execute(query, parameters).fetchall()
+        return [GameRecord(mode, seed, width, height, traps, moves, bool(won), duration, finished)
+                for mode, seed, width, height, traps, moves, won, duration, finished in rows]
+
+    def sizes(self, mode: str | None = None) -> list[SizeStats]:
+        """
+        Returns the totals of the games per mode and board size.
+
+        Args:
+            mode (str | None, optional): Only the totals of this mode. Defaults to None (all modes).
+
+        Returns:
+            list[SizeStats]: totals ordered by mode, width and height
+        """
+        query = "SELECT mode, width, height, games, wins, moves, duration FROM sizes"
+        parameters: tuple[object, ...] = ()
+        if mode is not None:
+            query += " WHERE mode = ?"
+            parameters = (mode,)
+        with self._reader_lock:
+            rows = self._reader.execute(query + " ORDER BY mode, width, height", parameters).fetchall()
+        return [SizeStats(*row) for row in rows]
+
+    def count(self) -> int:
+        """
+        Returns the number of stored games.
+
+        Returns:
+            int: number of games of all modes and sizes
+        """
+        with self._reader_lock:
+            return int(self._reader.execute("SELECT COALESCE(SUM(games), 0) FROM sizes").fetchone()[0])
+
+    def _write(self) -> None:
+        """
+        Background thread: writes the recorded games in batches, one transaction per batch.
+        """
+        connection = sqlite3.connect(self._path)
+        # The write-ahead log only has to reach the disk at checkpoints, which keeps committing a batch cheap
+        connection.execute("PRAGMA synchronous = NORMAL")
+        # A larger page cache keeps the upper levels of the indexes in memory, since the durations of new games land all over the leaderboard indexes
+        connection.execute(f"PRAGMA cache_size = -{CACHE_KIB}")
+        try:
+            stop = False
+            while not stop:
+                # Wait for the first games, then take everything recorded in the meantime
+                batches = [self._pending.get()]
+                size = len(batches[0] or ())
+                while size < self._batch_size:
+                    try:
+                        batch = self._pending.get_nowait()
+                    except queue.Empty:
+                        break
+                    batches.append(batch)
+                    size += len(batch or ())
+                games = [game for batch in batches if batch is not None for game in batch]
+                stop = None in batches
+                try:
+                    if games:
+                        self._commit(connection, games)
+                except Exception as error:  # pylint: disable=broad-exception-caught
+                    # The thread must keep writing (and flush must not wait forever), the error is raised by the next flush or close
+                    if self._error is None:
+                        self._error = error
+                finally:
+                    for _ in batches:
+                        self._pending.task_done()
+        finally:
+            connection.close()
+
+    def _commit(self, connection: sqlite3.Connection, games: list[GameRecord]) -> None:
+        """
+        Writes games and updates the per-size totals in a single transaction.
+
+        Args:
+            connection (sqlite3.Connection): connection of the background thread
+            games (list[GameRecord]): games to write
+        """
+        totals: dict[tuple[str, int, int], list[float]] = {}
+        for game in games:
+            total = totals.setdefault((game.mode, game.width, game.height), [0, 0, 0, 0.0])
+            total[0] += 1
+            total[1] += game.won
+            total[2] += game.moves
+            total[3] += game.duration
+        with connection:
+            connection.executemany(INSERT_GAME, games)
+            connection.executemany(UPDATE_SIZE, [(*key, *total) for key, total in totals.items()])
+        self._transactions += 1
+
+
+def format_leaderboard(games: list[GameRecord]) -> str:
+    """
+    Returns a leaderboard as a table.
+
+    Args:
+        games (list[GameRecord]): games from the fastest to the slowest
+
+    Returns:
+        str: printable table
+    """
+    lines = [f"{'rank':>4}  {'size':>9}  {'traps':>5}  {'moves':>5}  {'seconds':>8}  seed"]
+    for rank, game in enumerate(games, start=1):
+        lines.append(f"{rank:>4}  {f'{game.width}x{game.height}':>9}  {game.traps:>5}  {game.moves:>5}  {game.duration:>8.2f}  {game.seed}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    """
+    Command line interface of the result store, prints a leaderboard and the totals per board size.
+    """
+    parser = argparse.ArgumentParser(description="Show the leaderboard of the abandoned space station game.")
+    parser.add_argument("path", help="result database")
+    parser.add_argument("--mode", default="game", help="where the games were played (game, script, simulation or server)")
+    parser.add_argument("--size", type=int, nargs=2, metavar=("WIDTH", "HEIGHT"), default=None, help="only games of this board size")
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT, help="number of games in the leaderboard")
+    args = parser.parse_args()
+    with ResultStore(args.path) as store:
+        width, height = args.size if args.size else (None, None)
+        print(format_leaderboard(store.leaderboard(args.limit, args.mode, width, height)))
+        print()
+        for size in store.sizes(args.mode):
+            print(f"{size.width}x{size.height}: {size.games} games, win rate {size.win_rate:.2%}, {size.moves_per_game:.1f} moves per game")
+
+
+if __name__ == "__main__":
+    main()
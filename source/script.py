@@ -0,0 +1,169 @@
+"""
+Script module for the abandoned space station game, drives a game session with input read from a file or a pipe instead of the keyboard
+"""
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+import time
+from typing import NamedTuple, TextIO
+
+from source.board import Board
+
+
+class ScriptStats(NamedTuple):
+    """
+    Statistics of a scripted session.
+    """
+    # Number of input lines that were read and of lines that the game rejected
+    lines: int
+    invalid: int
+    # Number of scans, finished games and won games
+    moves: int
+    games: int
+    wins: int
+    elapsed: float
+
+    @property
+    def moves_per_second(self) -> float:
+        """
+        Returns the throughput of the session.
+
+        Returns:
+            float: number of scans per second
+        """
+        return self.moves / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def lines_per_second(self) -> float:
+        """
+        Returns the number of input lines handled per second, including the lines of menus and the rejected lines.
+
+        Returns:
+            float: number of lines per second
+        """
+        return self.lines / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self) -> str:
+        """Returns a summary of the statistics.
+
+        Returns:
+            str: Printable summary
+        """
+        return (f"lines: {self.lines}, invalid: {self.invalid}, moves: {self.moves}, games: {self.games}, wins: {self.wins}, "
+                f"moves per second: {self.moves_per_second:.0f}, lines per second: {self.lines_per_second:.0f}")
+
+
+class Script:
+    """
+    This class is the input and output of a non-interactive game session: the game reads its input lines (the same lines a player would type) from a stream, and draws no screens.
+    Only the result of every finished game and, optionally, a summary every given number of moves are written to the output stream.
+    """
+    def __init__(self, stream: TextIO, output: TextIO | None = None, summary_interval: int = 0, report_games: bool = True):
+        """
+        Initializes the script.
+
+        Args:
+            stream (TextIO): stream of input lines, e.g. a file or the standard input
+            output (TextIO | None, optional): Stream the results are written to. Defaults to None (standard output at the time of writing).
+            summary_interval (int, optional): Number of moves between two summaries, 0 writes no summaries. Defaults to 0.
+            report_games (bool, optional): Whether the result of every finished game is written. Defaults to True.
+        """
+        self._lines = iter(stream)
+        self._output = output
+        self._summary_interval = summary_interval
+        self._report_games = report_games
+
+        # Counters of the session, and the number of moves at which the next summary is written
+        self._read = 0
+        self._invalid = 0
+        self._moves = 0
+        self._games = 0
+        self._wins = 0
+        self._next_summary = summary_interval if summary_interval > 0 else -1
+        self._start_time = time.perf_counter()
+
+    @property
+    def output(self) -> TextIO:
+        """
+        Returns the stream the results are written to.
+
+        Returns:
+            TextIO: output stream
+        """
+        return self._output if self._output is not None else sys.stdout
+
+    @property
+    def stats(self) -> ScriptStats:
+        """
+        Returns the statistics of the session so far.
+
+        Returns:
+            ScriptStats: counters and elapsed time
+        """
+        return ScriptStats(self._read, self._invalid, self._moves, self._games, self._wins, time.perf_counter() - self._start_time)
+
+    def read_line(self) -> str:
+        """
+        Reads the next input line.
+
+        Raises:
+            EOFError: If the stream has no more lines, like input at the end of the standard input
+
+        Returns:
+            str: the line without its line break
+        """
+        try:
+            line = next(self._lines)
+        except StopIteration:
+            raise EOFError("end of the script") from None
+        self._read += 1
+        return line.rstrip("\n")
+
+    def invalid(self) -> None:
+        """
+        Counts an input line that the game rejected.
+        """
+        self._invalid += 1
+
+    def moved(self) -> None:
+        """
+        Counts a scan, and writes a summary once the summary interval is reached.
+        """
+        self._moves += 1
+        if self._moves == self._next_summary:
+            self._next_summary += self._summary_interval
+            self.output.write(f"{self.stats}\n")
+
+    def game_over(self, board: Board, won: bool, moves: int) -> None:
+        """
+        Counts a finished game and writes its result.
+
+        Args:
+            board (Board): board of the game
+            won (bool): whether all safe cells were discovered
+            moves (int): number of scans of the game
+        """
+        self._games += 1
+        self._wins += won
+        if self._report_games:
+            self.output.write(f"game {self._games}: {'won' if won else 'lost'} after {moves} moves "
+                              f"({board.width}x{board.height}, seed {board.seed})\n")
+
+    def finish(self) -> ScriptStats:
+        """
+        Writes the summary of the whole session.
+
+        Returns:
+            ScriptStats: statistics of the session
+        """
+        stats = self.stats
+        output = self.output
+        output.write(f"{stats}\n")
+        output.flush()
+        return stats
@@ -0,0 +1,453 @@
+"""
+Server module for the abandoned space station game, hosts many game sessions over TCP in a single process
+"""
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+import argparse
+import asyncio
+import time
+from itertools import count
+
+from source.board import Board
+from source.engines import BOARD_ENGINES, create_board
+from source.generator import generate_board
+from source.results import ResultStore, game_record
+from source.spectate import SpectatorFeed, Subscriber
+
+# Default address of the server (only reachable from the local machine)
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Largest board a client may create, so that a single session cannot exhaust the server's memory
+MAX_CELLS = 1_000_000
+
+# Largest board and number of candidate layouts of a game without guessing, since the candidates are checked on the event loop
+MAX_NO_GUESS_CELLS = 900
+NO_GUESS_CANDIDATES = 100
+
+# Number of connections that may wait to be accepted, large enough for thousands of clients connecting at once
+BACKLOG = 4096
+
+# Protocol (one command per line, one response per command):
+#   NEW [width height [density [seed]]] -> OK <width> <height> <discoverable>
+#   NEW [width height [density [seed]]] NOGUESS
+#                                       -> OK <width> <height> <discoverable> <row> <col>, the board can be solved without guessing
+#                                          and the server has already scanned its start at the given row and column
+#   SCAN <row> <col>                    -> SAFE <discoverable> | WON | TRAP
+#   RENDER                              -> BOARD <number of lines>, followed by the lines of the printed board
+#   SESSION                             -> SESSION <id>, the id other clients watch the games of this session with
+#   WATCH <id>                          -> WATCHING <id>, followed by the frames of the spectator feed of the session (see source/spectate.py)
+#                                          until the session ends or the spectator sends a line or disconnects
+#   QUIT                                -> BYE, then the connection is closed
+# Invalid commands are answered with ERR <message>
+PROTOCOL_HELP = "commands: NEW [width height [density [seed]]] [NOGUESS], SCAN row col, RENDER, SESSION, WATCH id, QUIT"
+
+
+class ProtocolError(Exception):
+    """
+    Raised when a client sends an invalid command.
+    """
+
+
+class Session:
+    """
+    This class represents the state of one client connection: the board of its current game and whether that game is over.
+    """
+    def __init__(self, session_id: int = 0) -> None:
+        """
+        Initializes a session without a game.
+
+        Args:
+            session_id (int, optional): Id of the session, unique per server. Defaults to 0.
+        """
+        self.id = session_id
+        self.board: Board | None = None
+        self.game_over = False
+
+        # Feed the games of the session are broadcast to (created when the first spectator watches),
+        # and the subscription to another session's feed once this connection watches it
+        self.feed: SpectatorFeed | None = None
+        self.subscription: Subscriber | None = None
+
+        # Number of traps, scans and start time of the current game, recorded with its outcome
+        self.traps = 0
+        self.moves = 0
+        self.started = 0.0
+
+
+def _stop_watching(task: "asyncio.Future[bytes]", subscriber: Subscriber) -> None:
+    """
+    Cancels the subscription of a spectator once it sent a line or disconnected.
+
+    Args:
+        task (asyncio.Future[bytes]): finished read of the spectator's connection
+        subscriber (Subscriber): subscription of the spectator
+    """
+    if not task.cancelled():
+        # A lost connection is not an error of the server, the exception is only retrieved so that it is not logged
+        task.exception()
+    subscriber.cancel()
+
+
+class GameServer:
+    """
+    This class hosts game sessions over TCP. Every connection is one session served by its own coroutine, so thousands of sessions share a single process and thread.
+    """
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, engine: str = "list", results: ResultStore | None = None):
+        """
+        Initializes the server without starting it.
+
+        Args:
+            host (str, optional): Address to listen on. Defaults to DEFAULT_HOST.
+            port (int, optional): Port to listen on, 0 picks a free port. Defaults to DEFAULT_PORT.
+            engine (str, optional): Name of the board engine of the sessions. Defaults to "list".
+            results (ResultStore | None, optional): Store the outcomes of the games are recorded to. Defaults to None (no recording).
+
+        Raises:
+            ValueError: If the engine name is unknown
+        """
+        if engine not in BOARD_ENGINES:
+            raise ValueError(f"Unknown board engine '{engine}', expected one of: {', '.join(BOARD_ENGINES)}")
+        self._host = host
+        self._port = port
+        self._engine = engine
+        self._results = results
+        self._server: asyncio.Server | None = None
+
+        # Number of open sessions and of handled commands
+        self._sessions = 0
+        self._commands = 0
+
+        # Open sessions by id, which spectators watch, and the ids of new sessions
+        self._players: dict[int, Session] = {}
+        self._ids = count(1)
+
+    @property
+    def port(self) -> int:
+        """
+        Returns the port the server listens on (the actual port once started, if it was started on port 0).
+
+        Returns:
+            int: port number
+        """
+        if self._server is not None and self._server.sockets:
+            return int(self._server.sockets[0].getsockname()[1])
+        return self._port
+
+    @property
+    def sessions(self) -> int:
+        """
+        Returns the number of open sessions.
+
+        Returns:
+            int: number of connected clients
+        """
+        return self._sessions
+
+    @property
+    def commands(self) -> int:
+        """
+        Returns the number of commands handled since the server started.
+
+        Returns:
+            int: number of handled commands
+        """
+        return self._commands
+
+    async def start(self) -> None:
+        """
+        Starts listening for connections.
+        """
+        # The default line limit of 64 KiB is plenty for commands, the responses are not limited
+        self._server = await asyncio.start_server(self._serve, self._host, self._port, backlog=BACKLOG)
+
+    async def serve_forever(self) -> None:
+        """
+        Starts the server if needed and serves connections until cancelled.
+        """
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """
+        Stops listening and waits until the server is closed.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Serves one connection: reads commands line by line and writes their responses until the client quits or disconnects.
+
+        Args:
+            reader (asyncio.StreamReader): stream of the client's commands
+            writer (asyncio.StreamWriter): stream of the responses
+        """
+        session = Session(next(self._ids))
+        self._sessions += 1
+        self._players[session.id] = session
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode("utf-8", errors="replace").strip()
+                response = self.handle(session, command)
+                writer.write(response.encode("utf-8"))
+                await writer.drain()
+                if response == "BYE\n":
+                    break
+                if session.subscription is not None:
+                    # The connection only receives the frames of the watched session from now on
+                    await self._stream(session.subscription, reader, writer)
+                    break
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            # The client disconnected or sent a line longer than the stream limit
+            pass
+        finally:
+            self._sessions -= 1
+            del self._players[session.id]
+            if session.feed is not None:
+                # Tells the spectators that the session ended
+                session.feed.close()
+            if session.subscription is not None:
+                session.subscription.cancel()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _stream(self, subscriber: Subscriber, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Sends the frames of a spectator feed to a spectator until the feed is closed or the spectator stops watching.
+        All frames published while the previous write was drained are sent at once, and a spectator whose connection falls too far behind is resynchronized by the feed.
+
+        Args:
+            subscriber (Subscriber): subscription of the spectator
+            reader (asyncio.StreamReader): stream of the spectator's lines, any line (or disconnecting) stops watching
+            writer (asyncio.StreamWriter): stream of the frames
+        """
+        loop = asyncio.get_running_loop()
+        stop = asyncio.ensure_future(reader.readline())
+        stop.add_done_callback(lambda task: _stop_watching(task, subscriber))
+        try:
+            while not subscriber.closed:
+                frames = subscriber.read()
+                if frames:
+                    writer.write(frames)
+                    await writer.drain()
+                    continue
+                waiter = loop.create_future()
+                subscriber.wait(lambda waiter=waiter: waiter.done() or waiter.set_result(None))
+                await waiter
+        finally:
+            stop.cancel()
+
+    def handle(self, session: Session, command: str) -> str:
+        """
+        Executes a command of a session and returns its response. The game logic is synchronous, so a command never blocks the other sessions for longer than a board operation.
+
+        Args:
+            session (Session): session that sent the command
+            command (str): command line without the line break
+
+        Returns:
+            str: response, ending with a line break
+        """
+        self._commands += 1
+        name, *args = command.split() or [""]
+        try:
+            name = name.upper()
+            if name == "NEW":
+                return self._new(session, args)
+            if name == "SCAN":
+                return self._scan(session, args)
+            if name == "RENDER":
+                lines = str(self._board(session)).splitlines()
+                return f"BOARD {len(lines)}\n" + "\n".join(lines) + "\n"
+            if name == "SESSION":
+                return f"SESSION {session.id}\n"
+            if name == "WATCH":
+                return self._watch(session, args)
+            if name == "QUIT":
+                return "BYE\n"
+            raise ProtocolError(f"unknown command '{name}', {PROTOCOL_HELP}")
+        except ProtocolError as error:
+            return f"ERR {error}\n"
+
+    def _board(self, session: Session) -> Board:
+        """
+        Returns the board of a session.
+
+        Args:
+            session (Session): session of the client
+
+        Raises:
+            ProtocolError: If the session has not started a game
+
+        Returns:
+            Board: board of the current game
+        """
+        if session.board is None:
+            raise ProtocolError("no game started, send NEW first")
+        return session.board
+
+    def _new(self, session: Session, args: list[str]) -> str:
+        """
+        Starts a new game in a session.
+
+        Args:
+            session (Session): session of the client
+            args (list[str]): optional width and height, density and seed, optionally followed by NOGUESS
+
+        Raises:
+            ProtocolError: If the arguments are invalid or no board without guessing is found
+
+        Returns:
+            str: OK response with the board size and the number of safe cells, and the start of a board without guessing
+        """
+        no_guess = bool(args) and args[-1].upper() == "NOGUESS"
+        if no_guess:
+            args = args[:-1]
+        if len(args) not in (0, 2, 3, 4):
+            raise ProtocolError("usage: NEW [width height [density [seed]]] [NOGUESS]")
+        try:
+            width, height = (int(args[0]), int(args[1])) if args else (0, 0)
+            density = float(args[2]) if len(args) > 2 else None
+            seed = int(args[3]) if len(args) > 3 else None
+        except ValueError as error:
+            raise ProtocolError("width, height and seed must be integers and density a number") from error
+        if width < 0 or height < 0 or width * height > MAX_CELLS:
+            raise ProtocolError(f"the board must have at most {MAX_CELLS} cells")
+        if no_guess and width * height > MAX_NO_GUESS_CELLS:
+            raise ProtocolError(f"a board without guessing must have at most {MAX_NO_GUESS_CELLS} cells")
+        try:
+            if no_guess:
+                board, _ = generate_board(width, height, density, seed, workers=1, engine=self._engine, max_candidates=NO_GUESS_CANDIDATES)
+            else:
+                board = create_board(width, height, engine=self._engine, density=density, seed=seed)
+        except (ValueError, RuntimeError) as error:
+            raise ProtocolError(str(error)) from error
+        session.board = board
+        session.game_over = False
+        if session.feed is not None:
+            session.feed.attach(board)
+        session.traps = board.width * board.height - board.discoverable
+        session.moves = 0
+        session.started = time.perf_counter()
+        if board.start is None:
+            return f"OK {board.width} {board.height} {board.discoverable}\n"
+        # The start is scanned for the player (and shown to the spectators), it does not count as a move
+        board.scan_field(*board.start)
+        row, col = board.start
+        return f"OK {board.width} {board.height} {board.discoverable} {row} {col}\n"
+
+    def _watch(self, session: Session, args: list[str]) -> str:
+        """
+        Subscribes a session to the spectator feed of another session.
+
+        Args:
+            session (Session): session of the spectator
+            args (list[str]): id of the watched session
+
+        Raises:
+            ProtocolError: If the arguments are invalid or no session has the id
+
+        Returns:
+            str: WATCHING response with the id of the watched session
+        """
+        try:
+            session_id, = map(int, args)
+        except ValueError as error:
+            raise ProtocolError("usage: WATCH id") from error
+        player = self._players.get(session_id)
+        if player is None:
+            raise ProtocolError(f"there is no session {session_id}")
+        if player.feed is None:
+            player.feed = SpectatorFeed(player.board)
+        session.subscription = player.feed.subscribe()
+        return f"WATCHING {session_id}\n"
+
+    def _scan(self, session: Session, args: list[str]) -> str:
+        """
+        Scans a cell of the board of a session.
+
+        Args:
+            session (Session): session of the client
+            args (list[str]): row and column
+
+        Raises:
+            ProtocolError: If no game is running or the cell is invalid
+
+        Returns:
+            str: SAFE response with the number of safe cells left, WON once all safe cells are discovered, TRAP if the cell is a trap
+        """
+        board = self._board(session)
+        if session.game_over:
+            raise ProtocolError("the game is over, send NEW to start a new game")
+        try:
+            row, col = map(int, args)
+        except ValueError as error:
+            raise ProtocolError("usage: SCAN row col") from error
+        if not (0 <= row < board.height and 0 <= col < board.width):
+            raise ProtocolError("the cell is outside of the board")
+        session.moves += 1
+        if not board.scan_field(row, col):
+            self._game_over(session, won=False)
+            return "TRAP\n"
+        if board.discoverable == 0:
+            self._game_over(session, won=True)
+            return "WON\n"
+        return f"SAFE {board.discoverable}\n"
+
+    def _game_over(self, session: Session, won: bool) -> None:
+        """
+        Ends the game of a session and records its outcome.
+
+        Args:
+            session (Session): session of the client
+            won (bool): whether all safe cells were discovered
+        """
+        session.game_over = True
+        if self._results is not None and session.board is not None:
+            # Only hands the game to the store's background thread, so the event loop does not wait for the database
+            self._results.record(game_record("server", session.board, session.traps, session.moves, won, time.perf_counter() - session.started))
+
+
+def main() -> None:
+    """
+    Command line interface of the server.
+    """
+    parser = argparse.ArgumentParser(description="Host abandoned space station games over TCP.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="address to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port to listen on")
+    parser.add_argument("--engine", choices=BOARD_ENGINES, default="list", help="board engine")
+    parser.add_argument("--results", default=None, help="SQLite database the outcomes of the games are recorded to")
+    args = parser.parse_args()
+    results = ResultStore(args.results) if args.results else None
+    server = GameServer(args.host, args.port, args.engine, results)
+    print(f"Listening on {args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if results is not None:
+            results.close()
+
+
+if __name__ == "__main__":
+    main()
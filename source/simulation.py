@@ -0,0 +1,351 @@
+"""
+Headless simulation module for the abandoned space station game, plays many games without a user interface
+"""
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+import argparse
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from random import Random
+from typing import NamedTuple
+
+from source.board import Board
+from source.engines import create_board
+from source.results import GameRecord, ResultStore, game_record
+from source.solver import Solver
+
+
+class Strategy(ABC):
+    """
+    Base class of a player strategy. A strategy chooses the next cell to scan and may only use what a player can see (the board size and Board.revealed_count).
+    """
+    def __init__(self, board: Board, rng: Random):
+        """
+        Initializes the strategy for a new game.
+
+        Args:
+            board (Board): board of the game
+            rng (Random): random number generator of the strategy
+        """
+        self._board = board
+        self._rng = rng
+
+    @abstractmethod
+    def next_move(self) -> tuple[int, int]:
+        """
+        Chooses the next cell to scan.
+
+        Returns:
+            tuple[int, int]: row and column of an undiscovered cell
+        """
+
+
+class ScanOrderStrategy(Strategy):
+    """
+    Strategy that scans the undiscovered cells row by row.
+    """
+    def __init__(self, board: Board, rng: Random):
+        """
+        Initializes the strategy for a new game.
+
+        Args:
+            board (Board): board of the game
+            rng (Random): random number generator of the strategy
+        """
+        super().__init__(board, rng)
+        # Flat index of the next cell to look at
+        self._next_cell = 0
+
+    def next_move(self) -> tuple[int, int]:
+        """
+        Chooses the first undiscovered cell in row-major order.
+
+        Returns:
+            tuple[int, int]: row and column of an undiscovered cell
+        """
+        width = self._board.width
+        while True:
+            row, col = divmod(self._next_cell, width)
+            self._next_cell += 1
+            if self._board.revealed_count(row, col) is None:
+                return row, col
+
+
+class RandomStrategy(Strategy):
+    """
+    Strategy that scans the undiscovered cells in random order.
+    """
+    def __init__(self, board: Board, rng: Random):
+        """
+        Initializes the strategy for a new game.
+
+        Args:
+            board (Board): board of the game
+            rng (Random): random number generator of the strategy
+        """
+        super().__init__(board, rng)
+        # All cells in random order; cells revealed in the meantime are skipped when they come up
+        self._order = list(range(board.width * board.height))
+        rng.shuffle(self._order)
+
+    def next_move(self) -> tuple[int, int]:
+        """
+        Chooses a random undiscovered cell.
+
+        Returns:
+            tuple[int, int]: row and column of an undiscovered cell
+        """
+        width = self._board.width
+        while True:
+            row, col = divmod(self._order.pop(), width)
+            if self._board.revealed_count(row, col) is None:
+                return row, col
+
+
+class SolverStrategy(RandomStrategy):
+    """
+    Strategy that scans the cells deduced to be safe by the solver and only guesses a random cell when the solver is stuck.
+    """
+    def __init__(self, board: Board, rng: Random):
+        """
+        Initializes the strategy for a new game.
+
+        Args:
+            board (Board): board of the game
+            rng (Random): random number generator of the strategy
+        """
+        super().__init__(board, rng)
+        self._solver = Solver(board)
+
+    def next_move(self) -> tuple[int, int]:
+        """
+        Chooses a cell deduced to be safe, or a random undiscovered cell that is not known to be a trap.
+
+        Returns:
+            tuple[int, int]: row and column of an undiscovered cell
+        """
+        self._solver.deduce()
+        safe_cell = self._solver.next_safe_cell()
+        if safe_cell is not None:
+            return safe_cell
+        while True:
+            row, col = super().next_move()
+            if not self._solver.is_trap(row, col):
+                return row, col
+
+
+# Available strategies, selectable by name (names can be sent to worker processes, unlike the classes' instances)
+STRATEGIES: dict[str, type[Strategy]] = {
+    "scan_order": ScanOrderStrategy,
+    "random": RandomStrategy,
+    "solver": SolverStrategy,
+}
+
+
+class GameResult(NamedTuple):
+    """
+    Result of a single simulated game.
+    """
+    won: bool
+    moves: int
+
+
+class SimulationStats(NamedTuple):
+    """
+    Aggregate statistics of simulated games.
+    """
+    games: int
+    wins: int
+    moves: int
+    elapsed: float
+
+    @property
+    def win_rate(self) -> float:
+        """
+        Returns the fraction of games won.
+
+        Returns:
+            float: win rate between 0 and 1
+        """
+        return self.wins / self.games if self.games else 0.0
+
+    @property
+    def moves_per_game(self) -> float:
+        """
+        Returns the average number of moves per game.
+
+        Returns:
+            float: average number of moves
+        """
+        return self.moves / self.games if self.games else 0.0
+
+    @property
+    def games_per_second(self) -> float:
+        """
+        Returns the simulation throughput.
+
+        Returns:
+            float: number of games simulated per second
+        """
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self) -> str:
+        """Returns a summary of the statistics.
+
+        Returns:
+            str: Printable summary
+        """
+        return (f"games: {self.games}, win rate: {self.win_rate:.2%}, moves per game: {self.moves_per_game:.2f}, "
+                f"games per second: {self.games_per_second:.1f}")
+
+
+def play_game(board: Board, strategy: Strategy) -> GameResult:
+    """
+    Plays a game on a board until the strategy steps on a trap or discovers all safe cells.
+
+    Args:
+        board (Board): board to play on
+        strategy (Strategy): strategy choosing the moves
+
+    Returns:
+        GameResult: outcome of the game
+    """
+    moves = 0
+    while board.discoverable > 0:
+        row, col = strategy.next_move()
+        moves += 1
+        if not board.scan_field(row, col):
+            return GameResult(False, moves)
+    return GameResult(True, moves)
+
+
+class Chunk(NamedTuple):
+    """
+    Batch of games simulated by a single worker.
+    """
+    strategy: str
+    width: int
+    height: int
+    density: float | None
+    engine: str
+    seed: int
+    start: int
+    count: int
+    # Whether the outcome of every game is returned to be stored
+    record: bool = False
+
+
+def play_chunk(chunk: Chunk) -> tuple[int, int, list[GameRecord]]:
+    """
+    Plays a batch of games. The worker's random number generator is seeded from the simulation seed and the chunk's first game, so the results do not depend on the number of workers.
+
+    Args:
+        chunk (Chunk): batch of games to play
+
+    Returns:
+        tuple[int, int, list[GameRecord]]: number of won games, total number of moves and outcomes of the games (empty unless the chunk records them)
+    """
+    rng = Random(f"{chunk.seed}-{chunk.start}")
+    strategy_class = STRATEGIES[chunk.strategy]
+    wins = 0
+    moves = 0
+    records = []
+    for _ in range(chunk.count):
+        start_time = time.perf_counter()
+        board = create_board(chunk.width, chunk.height, engine=chunk.engine, density=chunk.density, seed=rng.getrandbits(63))
+        traps = board.width * board.height - board.discoverable
+        result = play_game(board, strategy_class(board, rng))
+        wins += result.won
+        moves += result.moves
+        if chunk.record:
+            records.append(game_record("simulation", board, traps, result.moves, result.won, time.perf_counter() - start_time))
+    return wins, moves, records
+
+
+def run_batch(games: int, strategy: str = "random", width: int = 10, height: int = 10, density: float | None = None,
+              seed: int | None = None, workers: int | None = None, engine: str = "list", chunk_size: int = 100,
+              results: ResultStore | None = None) -> SimulationStats:
+    """
+    Simulates many games, spread over a pool of worker processes.
+
+    Args:
+        games (int): number of games to simulate
+        strategy (str, optional): Name of the strategy, one of STRATEGIES. Defaults to "random".
+        width (int, optional): Board width. Defaults to 10.
+        height (int, optional): Board height. Defaults to 10.
+        density (float | None, optional): Fraction of trapped cells. Defaults to None (random fraction per board).
+        seed (int | None, optional): Seed of the simulation. Defaults to None (random seed).
+        workers (int | None, optional): Number of worker processes, 1 simulates in the current process. Defaults to None (one per CPU core).
+        engine (str, optional): Name of the board engine. Defaults to "list".
+        chunk_size (int, optional): Number of games per batch sent to a worker. Defaults to 100.
+        results (ResultStore | None, optional): Store the outcome of every game is recorded to. Defaults to None (no recording).
+
+    Raises:
+        ValueError: If the strategy name is unknown
+
+    Returns:
+        SimulationStats: aggregate statistics of the simulated games
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy '{strategy}', expected one of: {', '.join(STRATEGIES)}")
+    if seed is None:
+        seed = Random().getrandbits(63)
+
+    chunks = [
+        Chunk(strategy, width, height, density, engine, seed, start, min(chunk_size, games - start), results is not None)
+        for start in range(0, games, chunk_size)
+    ]
+
+    start_time = time.perf_counter()
+    wins = 0
+    moves = 0
+    executor = None if workers == 1 else ProcessPoolExecutor(max_workers=workers)
+    try:
+        for chunk_wins, chunk_moves, records in (executor.map(play_chunk, chunks) if executor is not None else map(play_chunk, chunks)):
+            wins += chunk_wins
+            moves += chunk_moves
+            if results is not None:
+                # The chunks are stored as they arrive, so the records of millions of games are never held in memory at once
+                results.record_many(records)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    elapsed = time.perf_counter() - start_time
+
+    return SimulationStats(games, wins, moves, elapsed)
+
+
+def main() -> None:
+    """
+    Command line interface of the simulation.
+    """
+    parser = argparse.ArgumentParser(description="Simulate games of the abandoned space station game without a user interface.")
+    parser.add_argument("--games", type=int, default=1000, help="number of games to simulate")
+    parser.add_argument("--strategy", choices=STRATEGIES, default="random", help="player strategy")
+    parser.add_argument("--width", type=int, default=10, help="board width")
+    parser.add_argument("--height", type=int, default=10, help="board height")
+    parser.add_argument("--density", type=float, default=None, help="fraction of trapped cells")
+    parser.add_argument("--seed", type=int, default=None, help="simulation seed")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--engine", default="list", help="board engine")
+    parser.add_argument("--results", default=None, help="SQLite database the outcomes of the games are recorded to")
+    args = parser.parse_args()
+    results = ResultStore(args.results) if args.results else None
+    try:
+        print(run_batch(args.games, args.strategy, args.width, args.height, args.density, args.seed, args.workers, args.engine,
+                        results=results))
+    finally:
+        if results is not None:
+            results.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""
+Solver module for the abandoned space station game, deduces safe and trapped cells from the revealed numbers
+"""
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+import time
+from collections import deque
+
+from source.board import Board
+
+# Knowledge of the solver about a cell
+UNKNOWN = 0
+SAFE = 1
+TRAP = 2
+REVEALED = 3
+
+
+class Solver:
+    """
+    This class deduces safe and trapped cells of a board by constraint propagation over the revealed numbers.
+    Only the revealed cells whose neighborhood changed are checked again: the solver listens to the cells revealed by Board.scan_field and keeps a queue of constraints to check, instead of rescanning the whole board after each deduction.
+    """
+    def __init__(self, board: Board):
+        """
+        Initializes the solver with the current state of a board and starts listening to its reveals.
+
+        Args:
+            board (Board): board to solve, possibly in the middle of a game
+        """
+        self._board = board
+        self._width = board.width
+        self._height = board.height
+
+        # Adjacency lists of the board's rows, shared by all boards of the same shape
+        self._rows = board.neighbor_table.rows
+
+        # Knowledge about each cell (UNKNOWN, SAFE, TRAP or REVEALED), indexed by row * width + col
+        self._state = bytearray(self._width * self._height)
+
+        # For each revealed cell: number of unknown neighbors and number of traps among them
+        # Both counters are updated whenever a neighbor becomes known, so checking a constraint takes constant time
+        self._unknown = bytearray(self._width * self._height)
+        self._remaining = bytearray(self._width * self._height)
+
+        # Revealed cells whose constraint has to be checked (again)
+        self._queue: deque[int] = deque()
+
+        # Revealed cells that still have unknown neighbors
+        self._frontier: set[int] = set()
+
+        # Frontier cells whose constraint changed since the last comparison of nearby constraints
+        self._changed: set[int] = set()
+
+        # Cells deduced to be safe that have not been scanned yet, in the order of deduction
+        self._pending_safe: dict[int, None] = {}
+
+        # Number of deduced cells and time spent deducing them
+        self._deductions = 0
+        self._elapsed = 0.0
+
+        for row in range(self._height):
+            for col in range(self._width):
+                if board._cell_discovered(row, col):
+                    self._on_reveal(row, col, col + 1)
+        board.add_reveal_listener(self._on_reveal)
+
+    def detach(self) -> None:
+        """
+        Stops listening to the board's reveals.
+        """
+        self._board.remove_reveal_listener(self._on_reveal)
+
+    @property
+    def deductions(self) -> int:
+        """
+        Returns the number of cells deduced so far.
+
+        Returns:
+            int: number of deduced safe and trapped cells
+        """
+        return self._deductions
+
+    @property
+    def deductions_per_second(self) -> float:
+        """
+        Returns the deduction throughput of the solver.
+
+        Returns:
+            float: number of deduced cells per second spent deducing
+        """
+        return self._deductions / self._elapsed if self._elapsed else 0.0
+
+    @property
+    def safe_cells(self) -> list[tuple[int, int]]:
+        """
+        Returns the cells deduced to be safe that have not been revealed yet.
+
+        Returns:
+            list[tuple[int, int]]: rows and columns of the safe cells
+        """
+        return [divmod(cell, self._width) for cell in self._pending_safe]
+
+    @property
+    def trap_cells(self) -> list[tuple[int, int]]:
+        """
+        Returns the cells deduced (or revealed) to be traps.
+
+        Returns:
+            list[tuple[int, int]]: rows and columns of the trapped cells
+        """
+        return [divmod(cell, self._width) for cell, state in enumerate(self._state) if state == TRAP]
+
+    def next_safe_cell(self) -> tuple[int, int] | None:
+        """
+        Returns the earliest deduced safe cell that has not been revealed yet.
+
+        Returns:
+            tuple[int, int] | None: row and column of a safe cell, None if no safe cell is pending
+        """
+        for cell in self._pending_safe:
+            return divmod(cell, self._width)
+        return None
+
+    def is_trap(self, row: int, col: int) -> bool:
+        """
+        Returns whether a cell is deduced (or revealed) to be a trap.
+
+        Args:
+            row (int): row of the cell
+            col (int): column of the cell
+
+        Returns:
+            bool: True if the cell is known to be a trap
+        """
+        return self._state[row * self._width + col] == TRAP
+
+    def _on_reveal(self, row: int, start: int, stop: int) -> None:
+        """
+        Updates the solver's knowledge with revealed cells.
+
+        Args:
+            row (int): row of the revealed cells
+            start (int): first revealed column
+            stop (int): column after the last revealed column
+        """
+        state = self._state
+        board = self._board
+        for col in range(start, stop):
+            cell = row * self._width + col
+            previous = state[cell]
+            if previous == REVEALED:
+                continue
+            self._pending_safe.pop(cell, None)
+            if board._cell_trapped(row, col):
+                # A revealed trap counts like a deduced one
+                if previous == UNKNOWN:
+                    self._set_known(cell, TRAP)
+                continue
+            if previous == UNKNOWN:
+                self._set_known(cell, REVEALED)
+            state[cell] = REVEALED
+
+            # Set up the constraint of the revealed cell
+            unknown = 0
+            traps = board._cell_surrounding(row, col)
+            for neighbor in self._neighbors(cell):
+                if state[neighbor] == UNKNOWN:
+                    unknown += 1
+                elif state[neighbor] == TRAP:
+                    traps -= 1
+            self._unknown[cell] = unknown
+            self._remaining[cell] = traps
+            self._queue.append(cell)
+
+    def _neighbors(self, cell: int) -> list[int]:
+        """
+        Returns the neighboring cells of a cell.
+
+        Args:
+            cell (int): flat index of the cell
+
+        Returns:
+            list[int]: flat indices of the neighboring cells
+        """
+        row, col = divmod(cell, self._width)
+        base = cell - col
+        return [base + neighbor for neighbor in self._rows[row][col]]
+
+    def _set_known(self, cell: int, knowledge: int) -> None:
+        """
+        Records that an unknown cell became known and updates the constraints of its revealed neighbors.
+
+        Args:
+            cell (int): flat index of the cell
+            knowledge (int): SAFE, TRAP or REVEALED
+        """
+        state = self._state
+        state[cell] = knowledge
+        for neighbor in self._neighbors(cell):
+            if state[neighbor] == REVEALED:
+                self._unknown[neighbor] -= 1
+                if knowledge == TRAP:
+                    self._remaining[neighbor] -= 1
+                self._queue.append(neighbor)
+
+    def _constraint(self, cell: int) -> tuple[list[int], int]:
+        """
+        Returns the constraint of a revealed cell over its unknown neighbors.
+
+        Args:
+            cell (int): flat index of a revealed cell
+
+        Returns:
+            tuple[list[int], int]: unknown neighbors and number of traps among them
+        """
+        state = self._state
+        return [neighbor for neighbor in self._neighbors(cell) if state[neighbor] == UNKNOWN], self._remaining[cell]
+
+    def _mark(self, cells: list[int], knowledge: int) -> None:
+        """
+        Records deduced cells and queues the constraints that involve them.
+
+        Args:
+            cells (list[int]): flat indices of the deduced cells
+            knowledge (int): SAFE or TRAP
+        """
+        for cell in cells:
+            if self._state[cell] != UNKNOWN:
+                continue
+            self._set_known(cell, knowledge)
+            self._deductions += 1
+            if knowledge == SAFE:
+                self._pending_safe[cell] = None
+
+    def _propagate(self) -> None:
+        """
+        Checks the queued constraints until none is left: if all traps of a constraint are known, its other cells are safe, and if it has as many unknown cells as traps, they are all traps.
+        """
+        queue = self._queue
+        unknown = self._unknown
+        remaining = self._remaining
+        while queue:
+            cell = queue.popleft()
+            if not unknown[cell]:
+                self._frontier.discard(cell)
+            elif not remaining[cell]:
+                self._mark(self._constraint(cell)[0], SAFE)
+            elif remaining[cell] == unknown[cell]:
+                self._mark(self._constraint(cell)[0], TRAP)
+            else:
+                self._frontier.add(cell)
+                self._changed.add(cell)
+
+    def _apply_subset_rule(self) -> bool:
+        """
+        Compares the constraints of nearby frontier cells: if the unknown cells of one constraint are a subset of another's, the difference holds exactly the difference of their traps.
+        Only pairs with at least one constraint that changed since the last comparison are compared.
+
+        Returns:
+            bool: True if a cell could be deduced
+        """
+        changed = self._changed
+        self._changed = set()
+        # Constraints stay true when some of their cells are deduced, so they are computed once per pass
+        constraints: dict[int, tuple[list[int], int]] = {}
+        deduced = False
+        frontier = self._frontier
+        for cell in changed:
+            if cell not in frontier:
+                continue
+            if cell not in constraints:
+                constraints[cell] = self._constraint(cell)
+            # Only the constraints of the neighbors of the cell's unknown cells share an unknown cell with it
+            others = {other for unknown in constraints[cell][0] for other in self._neighbors(unknown) if other in frontier}
+            others.discard(cell)
+            for other in sorted(others):
+                if other not in constraints:
+                    constraints[other] = self._constraint(other)
+                deduced |= self._compare(constraints[cell], constraints[other])
+                deduced |= self._compare(constraints[other], constraints[cell])
+        return deduced
+
+    def _compare(self, smaller: tuple[list[int], int], larger: tuple[list[int], int]) -> bool:
+        """
+        Deduces the cells of a constraint that are not part of a smaller constraint, if its unknown cells are a subset.
+
+        Args:
+            smaller (tuple[list[int], int]): unknown cells and number of traps of the possible subset
+            larger (tuple[list[int], int]): unknown cells and number of traps of the possible superset
+
+        Returns:
+            bool: True if cells could be deduced
+        """
+        smaller_unknown, smaller_traps = smaller
+        larger_unknown, larger_traps = larger
+        if len(larger_unknown) <= len(smaller_unknown) or not set(smaller_unknown).issubset(larger_unknown):
+            return False
+        difference = [cell for cell in larger_unknown if cell not in smaller_unknown]
+        if larger_traps == smaller_traps:
+            self._mark(difference, SAFE)
+            return True
+        if larger_traps - smaller_traps == len(difference):
+            self._mark(difference, TRAP)
+            return True
+        return False
+
+    def deduce(self) -> None:
+        """
+        Deduces every cell it can from the currently revealed numbers.
+        """
+        start_time = time.perf_counter()
+        self._propagate()
+        while self._apply_subset_rule():
+            self._propagate()
+        self._elapsed += time.perf_counter() - start_time
+
+    def solve(self) -> bool:
+        """
+        Scans the deduced safe cells and deduces again, until no more safe cells can be deduced.
+
+        Returns:
+            bool: True if all safe cells of the board have been discovered
+        """
+        while True:
+            self.deduce()
+            if not self._pending_safe:
+                return self._board.discoverable == 0
+            # All deduced safe cells are scanned in one batch, which reveals their zero-regions together
+            self._board.scan_many([divmod(cell, self._width) for cell in self._pending_safe])
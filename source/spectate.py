@@ -0,0 +1,449 @@
+"""
+Spectate module for the abandoned space station game, broadcasts the moves of a game to many spectators as compact deltas
+"""
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+import re
+from collections import deque
+from collections.abc import Callable
+from itertools import islice
+
+from source.board import Board, frame_parts
+
+# Frames of the spectator feed (one line each, every frame has the next sequence number):
+#   KEY <seq> <width> <height> <discoverable> <cells>  state of the whole board, one label per cell in row-major order
+#   DELTA <seq> <discoverable> <row> <col> <labels> ...  cells revealed by a move, as runs of labels starting at a row and column
+#   END <seq> WON|LOST                                   the game is over
+#   CLOSED <seq>                                         the feed is closed, no more frames follow
+# Labels: '?' for an undiscovered cell, 'X' for a revealed trap and '0' to '8' for the number of surrounding traps
+UNDISCOVERED = ord("?")
+TRAP = ord("X")
+DIGITS = b"012345678"
+
+# Runs of undiscovered cells in the labels of a feed
+UNDISCOVERED_RUN = re.compile(rb"\?+")
+
+# Default number of frames a subscriber may fall behind before it is resynchronized with a keyframe
+DEFAULT_CAPACITY = 256
+
+# Default number of frames after which the keyframe for resynchronizing subscribers is built again
+DEFAULT_KEYFRAME_INTERVAL = 64
+
+
+class Subscriber:
+    """
+    This class is the receiving end of a spectator feed: the frames published since the subscriber last read.
+    Its backlog is bounded by the capacity of the feed. A subscriber that falls further behind skips the frames it missed and reads a keyframe instead.
+    """
+    __slots__ = ("_feed", "_cursor", "_wakeup", "_cancelled", "resyncs")
+
+    def __init__(self, feed: "SpectatorFeed", cursor: int):
+        """
+        Initializes a subscriber, use SpectatorFeed.subscribe to create one.
+
+        Args:
+            feed (SpectatorFeed): feed the subscriber reads from
+            cursor (int): sequence number of the next frame to read
+        """
+        self._feed = feed
+        self._cursor = cursor
+        self._wakeup: Callable[[], None] | None = None
+        self._cancelled = False
+
+        # Number of times the subscriber fell behind and read a keyframe instead of the frames it missed
+        self.resyncs = 0
+
+    @property
+    def lag(self) -> int:
+        """
+        Returns the number of frames published since the subscriber last read.
+
+        Returns:
+            int: number of unread frames
+        """
+        return self._feed.seq - self._cursor + 1
+
+    @property
+    def closed(self) -> bool:
+        """
+        Returns whether the subscriber will not receive any more frames: it was cancelled, or the feed was closed and all its frames were read.
+
+        Returns:
+            bool: True if there is nothing left to read
+        """
+        return self._cancelled or (self._feed.closed and self.lag == 0)
+
+    def read(self) -> bytes:
+        """
+        Reads the frames published since the last read.
+
+        Returns:
+            bytes: the unread frames, each ending with a line break, empty if there are none
+        """
+        feed = self._feed
+        seq = feed._seq
+        cursor = self._cursor
+        if cursor > seq or self._cancelled:
+            return b""
+        if cursor == seq:
+            # Usually only the last frame is new
+            self._cursor = seq + 1
+            return feed._frames[-1]
+        chunks = []
+        if cursor < feed.oldest:
+            # The frames the subscriber missed were dropped (or it has just subscribed), so it continues after a keyframe
+            key_seq, key = feed.keyframe()
+            chunks.append(key)
+            self.resyncs += self._cursor > 0
+            self._cursor = key_seq + 1
+        chunks.extend(feed.frames_from(self._cursor))
+        self._cursor = feed.seq + 1
+        return b"".join(chunks)
+
+    def wait(self, wakeup: Callable[[], None]) -> None:
+        """
+        Registers a function that is called once, as soon as a frame is published or the subscriber is cancelled.
+
+        Args:
+            wakeup (Callable[[], None]): function without arguments, e.g. one that resolves a future the reader waits for
+        """
+        if self._cancelled or self.lag > 0:
+            wakeup()
+            return
+        self._wakeup = wakeup
+        self._feed._waiting.append(self)
+
+    def _wake(self) -> None:
+        """
+        Calls the registered wakeup function, if any.
+        """
+        wakeup = self._wakeup
+        if wakeup is not None:
+            self._wakeup = None
+            wakeup()
+
+    def cancel(self) -> None:
+        """
+        Unsubscribes from the feed and wakes up a waiting reader.
+        """
+        if not self._cancelled:
+            self._cancelled = True
+            self._feed._subscribers.discard(self)
+            self._wake()
+
+
+class SpectatorFeed:
+    """
+    This class broadcasts the moves of the game on a board to any number of spectators.
+    Instead of the printed board, every scan is turned into a delta frame holding only the newly revealed cells, which is encoded once and shared by all subscribers.
+    The frames are kept in one ring of the last frames, and every subscriber only keeps its position in the ring, so publishing a frame takes the same time for ten or ten thousand subscribers.
+    Subscribers that fall more than the capacity of the ring behind are resynchronized with a keyframe of the whole board, built at most once per keyframe interval and shared by all of them.
+    """
+    def __init__(self, board: Board | None = None, capacity: int = DEFAULT_CAPACITY, keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL):
+        """
+        Initializes the feed.
+
+        Args:
+            board (Board | None, optional): Board of the game to broadcast. Defaults to None (attach one later).
+            capacity (int, optional): Number of frames kept for subscribers that fall behind. Defaults to DEFAULT_CAPACITY.
+            keyframe_interval (int, optional): Number of frames after which a new keyframe is built for resynchronizing subscribers. Defaults to DEFAULT_KEYFRAME_INTERVAL.
+
+        Raises:
+            ValueError: If the keyframe interval is not positive and smaller than the capacity
+        """
+        if not 0 < keyframe_interval < capacity:
+            raise ValueError("The keyframe interval must be positive and smaller than the capacity.")
+        self._capacity = capacity
+        self._keyframe_interval = keyframe_interval
+
+        # The last frames and the sequence number of the last frame (0 before the first frame)
+        self._frames: deque[bytes] = deque(maxlen=capacity)
+        self._seq = 0
+        self._closed = False
+
+        # Subscribers, and the subscribers waiting for the next frame
+        self._subscribers: set[Subscriber] = set()
+        self._waiting: list[Subscriber] = []
+
+        # Labels of all cells as the spectators see them, and the cached keyframe with its sequence number
+        self._board: Board | None = None
+        self._labels = bytearray()
+        self._keyframe: tuple[int, bytes] | None = None
+
+        # Runs of cells revealed by the current move: (row, first column, labels), and whether the game is over
+        self._pending: list[tuple[int, int, bytes]] = []
+        self._over = False
+
+        if board is not None:
+            self.attach(board)
+
+    @property
+    def seq(self) -> int:
+        """
+        Returns the sequence number of the last published frame.
+
+        Returns:
+            int: sequence number, 0 before the first frame
+        """
+        return self._seq
+
+    @property
+    def oldest(self) -> int:
+        """
+        Returns the sequence number of the oldest frame that is still kept.
+
+        Returns:
+            int: sequence number
+        """
+        return self._seq - len(self._frames) + 1
+
+    @property
+    def closed(self) -> bool:
+        """
+        Returns whether the feed was closed.
+
+        Returns:
+            bool: True if no more frames are published
+        """
+        return self._closed
+
+    @property
+    def subscribers(self) -> int:
+        """
+        Returns the number of subscribers.
+
+        Returns:
+            int: number of subscribers that were not cancelled
+        """
+        return len(self._subscribers)
+
+    @property
+    def labels(self) -> bytes:
+        """
+        Returns the labels of all cells as the spectators see them.
+
+        Returns:
+            bytes: one label per cell in row-major order
+        """
+        return bytes(self._labels)
+
+    def subscribe(self) -> Subscriber:
+        """
+        Adds a subscriber. Its first read returns the keyframe of the current game, followed by the frames of later moves.
+
+        Returns:
+            Subscriber: new subscriber
+        """
+        # A cursor before the oldest frame makes the first read start with a keyframe
+        subscriber = Subscriber(self, 0 if self._board is not None else self._seq + 1)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def attach(self, board: Board) -> None:
+        """
+        Starts broadcasting the game on a board, e.g. a new game of the same player, and publishes its keyframe.
+
+        Args:
+            board (Board): board of the game
+        """
+        self.detach()
+        self._board = board
+        traps, surrounding, discovered = board._flat_cells()
+        if 1 in discovered:
+            self._labels = bytearray((TRAP if trap else DIGITS[count]) if known else UNDISCOVERED
+                                     for trap, count, known in zip(traps, surrounding, discovered))
+        else:
+            # Nothing is discovered at the start of a game
+            self._labels = bytearray(b"?" * len(discovered))
+        self._over = board.discoverable == 0
+        board.add_reveal_listener(self._on_reveal)
+        board.add_scan_listener(self._on_scan)
+        self._keyframe = None
+        self._publish(self._key_frame(self._seq + 1))
+        self._keyframe = (self._seq, self._frames[-1])
+
+    def detach(self) -> None:
+        """
+        Stops broadcasting the moves of the attached board.
+        """
+        if self._board is not None:
+            self._board.remove_reveal_listener(self._on_reveal)
+            self._board.remove_scan_listener(self._on_scan)
+            self._board = None
+        self._pending = []
+
+    def close(self) -> None:
+        """
+        Stops broadcasting and publishes the last frame. Subscribers are closed once they have read it.
+        """
+        if self._closed:
+            return
+        # The keyframe is not built again once the feed is closed, so it must not be older than the kept frames
+        self.keyframe()
+        self.detach()
+        self._publish(f"CLOSED {self._seq + 1}\n".encode())
+        self._closed = True
+
+    def keyframe(self) -> tuple[int, bytes]:
+        """
+        Returns a keyframe of the board for subscribers that fell behind. It is built again only every keyframe interval (and not after the feed is closed), so it is always newer than the oldest kept frame.
+
+        Returns:
+            tuple[int, bytes]: sequence number the keyframe stands for and the keyframe
+        """
+        if self._keyframe is None or (not self._closed and self._seq - self._keyframe[0] >= self._keyframe_interval):
+            self._keyframe = (self._seq, self._key_frame(self._seq))
+        return self._keyframe
+
+    def frames_from(self, seq: int) -> list[bytes]:
+        """
+        Returns the kept frames from a sequence number on.
+
+        Args:
+            seq (int): sequence number of the first frame, at least the oldest kept one
+
+        Returns:
+            list[bytes]: frames in order of publication
+        """
+        return list(islice(self._frames, seq - self.oldest, None))
+
+    def _key_frame(self, seq: int) -> bytes:
+        """
+        Encodes the whole board as a keyframe.
+
+        Args:
+            seq (int): sequence number of the keyframe
+
+        Returns:
+            bytes: KEY frame
+        """
+        board = self._board
+        if board is None:
+            return f"KEY {seq} 0 0 0 \n".encode()
+        return b"%s%s\n" % (f"KEY {seq} {board.width} {board.height} {board.discoverable} ".encode(), self._labels)
+
+    def _publish(self, frame: bytes) -> None:
+        """
+        Publishes a frame to all subscribers and wakes up the waiting ones.
+
+        Args:
+            frame (bytes): encoded frame, with the next sequence number
+        """
+        self._seq += 1
+        self._frames.append(frame)
+        if self._waiting:
+            waiting, self._waiting = self._waiting, []
+            for subscriber in waiting:
+                subscriber._wake()
+
+    def _on_reveal(self, row: int, start: int, stop: int) -> None:
+        """
+        Collects the cells of a span revealed by the current move that the spectators have not seen yet.
+
+        Args:
+            row (int): row of the cells
+            start (int): first column of the span
+            stop (int): column after the last column of the span
+        """
+        board = self._board
+        assert board is not None
+        labels = self._labels
+        base = row * board.width
+        for match in UNDISCOVERED_RUN.finditer(labels, base + start, base + stop):
+            first, last = match.span()
+            run = bytes([TRAP if board._cell_trapped(row, col) else DIGITS[board._cell_surrounding(row, col)]
+                         for col in range(first - base, last - base)])
+            labels[first:last] = run
+            self._pending.append((row, first - base, run))
+
+    def _on_scan(self, row: int, col: int, safe: bool) -> None:
+        """
+        Publishes the cells revealed by a scan as one delta frame, and the end of the game once it is over.
+
+        Args:
+            row (int): row of the scanned field
+            col (int): column of the scanned field
+            safe (bool): result of the scan
+        """
+        board = self._board
+        assert board is not None
+        if self._pending:
+            # scan_many reveals the cells of all its fields before the scan listeners are called, so the first field publishes them all
+            runs = b" ".join(b"%d %d %s" % run for run in self._pending)
+            self._pending = []
+            self._publish(b"DELTA %d %d %s\n" % (self._seq + 1, board.discoverable, runs))
+        if not self._over and (not safe or board.discoverable == 0):
+            self._over = True
+            self._publish(f"END {self._seq + 1} {'WON' if safe else 'LOST'}\n".encode())
+
+
+class SpectatorView:
+    """
+    This class rebuilds the board of a game from the frames of a spectator feed, on the spectator's side.
+    """
+    def __init__(self) -> None:
+        """
+        Initializes a view without a game.
+        """
+        self.width = 0
+        self.height = 0
+        self.discoverable = 0
+        self.labels = bytearray()
+
+        # Sequence number of the last applied frame, the result of the game once it is over and whether the feed was closed
+        self.seq = 0
+        self.result: str | None = None
+        self.closed = False
+
+    def apply(self, frame: str) -> None:
+        """
+        Applies a frame. Frames older than the last applied one, e.g. frames read before a keyframe, are ignored.
+
+        Args:
+            frame (str): frame line, with or without the line break
+
+        Raises:
+            ValueError: If the frame is invalid
+        """
+        kind, seq, *fields = frame.split()
+        if int(seq) <= self.seq:
+            return
+        self.seq = int(seq)
+        if kind == "KEY":
+            self.width, self.height, self.discoverable = map(int, fields[:3])
+            self.labels = bytearray(fields[3].encode() if len(fields) > 3 else b"")
+            # A keyframe may stand for the end of the game, whose END frame is skipped after it
+            self.result = "LOST" if TRAP in self.labels else "WON" if self.discoverable == 0 and self.labels else None
+        elif kind == "DELTA":
+            self.discoverable = int(fields[0])
+            for index in range(1, len(fields), 3):
+                cell = int(fields[index]) * self.width + int(fields[index + 1])
+                run = fields[index + 2].encode()
+                self.labels[cell:cell + len(run)] = run
+        elif kind == "END":
+            self.result = fields[0]
+        elif kind == "CLOSED":
+            self.closed = True
+        else:
+            raise ValueError(f"Unknown frame '{kind}'.")
+
+    def __str__(self) -> str:
+        """Returns the board as the spectator sees it, printed like a board.
+
+        Returns:
+            str: Printable board, undiscovered cells are shown as question marks and revealed traps as X's
+        """
+        header, separator = frame_parts(self.width)
+        width = self.width
+        rows = [header]
+        for row in range(self.height):
+            cells = "".join(f"{chr(label)} | " for label in self.labels[row * width:(row + 1) * width])
+            rows.append(f"{row} | {cells}\n{separator}")
+        return "".join(rows)
@@ -0,0 +1,524 @@
+"""
+Storage module for the abandoned space station game, saves boards in a compact binary format and opens them memory-mapped
+"""
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+import mmap
+import struct
+from collections.abc import Iterator
+from types import TracebackType
+from typing import Any
+
+from source.array_board import BOARD_CHARACTERS, SOLUTION_CHARACTERS
+from source.board import NON_ZERO, Board
+from source.topology import TOPOLOGIES
+
+# File layout: header, trap bits, discovered bits and surrounding counts (4 bits per cell)
+# The bits and counts are stored in row-major order (cell index row * width + col), so the cells of a row are contiguous in the file
+# Header: magic, format version, topology (index into TOPOLOGIES, 0 for the grid of files written before topologies existed), width, height, number of safe cells left to discover
+HEADER = struct.Struct("<4sHHIIQ")
+MAGIC = b"ASSB"
+VERSION = 1
+
+# Number of cells packed at once when saving, so that saving huge boards only needs a bounded amount of memory (a multiple of 8)
+CHUNK_CELLS = 1 << 20
+
+# Translation tables that unpack one bit of a byte into a byte of its own (0 or 1)
+BIT_TABLES = tuple(bytes((value >> bit) & 1 for value in range(256)) for bit in range(8))
+
+# Translation tables that unpack the lower and the upper 4 bits of a byte
+LOW_NIBBLE = bytes(value & 0x0F for value in range(256))
+HIGH_NIBBLE = bytes(value >> 4 for value in range(256))
+
+
+def section_sizes(num_cells: int) -> tuple[int, int]:
+    """
+    Returns the sizes of the sections of a board file.
+
+    Args:
+        num_cells (int): number of cells of the board
+
+    Returns:
+        tuple[int, int]: size in bytes of a bit section (traps or discovered) and of the surrounding counts section
+    """
+    return (num_cells + 7) // 8, (num_cells + 1) // 2
+
+
+def pack_bits(flags: bytes) -> bytes:
+    """
+    Packs bytes that are 0 or 1 into a bitset, eight cells per byte (cell i is bit i % 8 of byte i // 8).
+    Instead of looping over the cells, every eighth cell is taken at once with a stride slice and shifted into its bit position.
+
+    Args:
+        flags (bytes): one byte per cell, 0 or 1
+
+    Returns:
+        bytes: packed bits, padded with zeros to a whole byte
+    """
+    num_bytes = (len(flags) + 7) // 8
+    flags = bytes(flags) + bytes(num_bytes * 8 - len(flags))
+    packed = 0
+    for bit in range(8):
+        packed |= int.from_bytes(flags[bit::8], "little") << bit
+    return packed.to_bytes(num_bytes, "little")
+
+
+def unpack_bits(packed: bytes, start: int, stop: int) -> bytes:
+    """
+    Unpacks a range of cells of a bitset into one byte per cell.
+
+    Args:
+        packed (bytes): bitset, starting with the byte that contains the bit of cell start
+        start (int): first cell, only its position inside its byte is used
+        stop (int): cell after the last cell
+
+    Returns:
+        bytes: one byte per cell, 0 or 1
+    """
+    flags = bytearray(len(packed) * 8)
+    for bit in range(8):
+        flags[bit::8] = packed.translate(BIT_TABLES[bit])
+    offset = start % 8
+    return bytes(flags[offset:offset + stop - start])
+
+
+def pack_nibbles(counts: bytes) -> bytes:
+    """
+    Packs numbers between 0 and 15 into 4 bits each, two cells per byte (cell i is in the lower half of byte i // 2 if i is even, in the upper half otherwise).
+
+    Args:
+        counts (bytes): one byte per cell, at most 15
+
+    Returns:
+        bytes: packed numbers, padded with zeros to a whole byte
+    """
+    num_bytes = (len(counts) + 1) // 2
+    counts = bytes(counts) + bytes(num_bytes * 2 - len(counts))
+    packed = int.from_bytes(counts[0::2], "little") | int.from_bytes(counts[1::2], "little") << 4
+    return packed.to_bytes(num_bytes, "little")
+
+
+def unpack_nibbles(packed: bytes, start: int, stop: int) -> bytes:
+    """
+    Unpacks a range of cells of packed 4-bit numbers into one byte per cell.
+
+    Args:
+        packed (bytes): packed numbers, starting with the byte that contains the number of cell start
+        start (int): first cell, only whether it is in the lower or upper half of its byte is used
+        stop (int): cell after the last cell
+
+    Returns:
+        bytes: one byte per cell
+    """
+    counts = bytearray(len(packed) * 2)
+    counts[0::2] = packed.translate(LOW_NIBBLE)
+    counts[1::2] = packed.translate(HIGH_NIBBLE)
+    offset = start % 2
+    return bytes(counts[offset:offset + stop - start])
+
+
+def save_board(board: Board, path: str) -> None:
+    """
+    Saves a board in the compact binary format: traps and discovered states as bitsets and the numbers of surrounding traps as 4-bit values.
+    The cells are packed in chunks, so the file is written without holding a packed copy of the whole board in memory.
+
+    Args:
+        board (Board): board to save (any board engine, or a memory-mapped board)
+        path (str): path of the file to write
+    """
+    num_cells = board.width * board.height
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, list(TOPOLOGIES).index(board.topology), board.width, board.height, board.discoverable))
+        if isinstance(board, MappedBoard):
+            # The sections are already packed, so they are copied as they are
+            for chunk in board._sections():
+                file.write(chunk)
+            return
+        traps, surrounding, discovered = board._flat_cells()
+        for flags in (traps, discovered):
+            for start in range(0, num_cells, CHUNK_CELLS):
+                file.write(pack_bits(flags[start:start + CHUNK_CELLS]))
+        for start in range(0, num_cells, CHUNK_CELLS):
+            file.write(pack_nibbles(surrounding[start:start + CHUNK_CELLS]))
+
+
+def load_board(path: str, writable: bool = False) -> "MappedBoard":
+    """
+    Opens a saved board memory-mapped: the file is not read upfront, only the parts of the rows that are accessed are paged in.
+
+    Args:
+        path (str): path of the board file
+        writable (bool, optional): Whether the progress of the game (discovered cells) is written back to the file. Defaults to False (changes stay in memory).
+
+    Returns:
+        MappedBoard: board backed by the file
+    """
+    return MappedBoard(path, writable)
+
+
+class MappedBoard(Board):
+    """
+    This class represents a board stored in a memory-mapped board file, with the same public interface as the Board class.
+    Every cell access reads its bits straight from the mapping, and scanning a field flood fills its zero-region instead of labelling all regions of the board, so only the rows around the scanned fields are ever paged in.
+    """
+    def __init__(self, path: str, writable: bool = False):  # pylint: disable=super-init-not-called
+        """
+        Opens the board file and maps it into memory. The board is read from the file instead of being generated, so the Board initializer is not called.
+
+        Args:
+            path (str): path of the board file
+            writable (bool, optional): Whether changes are written back to the file. Defaults to False (copy-on-write mapping).
+
+        Raises:
+            ValueError: If the file is not a board file or does not match the board size in its header
+        """
+        self._writable = writable
+        self._file = open(path, "r+b" if writable else "rb")  # pylint: disable=consider-using-with
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_COPY)
+        except ValueError as error:
+            # An empty file cannot be mapped
+            self._file.close()
+            raise ValueError(f"'{path}' is not a board file.") from error
+
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise ValueError(f"'{path}' is not a board file.")
+        magic, version, topology, width, height, discoverable = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"'{path}' is not a board file (version {VERSION}).")
+        if topology >= len(TOPOLOGIES):
+            self.close()
+            raise ValueError(f"'{path}' has an unknown topology.")
+        bit_bytes, count_bytes = section_sizes(width * height)
+        if len(self._map) != HEADER.size + 2 * bit_bytes + count_bytes:
+            self.close()
+            raise ValueError(f"'{path}' does not match the board size in its header.")
+
+        # Offsets of the sections in the file
+        self._traps_offset = HEADER.size
+        self._discovered_offset = self._traps_offset + bit_bytes
+        self._surrounding_offset = self._discovered_offset + bit_bytes
+
+        # The generation attributes of a board do not apply to a board read from a file, and its zero-region index is never built
+        self._init_state(width, height, list(TOPOLOGIES)[topology])
+        self.discoverable = discoverable
+
+        # One row of undiscovered cell codes (16 per cell), used to render rows
+        self._undiscovered_codes = int.from_bytes(b"\x10" * width, "little")
+
+    def __enter__(self) -> "MappedBoard":
+        """
+        Returns the board, so that it is closed at the end of a with block.
+
+        Returns:
+            MappedBoard: this board
+        """
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None) -> None:
+        """
+        Closes the board at the end of a with block.
+
+        Args:
+            exc_type (type[BaseException] | None): type of the raised exception, if any
+            exc_value (BaseException | None): raised exception, if any
+            traceback (TracebackType | None): traceback of the raised exception, if any
+        """
+        self.close()
+
+    def flush(self) -> None:
+        """
+        Writes the number of safe cells left to discover and the discovered cells back to the file, if the board is writable.
+        """
+        if self._writable:
+            HEADER.pack_into(self._map, 0, MAGIC, VERSION, list(TOPOLOGIES).index(self._topology), self._width, self._height, self.discoverable)
+            self._map.flush()
+
+    def close(self) -> None:
+        """
+        Flushes the board and closes the file.
+        """
+        if not self._map.closed:
+            self.flush()
+            self._map.close()
+        self._file.close()
+
+    def _sections(self) -> Iterator[bytes]:
+        """
+        Returns the packed sections of the board (everything after the header) in chunks.
+
+        Returns:
+            Iterator[bytes]: consecutive chunks of the trap bits, discovered bits and surrounding counts
+        """
+        for start in range(HEADER.size, len(self._map), CHUNK_CELLS):
+            yield self._map[start:start + CHUNK_CELLS]
+
+    def _create_cells(self) -> None:
+        """
+        The cells are stored in the mapped file, nothing has to be allocated.
+        """
+
+    def _place_traps(self, num_traps: int = 2) -> None:
+        """
+        The traps are stored in the mapped file and cannot be placed again.
+
+        Raises:
+            TypeError: always, a saved board is not generated
+        """
+        raise TypeError("The traps of a saved board cannot be placed again.")
+
+    def _bit(self, offset: int, row: int, col: int) -> bool:
+        """
+        Returns the bit of a cell in a bit section.
+
+        Args:
+            offset (int): offset of the section in the file
+            row (int): row of the cell
+            col (int): column of the cell
+
+        Returns:
+            bool: True if the bit is set
+        """
+        cell = row * self._width + col
+        return bool(self._map[offset + (cell >> 3)] >> (cell & 7) & 1)
+
+    def _row_bits(self, offset: int, row: int, start: int = 0, stop: int | None = None) -> bytes:
+        """
+        Returns the bits of cells of a row in a bit section, one byte per cell.
+
+        Args:
+            offset (int): offset of the section in the file
+            row (int): row of the cells
+            start (int, optional): First column. Defaults to 0.
+            stop (int | None, optional): Column after the last column. Defaults to None (end of the row).
+
+        Returns:
+            bytes: one byte per cell, 0 or 1
+        """
+        first = row * self._width + start
+        last = row * self._width + (self._width if stop is None else stop)
+        return unpack_bits(self._map[offset + (first >> 3):offset + ((last + 7) >> 3)], first, last)
+
+    def _row_surrounding(self, row: int, start: int = 0, stop: int | None = None) -> bytes:
+        """
+        Returns the numbers of surrounding traps of cells of a row.
+
+        Args:
+            row (int): row of the cells
+            start (int, optional): First column. Defaults to 0.
+            stop (int | None, optional): Column after the last column. Defaults to None (end of the row).
+
+        Returns:
+            bytes: one byte per cell
+        """
+        first = row * self._width + start
+        last = row * self._width + (self._width if stop is None else stop)
+        offset = self._surrounding_offset
+        return unpack_nibbles(self._map[offset + (first >> 1):offset + ((last + 1) >> 1)], first, last)
+
+    def _cell_trapped(self, row: int, col: int) -> bool:
+        """
+        Returns whether there is a trap in a cell.
+
+        Args:
+            row (int): row of the cell
+            col (int): column of the cell
+
+        Returns:
+            bool: True if the cell contains a trap
+        """
+        return self._bit(self._traps_offset, row, col)
+
+    def _cell_discovered(self, row: int, col: int) -> bool:
+        """
+        Returns whether a cell has been discovered.
+
+        Args:
+            row (int): row of the cell
+            col (int): column of the cell
+
+        Returns:
+            bool: True if the cell has been discovered
+        """
+        return self._bit(self._discovered_offset, row, col)
+
+    def _cell_surrounding(self, row: int, col: int) -> int:
+        """
+        Returns the number of traps surrounding a cell.
+
+        Args:
+            row (int): row of the cell
+            col (int): column of the cell
+
+        Returns:
+            int: number of surrounding traps
+        """
+        cell = row * self._width + col
+        return self._map[self._surrounding_offset + (cell >> 1)] >> ((cell & 1) << 2) & 0x0F
+
+    def _render_row(self, row: int) -> str:
+        """
+        Returns the printed form of a row, followed by the separator.
+
+        Args:
+            row (int): row to render
+
+        Returns:
+            str: printed row, undiscovered cells are shown as question marks
+        """
+        surrounding = int.from_bytes(self._row_surrounding(row), "little")
+        discovered = int.from_bytes(self._row_bits(self._discovered_offset, row), "little")
+        # Undiscovered cells get the code 16 + number of surrounding traps, discovered cells keep the number itself
+        codes = (surrounding + self._undiscovered_codes - (discovered << 4)).to_bytes(self._width, "little")
+        cells = " | ".join(codes.translate(BOARD_CHARACTERS).decode("ascii"))
+        return f"{row} | {cells} | \n{self._separator}"
+
+    def _render_solution_row(self, row: int) -> str:
+        """
+        Returns the solution of a row, followed by the separator.
+
+        Args:
+            row (int): row to render
+
+        Returns:
+            str: printed row, traps are shown as X's
+        """
+        surrounding = int.from_bytes(self._row_surrounding(row), "little")
+        traps = int.from_bytes(self._row_bits(self._traps_offset, row), "little")
+        # Trapped cells get the code 16 + number of surrounding traps, all other cells keep the number itself
+        codes = (surrounding | traps << 4).to_bytes(self._width, "little")
+        cells = " | ".join(codes.translate(SOLUTION_CHARACTERS).decode("ascii"))
+        return f"{row} | {cells} | \n{self._separator}"
+
+    def _blocked_span(self, row: int, start: int, stop: int) -> bytes:
+        """
+        Returns a mask of the cells of a row between two columns which is zero exactly for the safe cells without surrounding traps.
+
+        Args:
+            row (int): row of the cells
+            start (int): first column
+            stop (int): column after the last column
+
+        Returns:
+            bytes: one byte per cell, 1 if the cell contains a trap or has surrounding traps, 0 otherwise
+        """
+        traps = int.from_bytes(self._row_bits(self._traps_offset, row, start, stop), "little")
+        surrounding = int.from_bytes(self._row_surrounding(row, start, stop), "little")
+        return (traps | surrounding).to_bytes(stop - start, "little").translate(NON_ZERO)
+
+    def _blocked_cells(self) -> bytes:
+        """
+        Returns a flat mask (indexed by row * width + col) which is zero exactly for the safe cells without surrounding traps.
+
+        Returns:
+            bytes: one byte per cell, non-zero if the cell contains a trap or has surrounding traps
+        """
+        return b"".join(self._blocked_span(row, 0, self._width) for row in range(self._height))
+
+    def _flat_cells(self) -> tuple[bytes, bytes, bytes]:
+        """
+        Returns the cell storage as flat byte strings (indexed by row * width + col).
+
+        Returns:
+            tuple[bytes, bytes, bytes]: traps (0 or 1), numbers of surrounding traps and discovered states (0 or 1), one byte per cell
+        """
+        num_cells = self._width * self._height
+        bit_bytes, count_bytes = section_sizes(num_cells)
+        traps = unpack_bits(self._map[self._traps_offset:self._traps_offset + bit_bytes], 0, num_cells)
+        discovered = unpack_bits(self._map[self._discovered_offset:self._discovered_offset + bit_bytes], 0, num_cells)
+        surrounding = unpack_nibbles(self._map[self._surrounding_offset:self._surrounding_offset + count_bytes], 0, num_cells)
+        return traps, surrounding, discovered
+
+    def _reveal_span(self, row: int, start: int, stop: int) -> int:
+        """
+        Marks the cells of a row between two columns as discovered by setting their bits in the mapping.
+
+        Args:
+            row (int): row of the cells
+            start (int): first column to reveal
+            stop (int): column after the last column to reveal
+
+        Returns:
+            int: number of cells that had not been discovered before
+        """
+        first = row * self._width + start
+        last = row * self._width + stop
+        low = self._discovered_offset + (first >> 3)
+        high = self._discovered_offset + ((last + 7) >> 3)
+        bits = int.from_bytes(self._map[low:high], "little")
+        mask = ((1 << (last - first)) - 1) << (first & 7)
+        revealed = last - first - (bits & mask).bit_count()
+        if revealed:
+            self._map[low:high] = (bits | mask).to_bytes(high - low, "little")
+        return revealed
+
+    def _discovered_span(self, row: int, start: int, stop: int) -> bytes:
+        """
+        Returns the discovered states of the cells of a row between two columns.
+
+        Args:
+            row (int): row of the cells
+            start (int): first column
+            stop (int): column after the last column
+
+        Returns:
+            bytes: one byte per cell, 1 for a discovered cell
+        """
+        return self._row_bits(self._discovered_offset, row, start, stop)
+
+    def _restore_span(self, row: int, start: int, states: bytes) -> None:
+        """
+        Sets the discovered states of consecutive cells of a row by writing their bits into the mapping, e.g. to hide the cells revealed by a move again.
+
+        Args:
+            row (int): row of the cells
+            start (int): first column
+            states (bytes): one byte per cell, 1 for a discovered cell
+        """
+        first = row * self._width + start
+        last = first + len(states)
+        low = self._discovered_offset + (first >> 3)
+        high = self._discovered_offset + ((last + 7) >> 3)
+        bits = int.from_bytes(self._map[low:high], "little")
+        mask = ((1 << (last - first)) - 1) << (first & 7)
+        values = int.from_bytes(pack_bits(states), "little") << (first & 7)
+        self._map[low:high] = (bits & ~mask | values).to_bytes(high - low, "little")
+
+    def _snapshot_cells(self) -> Any:
+        """
+        Returns the discovered states for a snapshot. The mapping cannot be shared, so the discovered bits (one bit per cell) are copied.
+
+        Returns:
+            Any: packed discovered bits
+        """
+        return self._map[self._discovered_offset:self._surrounding_offset]
+
+    def _restore_cells(self, cells: Any) -> None:
+        """
+        Restores the discovered states of a snapshot by writing its discovered bits into the mapping.
+
+        Args:
+            cells (Any): packed discovered bits
+        """
+        self._map[self._discovered_offset:self._surrounding_offset] = cells
+
+    def _reveal_safe(self, cells: list[tuple[int, int]]) -> int:
+        """
+        Reveals safe fields together with the trivially safe fields around them by a flood fill, so only the rows of their zero-regions are paged in.
+
+        Args:
+            cells (list[tuple[int, int]]): rows and columns of the safe fields
+
+        Returns:
+            int: number of cells that had not been discovered before
+        """
+        return self._flood_reveal(cells)
@@ -0,0 +1,127 @@
+"""
+Terminal module for the abandoned space station game, redraws the screen with ANSI escape sequences instead of a shell command
+"""
+
+import os
+import shutil
+import sys
+from typing import TextIO
+
+# ANSI escape sequences: move the cursor to the top left corner, clear the screen, clear from the cursor to the end of the line or screen
+CURSOR_HOME = "\x1b[H"
+CLEAR_SCREEN = "\x1b[2J"
+CLEAR_LINE = "\x1b[K"
+CLEAR_BELOW = "\x1b[J"
+
+# Number of lines below a frame that may be written (e.g. the echo of the user's input) without scrolling the frame off its rows
+SCROLL_MARGIN = 2
+
+
+def move_cursor(row: int) -> str:
+    """
+    Returns the escape sequence that moves the cursor to the start of a line of the screen.
+
+    Args:
+        row (int): line of the screen, starting at 0
+
+    Returns:
+        str: ANSI escape sequence
+    """
+    return f"\x1b[{row + 1};1H"
+
+
+class Terminal:
+    """
+    This class draws full-screen frames (e.g. the board and the instructions) to a text stream.
+    On a terminal, a frame only rewrites the lines that differ from the previous frame, using ANSI cursor movements, and the whole frame is written with a single write and flush.
+    When the stream is not a terminal (e.g. a pipe or a file), frames are written as plain text one after the other, without any escape sequences.
+    """
+    def __init__(self, stream: TextIO | None = None, ansi: bool | None = None):
+        """
+        Initializes the terminal.
+
+        Args:
+            stream (TextIO | None, optional): Stream to draw to. Defaults to None (standard output at the time of drawing).
+            ansi (bool | None, optional): Whether to use ANSI escape sequences. Defaults to None (only if the stream is a terminal that is not dumb).
+        """
+        self._stream = stream
+        if ansi is None:
+            ansi = self.stream.isatty() and os.environ.get("TERM") != "dumb"
+            if ansi and os.name == "nt":
+                # Windows consoles only interpret escape sequences once a console command has run, which is needed once instead of on every redraw
+                os.system("")
+        self._ansi = ansi
+
+        # Lines of the frame currently on the screen, None if the screen content is unknown
+        self._lines: list[str] | None = None
+
+    @property
+    def stream(self) -> TextIO:
+        """
+        Returns the stream the frames are drawn to.
+
+        Returns:
+            TextIO: output stream
+        """
+        return self._stream if self._stream is not None else sys.stdout
+
+    @property
+    def ansi(self) -> bool:
+        """
+        Returns whether frames are drawn with ANSI escape sequences.
+
+        Returns:
+            bool: True if the stream is treated as a terminal
+        """
+        return self._ansi
+
+    def draw(self, text: str) -> None:
+        """
+        Draws a frame at the top of the screen, replacing the previous frame and everything written after it. The cursor is left on the line after the frame.
+
+        Args:
+            text (str): content of the frame, a line break at its end does not add an empty line
+        """
+        lines = text.splitlines()
+        if not self._ansi:
+            self._write(text if text.endswith("\n") else text + "\n")
+            return
+
+        size = shutil.get_terminal_size()
+        previous = self._lines
+        if previous is None or len(lines) + SCROLL_MARGIN > size.lines or any(len(line) > size.columns for line in lines):
+            # The screen content is unknown, or the frame would scroll or wrap: the line positions cannot be trusted, so everything is drawn again
+            parts = [CURSOR_HOME, CLEAR_SCREEN, "\n".join(lines), "\n"]
+            self._lines = None if len(lines) + SCROLL_MARGIN > size.lines else lines
+        else:
+            parts = [move_cursor(row) + line + CLEAR_LINE
+                     for row, line in enumerate(lines) if row >= len(previous) or previous[row] != line]
+            # Lines of the previous frame and anything written below it are cleared
+            parts.append(move_cursor(len(lines)) + CLEAR_BELOW)
+            self._lines = lines
+        self._write("".join(parts))
+
+    def clear(self) -> None:
+        """
+        Clears the screen. Without ANSI escape sequences, nothing is written.
+        """
+        self._lines = None
+        if self._ansi:
+            self._write(CURSOR_HOME + CLEAR_SCREEN)
+
+    def invalidate(self) -> None:
+        """
+        Forgets the screen content, so that the next frame is drawn completely. Call it after writing so much below a frame that the screen may have scrolled.
+        """
+        self._lines = None
+
+    def _write(self, data: str) -> None:
+        """
+        Writes data to the stream with a single write and flushes it.
+
+        Args:
+            data (str): text to write
+        """
+        stream = self.stream
+        stream.write(data)
+        stream.flush()
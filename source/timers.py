@@ -0,0 +1,156 @@
+"""
+Timer module for the abandoned space station game, runs timed events without busy-waiting
+"""
+
+import asyncio
+import heapq
+import time
+from collections.abc import Callable
+
+
+class Clock:
+    """
+    This class represents the real clock. Sleeping suspends the asyncio event loop until the time has passed instead of polling the time.
+    """
+    def now(self) -> float:
+        """
+        Returns the current time.
+
+        Returns:
+            float: time in seconds of a clock that never goes backwards (e.g. when the system time is adjusted)
+        """
+        return time.monotonic()
+
+    async def sleep(self, seconds: float) -> None:
+        """
+        Suspends the calling coroutine for a given number of seconds.
+
+        Args:
+            seconds (float): time to sleep in seconds
+        """
+        await asyncio.sleep(seconds)
+
+
+class VirtualClock(Clock):
+    """
+    This class represents a virtual clock for testing purposes. Sleeping advances the virtual time immediately, so no real time passes.
+    """
+    def __init__(self, start: float = 0):
+        """
+        Initializes the virtual clock.
+
+        Args:
+            start (float, optional): Initial virtual time in seconds. Defaults to 0.
+        """
+        self._now = start
+
+    def now(self) -> float:
+        """
+        Returns the current virtual time.
+
+        Returns:
+            float: virtual time in seconds
+        """
+        return self._now
+
+    async def sleep(self, seconds: float) -> None:
+        """
+        Advances the virtual time by a given number of seconds without waiting.
+
+        Args:
+            seconds (float): time to advance in seconds
+        """
+        self._now += max(seconds, 0)
+        # Still give other coroutines the chance to run, like a real sleep would
+        await asyncio.sleep(0)
+
+
+class Scheduler:
+    """
+    This class schedules callbacks at given delays and runs them in order of their due time on an asyncio event loop.
+    Between two events the scheduler sleeps on its clock, so waiting does not occupy the CPU.
+    """
+    def __init__(self, clock: Clock | None = None):
+        """
+        Initializes the scheduler.
+
+        Args:
+            clock (Clock | None, optional): Clock to measure and wait for the time. Defaults to None (real clock).
+        """
+        self._clock = clock if clock is not None else Clock()
+
+        # Heap of scheduled events (due time, sequence number to keep the scheduling order for equal due times, callback)
+        self._events: list[tuple[float, int, Callable[[], None]]] = []
+        self._sequence = 0
+
+    @property
+    def clock(self) -> Clock:
+        """
+        Returns the clock of the scheduler.
+
+        Returns:
+            Clock: clock used to measure and wait for the time
+        """
+        return self._clock
+
+    @property
+    def pending(self) -> int:
+        """
+        Returns the number of scheduled events that have not run yet.
+
+        Returns:
+            int: number of pending events
+        """
+        return len(self._events)
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> None:
+        """
+        Schedules a callback to run after a given delay once the scheduler runs.
+
+        Args:
+            delay (float): delay in seconds, measured from now
+            callback (Callable[[], None]): function to call
+        """
+        heapq.heappush(self._events, (self._clock.now() + delay, self._sequence, callback))
+        self._sequence += 1
+
+    def run(self, duration: float | None = None) -> None:
+        """
+        Runs the scheduled events (including events scheduled by callbacks) in order of their due time.
+
+        Args:
+            duration (float | None, optional): Time in seconds after which to return, events due later stay scheduled. Defaults to None (return once no events are left).
+        """
+        until = float("inf") if duration is None else self._clock.now() + duration
+        asyncio.run(self._run(until))
+
+    async def _run(self, until: float) -> None:
+        """
+        Coroutine that sleeps until the next event is due and runs it, until no events are left before the given time.
+
+        Args:
+            until (float): clock time at which to stop
+        """
+        while True:
+            event_due = bool(self._events) and self._events[0][0] <= until
+            if not event_due and until == float("inf"):
+                return
+            due = self._events[0][0] if event_due else until
+            delay = due - self._clock.now()
+            if delay > 0:
+                # Sleep until the next event (or the end) is due instead of polling the clock
+                await self._clock.sleep(delay)
+            elif event_due:
+                _, _, callback = heapq.heappop(self._events)
+                callback()
+            else:
+                return
+
+    def wait(self, seconds: float) -> None:
+        """
+        Waits for a given number of seconds, running all events that become due in the meantime.
+
+        Args:
+            seconds (float): time to wait in seconds
+        """
+        self.run(seconds)
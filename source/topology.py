@@ -0,0 +1,252 @@
+"""
+Topology module for the abandoned space station game, defines which cells of a board are neighbors and indexes them once per board shape
+"""
+
+from abc import ABC, abstractmethod
+from collections.abc import Hashable
+from functools import lru_cache
+
+# Adjacency lists of the cells of one row: for every column, the flat indices of its neighbors relative to the first cell of the row
+RowNeighbors = tuple[tuple[int, ...], ...]
+
+# Number of board shapes whose neighbor index is kept, more than the 36 shapes of the default boards (5 to 10 cells wide and high)
+TABLE_CACHE_SIZE = 128
+
+
+class Topology(ABC):
+    """
+    Base class of a board topology. A topology decides which cells are the neighbors of a cell, i.e. which cells a trap is counted in and which cells a zero-region spreads to.
+    """
+    # Name of the topology, as selected with the topology argument of a board
+    name = ""
+
+    def row_key(self, row: int, height: int) -> Hashable:
+        """
+        Returns a key that is equal for rows whose cells have the same neighbors relative to the first cell of the row, so that such rows share their adjacency lists.
+
+        Args:
+            row (int): row index
+            height (int): board height (number of rows)
+
+        Returns:
+            Hashable: key of the row
+        """
+        return (row == 0, row == height - 1)
+
+    @abstractmethod
+    def cell_neighbors(self, row: int, col: int, width: int, height: int) -> list[tuple[int, int]]:
+        """
+        Returns the neighbors of a cell.
+
+        Args:
+            row (int): row of the cell
+            col (int): column of the cell
+            width (int): board width (number of columns)
+            height (int): board height (number of rows)
+
+        Returns:
+            list[tuple[int, int]]: rows and columns of the neighbors, without duplicates and without the cell itself
+        """
+
+
+class GridTopology(Topology):
+    """
+    Bounded square grid: every cell has up to eight neighbors (horizontal, vertical and diagonal), cells at the borders have fewer.
+    """
+    name = "grid"
+
+    def cell_neighbors(self, row: int, col: int, width: int, height: int) -> list[tuple[int, int]]:
+        """
+        Returns the neighbors of a cell.
+
+        Args:
+            row (int): row of the cell
+            col (int): column of the cell
+            width (int): board width (number of columns)
+            height (int): board height (number of rows)
+
+        Returns:
+            list[tuple[int, int]]: rows and columns of the neighbors, in row-major order
+        """
+        return [(neighbor_row, neighbor_col)
+                for neighbor_row in range(max(row - 1, 0), min(row + 2, height))
+                for neighbor_col in range(max(col - 1, 0), min(col + 2, width))
+                if (neighbor_row, neighbor_col) != (row, col)]
+
+
+class TorusTopology(Topology):
+    """
+    Square grid whose opposite borders are joined: the neighbors of a cell at a border wrap around to the other side, so every cell has eight neighbors on boards of at least 3x3 cells.
+    """
+    name = "torus"
+
+    def cell_neighbors(self, row: int, col: int, width: int, height: int) -> list[tuple[int, int]]:
+        """
+        Returns the neighbors of a cell.
+
+        Args:
+            row (int): row of the cell
+            col (int): column of the cell
+            width (int): board width (number of columns)
+            height (int): board height (number of rows)
+
+        Returns:
+            list[tuple[int, int]]: rows and columns of the neighbors, in the order of the offsets
+        """
+        # On narrow boards, several offsets wrap around to the same cell, which is only a neighbor once
+        neighbors = {((row + row_offset) % height, (col + col_offset) % width): None
+                     for row_offset in (-1, 0, 1) for col_offset in (-1, 0, 1)}
+        neighbors.pop((row, col), None)
+        return list(neighbors)
+
+
+class HexTopology(Topology):
+    """
+    Hexagonal grid in "odd-r" layout: odd rows are shifted right by half a cell, so every cell has six neighbors, two in its own row and two in each adjacent row.
+    """
+    name = "hex"
+
+    def row_key(self, row: int, height: int) -> Hashable:
+        """
+        Returns a key that is equal for rows whose cells have the same neighbors relative to the first cell of the row. Even and odd rows have different neighbors.
+
+        Args:
+            row (int): row index
+            height (int): board height (number of rows)
+
+        Returns:
+            Hashable: key of the row
+        """
+        return (row % 2, row == 0, row == height - 1)
+
+    def cell_neighbors(self, row: int, col: int, width: int, height: int) -> list[tuple[int, int]]:
+        """
+        Returns the neighbors of a cell.
+
+        Args:
+            row (int): row of the cell
+            col (int): column of the cell
+            width (int): board width (number of columns)
+            height (int): board height (number of rows)
+
+        Returns:
+            list[tuple[int, int]]: rows and columns of the neighbors, in row-major order
+        """
+        # The two neighbors in the adjacent rows are the cell's own column and the column on the side the row is shifted to
+        shift = 1 if row % 2 else -1
+        adjacent_cols = sorted((col, col + shift))
+        neighbors = []
+        for neighbor_row in (row - 1, row, row + 1):
+            if not 0 <= neighbor_row < height:
+                continue
+            cols = (col - 1, col + 1) if neighbor_row == row else adjacent_cols
+            neighbors.extend((neighbor_row, neighbor_col) for neighbor_col in cols if 0 <= neighbor_col < width)
+        return neighbors
+
+
+# Available topologies, selectable by name
+TOPOLOGIES: dict[str, Topology] = {topology.name: topology for topology in (GridTopology(), TorusTopology(), HexTopology())}
+
+
+class NeighborTable:
+    """
+    This class indexes the neighbors of all cells of a board shape, so that trap counting, flood fills and solvers look the neighbors of a cell up instead of checking the borders every time.
+    The index is compressed like a sparse matrix in compressed row format, but per class of rows: all rows with the same neighbors relative to their first cell (e.g. all inner rows of a grid) share one adjacency list per column.
+    The index therefore takes memory in the order of the board width instead of eight entries per cell, which keeps it small even for boards with millions of cells.
+    """
+    def __init__(self, topology: Topology, width: int, height: int):
+        """
+        Builds the index of a board shape.
+
+        Args:
+            topology (Topology): topology of the boards
+            width (int): board width (number of columns)
+            height (int): board height (number of rows)
+        """
+        self._topology = topology
+        self._width = width
+        self._height = height
+
+        # Adjacency lists of every row, shared by the rows of the same class
+        classes: dict[Hashable, RowNeighbors] = {}
+        rows = []
+        for row in range(height):
+            key = topology.row_key(row, height)
+            if key not in classes:
+                base = row * width
+                classes[key] = tuple(
+                    tuple(neighbor_row * width + neighbor_col - base
+                          for neighbor_row, neighbor_col in topology.cell_neighbors(row, col, width, height))
+                    for col in range(width))
+            rows.append(classes[key])
+        self.rows: list[RowNeighbors] = rows
+        self._classes = len(classes)
+
+    @property
+    def topology(self) -> Topology:
+        """
+        Returns the topology of the index.
+
+        Returns:
+            Topology: topology of the boards
+        """
+        return self._topology
+
+    @property
+    def row_classes(self) -> int:
+        """
+        Returns the number of distinct adjacency lists per column, i.e. the number of row classes.
+
+        Returns:
+            int: number of row classes
+        """
+        return self._classes
+
+    def neighbors(self, cell: int) -> list[int]:
+        """
+        Returns the neighbors of a cell.
+
+        Args:
+            cell (int): flat index (row * width + col) of the cell
+
+        Returns:
+            list[int]: flat indices of the neighbors
+        """
+        row, col = divmod(cell, self._width)
+        base = row * self._width
+        return [base + neighbor for neighbor in self.rows[row][col]]
+
+    def cell_neighbors(self, row: int, col: int) -> list[tuple[int, int]]:
+        """
+        Returns the neighbors of a cell as rows and columns.
+
+        Args:
+            row (int): row of the cell
+            col (int): column of the cell
+
+        Returns:
+            list[tuple[int, int]]: rows and columns of the neighbors
+        """
+        base = row * self._width
+        return [divmod(base + neighbor, self._width) for neighbor in self.rows[row][col]]
+
+
+@lru_cache(maxsize=TABLE_CACHE_SIZE)
+def neighbor_table(topology: str, width: int, height: int) -> NeighborTable:
+    """
+    Returns the neighbor index of a board shape. It is built on the first request and shared by all boards of the same topology and size.
+
+    Args:
+        topology (str): name of the topology, one of TOPOLOGIES
+        width (int): board width (number of columns)
+        height (int): board height (number of rows)
+
+    Raises:
+        ValueError: If the topology name is unknown
+
+    Returns:
+        NeighborTable: neighbor index
+    """
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Unknown board topology '{topology}', expected one of: {', '.join(TOPOLOGIES)}")
+    return NeighborTable(TOPOLOGIES[topology], width, height)
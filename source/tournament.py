@@ -0,0 +1,349 @@
+"""
+Tournament module for the abandoned space station game, lets player strategies play the same boards, shared between worker processes
+"""
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from random import Random
+from types import TracebackType
+from typing import NamedTuple
+
+from source.array_board import ArrayBoard
+from source.simulation import STRATEGIES, SimulationStats, play_game
+
+
+class SharedBoard(ArrayBoard):
+    """
+    This class represents a board of a corpus: its traps and numbers of surrounding traps are views into shared memory, which are never written,
+    and only its discovered cells are allocated by the process that plays it.
+    """
+    def __init__(self, traps: memoryview, surrounding: memoryview, width: int, height: int, discoverable: int):  # pylint: disable=super-init-not-called
+        """
+        Initializes the board on the shared cells of a corpus board, without generating anything.
+
+        Args:
+            traps (memoryview): traps of the board (one byte per cell, row-major)
+            surrounding (memoryview): numbers of surrounding traps (one byte per cell, row-major)
+            width (int): board width
+            height (int): board height
+            discoverable (int): number of safe cells
+        """
+        # The generation attributes of a board do not apply to a corpus board
+        self._init_state(width, height, "grid")
+        self.discoverable = discoverable
+
+        # Shared cells, and the discovered cells of this process
+        self._traps = traps
+        self._surrounding = surrounding
+        self._discovered = [bytearray(width) for _ in range(height)]
+        self._snapshot_generation = 0
+        self._row_generation = [0] * height
+        self._undiscovered_codes = int.from_bytes(b"\x10" * width, "little")
+
+    def release(self) -> None:
+        """
+        Releases the views into the shared memory, which has to be done before the shared memory is closed.
+        """
+        self._traps.release()
+        self._surrounding.release()
+
+
+class CorpusSpec(NamedTuple):
+    """
+    Everything a worker process needs to attach to a corpus: the name of its shared memory and the size and number of safe cells of its boards.
+    """
+    name: str
+    width: int
+    height: int
+    discoverable: list[int]
+
+
+class Corpus:
+    """
+    This class holds a corpus of boards in shared memory: the traps and numbers of surrounding traps of every board, one byte per cell, board after board.
+    The boards are generated once, and worker processes attach to the shared memory by its name instead of generating or receiving the boards.
+    """
+    def __init__(self, memory: SharedMemory, spec: CorpusSpec, owner: bool):
+        """
+        Initializes the corpus on its shared memory, use Corpus.generate or Corpus.attach to create one.
+
+        Args:
+            memory (SharedMemory): shared memory with the cells of the boards
+            spec (CorpusSpec): name of the shared memory, board size and numbers of safe cells
+            owner (bool): whether this corpus created the shared memory and removes it when it is closed
+        """
+        self._memory = memory
+        self._spec = spec
+        self._owner = owner
+
+    @classmethod
+    def generate(cls, boards: int, width: int, height: int, density: float | None = None, seed: int | None = None) -> "Corpus":
+        """
+        Generates boards into a new block of shared memory.
+
+        Args:
+            boards (int): number of boards
+            width (int): board width
+            height (int): board height
+            density (float | None, optional): Fraction of trapped cells. Defaults to None (random fraction per board).
+            seed (int | None, optional): Seed of the corpus. Defaults to None (random seed).
+
+        Returns:
+            Corpus: corpus that owns the shared memory
+        """
+        rng = Random(seed)
+        num_cells = width * height
+        # Shared memory cannot be empty
+        memory = SharedMemory(create=True, size=max(2 * num_cells * boards, 1))
+        discoverable = []
+        for index in range(boards):
+            board = ArrayBoard(width, height, density=density, seed=rng.getrandbits(63))
+            offset = 2 * num_cells * index
+            memory.buf[offset:offset + num_cells] = board._traps
+            memory.buf[offset + num_cells:offset + 2 * num_cells] = board._surrounding
+            discoverable.append(board.discoverable)
+        return cls(memory, CorpusSpec(memory.name, width, height, discoverable), owner=True)
+
+    @classmethod
+    def attach(cls, spec: CorpusSpec) -> "Corpus":
+        """
+        Attaches to the shared memory of a corpus generated by another process, without copying it.
+
+        Args:
+            spec (CorpusSpec): spec of the generated corpus
+
+        Returns:
+            Corpus: corpus that does not own the shared memory
+        """
+        if sys.version_info >= (3, 13):
+            # Only the owner removes the shared memory
+            memory = SharedMemory(name=spec.name, track=False)  # pylint: disable=unexpected-keyword-arg
+        else:
+            # Worker processes share the resource tracker of the process that generated the corpus, so the segment is only tracked once
+            memory = SharedMemory(name=spec.name)
+        return cls(memory, spec, owner=False)
+
+    def __enter__(self) -> "Corpus":
+        """
+        Returns the corpus, so that it is closed at the end of a with block.
+
+        Returns:
+            Corpus: this corpus
+        """
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None) -> None:
+        """
+        Closes the corpus at the end of a with block.
+
+        Args:
+            exc_type (type[BaseException] | None): type of the raised exception, if any
+            exc_value (BaseException | None): raised exception, if any
+            traceback (TracebackType | None): traceback of the raised exception, if any
+        """
+        self.close()
+
+    @property
+    def spec(self) -> CorpusSpec:
+        """
+        Returns what worker processes need to attach to the corpus.
+
+        Returns:
+            CorpusSpec: name of the shared memory, board size and numbers of safe cells
+        """
+        return self._spec
+
+    def __len__(self) -> int:
+        """
+        Returns the number of boards of the corpus.
+
+        Returns:
+            int: number of boards
+        """
+        return len(self._spec.discoverable)
+
+    def board(self, index: int) -> SharedBoard:
+        """
+        Returns a new game on a board of the corpus. The board shares its cells with the corpus, call its release method once the game is over.
+
+        Args:
+            index (int): index of the board
+
+        Returns:
+            SharedBoard: board with no discovered cells
+        """
+        spec = self._spec
+        num_cells = spec.width * spec.height
+        offset = 2 * num_cells * index
+        traps = self._memory.buf[offset:offset + num_cells]
+        surrounding = self._memory.buf[offset + num_cells:offset + 2 * num_cells]
+        return SharedBoard(traps, surrounding, spec.width, spec.height, spec.discoverable[index])
+
+    def close(self) -> None:
+        """
+        Detaches from the shared memory, and removes it if this corpus generated it.
+        """
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+            self._owner = False
+
+
+class Match(NamedTuple):
+    """
+    Range of corpus boards played by a strategy in a single worker.
+    """
+    strategy: str
+    seed: int
+    start: int
+    count: int
+
+
+# Corpus of the worker process, attached once by the pool's initializer
+_worker_corpus: Corpus | None = None
+
+
+def attach_worker(spec: CorpusSpec) -> None:
+    """
+    Initializer of the worker processes: attaches to the corpus once per process.
+
+    Args:
+        spec (CorpusSpec): spec of the generated corpus
+    """
+    global _worker_corpus  # pylint: disable=global-statement
+    _worker_corpus = Corpus.attach(spec)
+
+
+def play_match(match: Match, corpus: Corpus | None = None) -> tuple[int, int, float]:
+    """
+    Plays a range of corpus boards with a strategy. The strategy's random number generator is seeded from the tournament seed and the board, so every strategy faces the same boards and the results do not depend on the number of workers.
+
+    Args:
+        match (Match): strategy and boards to play
+        corpus (Corpus | None, optional): Corpus to play on. Defaults to None (corpus of the worker process).
+
+    Returns:
+        tuple[int, int, float]: number of won games, total number of moves and time spent playing
+    """
+    if corpus is None:
+        corpus = _worker_corpus
+    assert corpus is not None
+    strategy_class = STRATEGIES[match.strategy]
+    wins = 0
+    moves = 0
+    start_time = time.perf_counter()
+    for index in range(match.start, match.start + match.count):
+        board = corpus.board(index)
+        try:
+            result = play_game(board, strategy_class(board, Random(f"{match.seed}-{index}")))
+        finally:
+            board.release()
+        wins += result.won
+        moves += result.moves
+    return wins, moves, time.perf_counter() - start_time
+
+
+class Standing(NamedTuple):
+    """
+    Result of a strategy in a tournament. The elapsed time of the statistics is the time the workers spent playing the strategy's games.
+    """
+    strategy: str
+    stats: SimulationStats
+
+
+def run_tournament(corpus: Corpus, strategies: list[str], seed: int = 0, workers: int | None = None,
+                   chunk_size: int = 100) -> list[Standing]:
+    """
+    Lets every strategy play every board of a corpus, spread over a pool of worker processes that attach to the corpus.
+
+    Args:
+        corpus (Corpus): boards to play
+        strategies (list[str]): names of the strategies, from STRATEGIES
+        seed (int, optional): Seed of the strategies' moves. Defaults to 0.
+        workers (int | None, optional): Number of worker processes, 1 plays in the current process. Defaults to None (one per CPU core).
+        chunk_size (int, optional): Number of boards per batch sent to a worker. Defaults to 100.
+
+    Raises:
+        ValueError: If a strategy name is unknown
+
+    Returns:
+        list[Standing]: results of the strategies, ranked by win rate and then by throughput
+    """
+    for strategy in strategies:
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy '{strategy}', expected one of: {', '.join(STRATEGIES)}")
+    matches = [
+        Match(strategy, seed, start, min(chunk_size, len(corpus) - start))
+        for strategy in strategies
+        for start in range(0, len(corpus), chunk_size)
+    ]
+    if workers == 1:
+        results = [play_match(match, corpus) for match in matches]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=attach_worker, initargs=(corpus.spec,)) as executor:
+            results = list(executor.map(play_match, matches))
+
+    totals = {strategy: [0, 0, 0.0] for strategy in strategies}
+    for match, (wins, moves, elapsed) in zip(matches, results):
+        total = totals[match.strategy]
+        total[0] += wins
+        total[1] += moves
+        total[2] += elapsed
+    standings = [Standing(strategy, SimulationStats(len(corpus), int(wins), int(moves), elapsed))
+                 for strategy, (wins, moves, elapsed) in totals.items()]
+    standings.sort(key=lambda standing: (-standing.stats.win_rate, -standing.stats.games_per_second))
+    return standings
+
+
+def format_ranking(standings: list[Standing]) -> str:
+    """
+    Returns the ranking table of a tournament.
+
+    Args:
+        standings (list[Standing]): ranked results, as returned by run_tournament
+
+    Returns:
+        str: one line per strategy with its rank, win rate, moves per game and games per second
+    """
+    lines = [f"{'rank':>4}  {'strategy':<12}{'games':>8}{'win rate':>10}{'moves/game':>12}{'games/s':>10}"]
+    for rank, (strategy, stats) in enumerate(standings, start=1):
+        lines.append(f"{rank:>4}  {strategy:<12}{stats.games:>8}{stats.win_rate:>10.2%}{stats.moves_per_game:>12.2f}{stats.games_per_second:>10.1f}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    """
+    Command line interface of the tournament.
+    """
+    parser = argparse.ArgumentParser(description="Let player strategies of the abandoned space station game play the same boards.")
+    parser.add_argument("--boards", type=int, default=1000, help="number of boards every strategy plays")
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES, default=list(STRATEGIES), help="strategies to compare")
+    parser.add_argument("--width", type=int, default=10, help="board width")
+    parser.add_argument("--height", type=int, default=10, help="board height")
+    parser.add_argument("--density", type=float, default=None, help="fraction of trapped cells")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the boards and moves")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    args = parser.parse_args()
+    seed = args.seed if args.seed is not None else Random().getrandbits(63)
+    start_time = time.perf_counter()
+    with Corpus.generate(args.boards, args.width, args.height, args.density, seed) as corpus:
+        generated = time.perf_counter()
+        standings = run_tournament(corpus, args.strategies, seed, args.workers)
+    finished = time.perf_counter()
+    print(format_ranking(standings))
+    print(f"generated {args.boards} boards in {generated - start_time:.2f} s, "
+          f"played {len(standings) * args.boards} games in {finished - generated:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Module with unittests for the ArrayBoard class."""
+import unittest
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+
+from source.array_board import ArrayBoard
+from source.board import Board
+
+
+def as_list_board(board: ArrayBoard) -> Board:
+    """Copies the state of an ArrayBoard into a list-backed Board of the same size."""
+    list_board = Board(board.width, board.height)
+    width = board.width
+    list_board._traps = [[bool(board._traps[row * width + col]) for col in range(width)] for row in range(board.height)]
+    list_board._surrounding = [list(board._surrounding[row * width:(row + 1) * width]) for row in range(board.height)]
+    list_board._discovered = [[bool(board._discovered[row][col]) for col in range(width)] for row in range(board.height)]
+    list_board.discoverable = board.discoverable
+    return list_board
+
+
+class TestArrayBoard(unittest.TestCase):
+    """Class with unittests for the ArrayBoard class."""
+    def test_board_initialization(self) -> None:
+        """Test a specific initialization of the ArrayBoard class."""
+        board = ArrayBoard(7, 4)
+        self.assertEqual(board.width, 7)
+        self.assertEqual(board.height, 4)
+        self.assertEqual(len(board._traps), 28)
+        self.assertEqual(board.discoverable, 28 - sum(board._traps))
+
+    def test_surrounding_matches_brute_force(self) -> None:
+        """Test that the vectorized neighbor sum equals a cell-by-cell count."""
+        for width, height in [(1, 1), (1, 6), (6, 1), (9, 7), (23, 17)]:
+            board = ArrayBoard(width, height)
+            for row in range(height):
+                for col in range(width):
+                    expected = sum(
+                        board._traps[neighbor_row * width + neighbor_col]
+                        for neighbor_row in range(max(row - 1, 0), min(row + 2, height))
+                        for neighbor_col in range(max(col - 1, 0), min(col + 2, width))
+                        if (neighbor_row, neighbor_col) != (row, col)
+                    )
+                    self.assertEqual(board._surrounding[row * width + col], expected)
+
+    def test_rendering_matches_list_board(self) -> None:
+        """Test that the string representation and the solution equal those of the list-backed Board."""
+        board = ArrayBoard(12, 8)
+        str(board)
+        board.scan_field(0, 0)
+        list_board = as_list_board(board)
+        self.assertEqual(str(board), str(list_board))
+        self.assertEqual(board.solution, list_board.solution)
+
+    def test_scan_field_trap(self) -> None:
+        """Test scanning a field with a trap."""
+        board = ArrayBoard(3, 3)
+        board._traps[4] = 1
+        result = board.scan_field(1, 1)
+        self.assertFalse(result)
+        self.assertTrue(board._discovered[1][1])
+
+    def test_scan_field_reveal_surrounding(self) -> None:
+        """Test that scanning a field without surrounding traps reveals the whole opening exactly once."""
+        board = ArrayBoard(3, 3)
+        board._traps = bytearray(9)
+        board._surrounding = bytearray(9)
+        board.discoverable = 9
+        self.assertTrue(board.scan_field(1, 1))
+        self.assertTrue(all(all(row) for row in board._discovered))
+        self.assertEqual(board.discoverable, 0)
+
+    def test_snapshot_shares_rows(self) -> None:
+        """Test that a snapshot shares the rows of discovered states and a scan only copies the rows it modifies."""
+        board = ArrayBoard(5, 5)
+        board._traps = bytearray(25)
+        board._surrounding = bytearray(b"\x01" * 25)
+        snapshot = board.snapshot()
+        self.assertTrue(all(row is shared for row, shared in zip(board._discovered, snapshot.cells)))
+        board.scan_field(2, 3)
+        self.assertEqual([row is shared for row, shared in zip(board._discovered, snapshot.cells)], [True, True, False, True, True])
+        self.assertEqual(snapshot.cells[2], bytearray(5))
+        board.restore(snapshot)
+        self.assertFalse(board._cell_discovered(2, 3))
+        self.assertEqual(board.discoverable, snapshot.discoverable)
+
+
+if __name__ == "__main__":
+    unittest.main()
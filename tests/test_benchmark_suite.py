@@ -0,0 +1,56 @@
+"""
+Test module for the benchmark suite
+"""
+import unittest
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+
+from benchmarks.suite import benchmark_board, compare
+
+
+def report(seconds: float, peak_mb: float) -> dict[str, list[dict[str, object]]]:
+    """Creates a benchmark report with a single result."""
+    return {"results": [{"engine": "list", "size": 10, "density": 0.1, "operation": "construct", "seconds": seconds, "peak_mb": peak_mb}]}
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    """Test cases for the benchmark suite"""
+
+    def test_benchmark_board(self) -> None:
+        """Test that every operation is measured"""
+        results = benchmark_board("array", 10, 0.2)
+        operations = [result["operation"] for result in results]
+        self.assertEqual(operations, ["construct", "place_traps", "scan_field", "render", "render_cached", "solution"])
+        self.assertTrue(all(result["seconds"] >= 0 and result["peak_mb"] >= 0 for result in results))
+
+    def test_compare_no_regression(self) -> None:
+        """Test that results within the threshold are no regression"""
+        self.assertEqual(compare(report(1.0, 100), report(1.1, 110)), [])
+
+    def test_compare_time_regression(self) -> None:
+        """Test that a slowdown above the threshold is flagged"""
+        regressions = compare(report(1.0, 100), report(2.0, 100))
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("time", regressions[0])
+
+    def test_compare_memory_regression(self) -> None:
+        """Test that a memory growth above the threshold is flagged"""
+        regressions = compare(report(1.0, 100), report(1.0, 200))
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("peak memory", regressions[0])
+
+    def test_compare_ignores_noise_and_new_results(self) -> None:
+        """Test that very short measurements and results without a baseline are not flagged"""
+        self.assertEqual(compare(report(0.0001, 1), report(0.0009, 1)), [])
+        self.assertEqual(compare({"results": []}, report(5.0, 500)), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
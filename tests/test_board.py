@@ -1,5 +1,6 @@
 """Module with unittests for the Board class."""
 import unittest
+from random import Random
 
 import os
 import sys
@@ -11,6 +12,7 @@ sys.path.append(os.environ['PYTHONPATH'])
 
 
 from source.board import Board
+from source.engines import BOARD_ENGINES, create_board
 
 class TestBoard(unittest.TestCase):
     """Class with unittests for the Board class."""
@@ -87,6 +89,214 @@ class TestBoard(unittest.TestCase):
         board.scan_field(0, 0)
         self.assertLess(board.discoverable, initial_discoverable)
 
+    def test_seed_reproducibility(self) -> None:
+        """Test that the same seed always generates the same board."""
+        first = Board(0, 0, seed=1234)
+        second = Board(0, 0, seed=1234)
+        self.assertEqual(first.seed, 1234)
+        self.assertEqual((first.width, first.height), (second.width, second.height))
+        self.assertEqual(first._traps, second._traps)
+        self.assertEqual(first.discoverable, second.discoverable)
+
+    def test_injected_rng(self) -> None:
+        """Test that an injected random number generator is used for the board generation."""
+        first = Board(8, 8, rng=Random(7))
+        second = Board(8, 8, rng=Random(7))
+        self.assertIsNone(first.seed)
+        self.assertEqual(first._traps, second._traps)
+
+    def test_density(self) -> None:
+        """Test that a custom density places the exact number of traps, even for very dense boards."""
+        board = Board(20, 10, density=0.9, seed=3)
+        trap_count = sum(sum(row) for row in board._traps)
+        self.assertEqual(trap_count, 180)
+        self.assertEqual(board.discoverable, 20)
+        with self.assertRaises(ValueError):
+            Board(5, 5, density=1.5)
+
+    def test_scan_field_zero_regions(self) -> None:
+        """Test that openings are revealed region by region and every cell is only counted once."""
+        board = Board(5, 5)
+        # A wall of traps in the middle column splits the board into two openings
+        board._traps = [[col == 2 for col in range(5)] for _ in range(5)]
+        board._surrounding = [[[0, 2, 0, 2, 0][col] if row in (0, 4) else [0, 3, 0, 3, 0][col] for col in range(5)] for row in range(5)]
+        board._discovered = [[False] * 5 for _ in range(5)]
+        board._region_of = None
+        board.discoverable = 20
+
+        # Scanning a border cell first only reveals that cell
+        self.assertTrue(board.scan_field(2, 1))
+        self.assertEqual(board.discoverable, 19)
+
+        # Scanning the left opening reveals its zero cells and its border without counting (2, 1) twice
+        self.assertTrue(board.scan_field(0, 0))
+        self.assertEqual(board.discoverable, 10)
+        self.assertTrue(all(board._discovered[row][col] for row in range(5) for col in range(2)))
+        self.assertFalse(any(board._discovered[row][col] for row in range(5) for col in range(2, 5)))
+
+        self.assertTrue(board.scan_field(4, 4))
+        self.assertEqual(board.discoverable, 0)
+        self.assertEqual(len(board._region_runs), 2)
+
+    def test_render_cache(self) -> None:
+        """Test that the cached string representation follows the scanned fields and only renders touched rows again."""
+        board = Board(6, 6, seed=11)
+        str(board)
+        board.scan_field(2, 3)
+        self.assertIn(2, board._dirty_rows)
+        cached = str(board)
+        self.assertEqual(board._dirty_rows, set())
+        board._frame = None
+        self.assertEqual(cached, str(board))
+        self.assertIn("2 | ", cached)
+
+    def test_revealed_count(self) -> None:
+        """Test that only the numbers of discovered safe cells are visible."""
+        board = Board(3, 3)
+        board._traps = [[False] * 3 for _ in range(3)]
+        board._surrounding = [[1] * 3 for _ in range(3)]
+        self.assertIsNone(board.revealed_count(1, 1))
+        board.scan_field(1, 1)
+        self.assertEqual(board.revealed_count(1, 1), 1)
+        self.assertIsNone(board.revealed_count(0, 0))
+
+    def test_scan_many_matches_scan_field(self) -> None:
+        """Test that scanning many fields at once has the results and discovered cells of scanning them one by one, with every engine."""
+        for engine in BOARD_ENGINES:
+            with self.subTest(engine=engine):
+                cells = [divmod(cell, 12) for cell in Random(5).sample(range(144), 40)]
+                cells.append(cells[0])
+                sequential = create_board(12, 12, engine=engine, density=0.15, seed=9)
+                outcomes = [sequential.scan_field(row, col) for row, col in cells]
+                batched = create_board(12, 12, engine=engine, density=0.15, seed=9)
+                result = batched.scan_many(cells)
+                self.assertEqual(result.outcomes, outcomes)
+                self.assertEqual(batched.discoverable, sequential.discoverable)
+                self.assertEqual(str(batched), str(sequential))
+                discovered = {divmod(cell, 12) for cell, flag in enumerate(batched._flat_cells()[2]) if flag}
+                self.assertEqual(result.revealed, discovered)
+
+    def test_scan_many_listeners_and_bounds(self) -> None:
+        """Test that scan_many notifies the scan listeners of every field and rejects fields outside of the board."""
+        board = Board(4, 4, density=0.0, seed=1)
+        scans: list[tuple[int, int, bool]] = []
+        board.add_scan_listener(lambda row, col, safe: scans.append((row, col, safe)))
+        with self.assertRaises(ValueError):
+            board.scan_many([(0, 0), (4, 0)])
+        self.assertEqual(scans, [])
+        self.assertEqual(board.discoverable, 16)
+        result = board.scan_many([(0, 0), (3, 3)])
+        self.assertEqual(result.outcomes, [True, True])
+        self.assertEqual(len(result.revealed), 16)
+        self.assertEqual(scans, [(0, 0, True), (3, 3, True)])
+
+    def test_chord(self) -> None:
+        """Test that chording scans the unflagged neighbors once the flags match the number of a field."""
+        board = Board(3, 3)
+        board._traps = [[row == 0 and col == 0 for col in range(3)] for row in range(3)]
+        board._surrounding = [[0, 1, 0], [1, 1, 0], [0, 0, 0]]
+        board._discovered = [[False] * 3 for _ in range(3)]
+        board.discoverable = 8
+        board.scan_field(1, 1)
+        self.assertEqual(board.discoverable, 7)
+
+        # Without a flag the number does not match
+        self.assertEqual(board.chord(1, 1).outcomes, [])
+        board.flag(0, 0)
+        self.assertTrue(board.is_flagged(0, 0))
+        result = board.chord(1, 1)
+        self.assertEqual(result.outcomes, [True] * 7)
+        self.assertNotIn((0, 0), result.revealed)
+        self.assertEqual(board.discoverable, 0)
+
+        # A wrong flag makes chording scan the trap
+        board = Board(3, 3)
+        board._traps = [[row == 0 and col == 0 for col in range(3)] for row in range(3)]
+        board._surrounding = [[0, 1, 0], [1, 1, 0], [0, 0, 0]]
+        board._discovered = [[False] * 3 for _ in range(3)]
+        board.scan_field(1, 1)
+        board.flag(0, 1)
+        self.assertIn(False, board.chord(1, 1).outcomes)
+        board.unflag(0, 1)
+        self.assertFalse(board.is_flagged(0, 1))
+        with self.assertRaises(ValueError):
+            board.flag(1, 1)
+
+    def test_snapshot_restore(self) -> None:
+        """Test that restoring snapshots brings back the state after every move, with every engine."""
+        for engine in BOARD_ENGINES:
+            with self.subTest(engine=engine):
+                board = create_board(12, 12, engine=engine, density=0.15, seed=4)
+                rng = Random(2)
+                snapshots = []
+                states = []
+                for _ in range(20):
+                    snapshots.append(board.snapshot())
+                    states.append((str(board), board.discoverable))
+                    board.scan_field(rng.randrange(12), rng.randrange(12))
+                board.flag(*next(divmod(cell, 12) for cell in range(144) if not board._cell_discovered(*divmod(cell, 12))))
+                # Snapshots can be restored in any order and more than once
+                for index in (10, 0, 19, 10):
+                    board.restore(snapshots[index])
+                    self.assertEqual((str(board), board.discoverable), states[index])
+                    self.assertFalse(board._flags)
+
+    def test_snapshot_shares_rows(self) -> None:
+        """Test that a snapshot shares the rows of discovered states and a scan only copies the rows it modifies."""
+        board = Board(5, 5)
+        board._traps = [[False] * 5 for _ in range(5)]
+        board._surrounding = [[1] * 5 for _ in range(5)]
+        snapshot = board.snapshot()
+        self.assertTrue(all(row is shared for row, shared in zip(board._discovered, snapshot.cells)))
+        board.scan_field(2, 3)
+        self.assertEqual([row is shared for row, shared in zip(board._discovered, snapshot.cells)], [True, True, False, True, True])
+        self.assertFalse(snapshot.cells[2][3])
+        board.restore(snapshot)
+        self.assertFalse(board._discovered[2][3])
+        self.assertEqual(board.discoverable, snapshot.discoverable)
+
+    def test_numbered_scan_skips_region_index(self) -> None:
+        """Test that scanning fields with surrounding traps does not label the zero-regions, and the first opening does."""
+        board = Board(6, 4, density=0, seed=1)
+        board._traps[0][0] = True
+        board._surrounding = [[0, 1, 0, 0, 0, 0], [1, 1, 0, 0, 0, 0], [0] * 6, [0] * 6]
+        board.discoverable -= 1
+        self.assertTrue(board.scan_field(1, 1))
+        self.assertIsNone(board._region_of)
+        self.assertTrue(board.scan_field(3, 5))
+        self.assertIsNotNone(board._region_of)
+        self.assertEqual(board.discoverable, 0)
+
+    def test_undo_moves(self) -> None:
+        """Test that undoing recorded moves in reverse order brings back the state before every move, with every engine."""
+        for engine in BOARD_ENGINES:
+            with self.subTest(engine=engine):
+                board = create_board(12, 12, engine=engine, density=0.15, seed=4)
+                rng = Random(2)
+                moves = []
+                states = []
+                for _ in range(20):
+                    states.append((str(board), board.discoverable))
+                    board.begin_move()
+                    board.scan_field(rng.randrange(12), rng.randrange(12))
+                    moves.append(board.end_move())
+                for move, state in zip(reversed(moves), reversed(states)):
+                    board.undo_move(move)
+                    self.assertEqual((str(board), board.discoverable), state)
+
+    def test_move_record_keeps_revealed_spans(self) -> None:
+        """Test that a move only records the spans it revealed, and a scan that reveals nothing records no span."""
+        board = Board(6, 4, density=0, seed=1)
+        board._traps[0][0] = True
+        board._surrounding = [[0, 1, 0, 0, 0, 0], [1, 1, 0, 0, 0, 0], [0] * 6, [0] * 6]
+        board.discoverable -= 1
+        board.begin_move()
+        board.scan_field(0, 1)
+        self.assertEqual(board.end_move().spans, [(0, 1, b"\x00")])
+        board.begin_move()
+        board.scan_field(0, 1)
+        self.assertEqual(board.end_move().spans, [])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,64 @@
+"""Module with unittests for the chunked board."""
+import unittest
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+
+from source.array_board import ArrayBoard
+from source.chunked_board import ChunkedBoard
+
+class TestChunkedBoard(unittest.TestCase):
+    """Class with unittests for the ChunkedBoard class."""
+    def test_lazy_generation(self) -> None:
+        """Test that no chunk is generated before the board is touched."""
+        board = ChunkedBoard(10**9, 10**9, density=0.1, seed=1)
+        self.assertEqual(board.generated_chunks, 0)
+        self.assertEqual(board.discoverable, 9 * 10**17)
+        board.scan_field(123456789, 987654321)
+        self.assertLess(board.generated_chunks, 10)
+
+    def test_deterministic(self) -> None:
+        """Test that the chunks do not depend on the order in which they are generated."""
+        board = ChunkedBoard(40, 30, density=0.2, seed=7, chunk_size=8)
+        other = ChunkedBoard(40, 30, density=0.2, seed=7, chunk_size=8)
+        other.scan_field(29, 39)
+        other.scan_field(0, 0)
+        self.assertEqual(board.solution, other.solution)
+
+    def test_trap_count(self) -> None:
+        """Test that the chunks hold exactly the traps of the board."""
+        board = ChunkedBoard(37, 23, density=0.3, seed=2, chunk_size=10)
+        traps, _, _ = board._flat_cells()
+        self.assertEqual(37 * 23 - sum(traps), board.discoverable)
+
+    def test_surrounding_across_chunks(self) -> None:
+        """Test that the numbers of surrounding traps at the chunk borders count the traps of the neighboring chunks."""
+        board = ChunkedBoard(20, 20, density=0.3, seed=4, chunk_size=6)
+        traps, surrounding, _ = board._flat_cells()
+        reference = ArrayBoard(20, 20, density=0, seed=1)
+        reference._traps = bytearray(traps)
+        reference._count_surrounding()
+        self.assertEqual(surrounding, bytes(reference._surrounding))
+
+    def test_scan_field(self) -> None:
+        """Test that scanning reveals the same cells as on a board with the same traps."""
+        board = ChunkedBoard(30, 25, density=0.1, seed=5, chunk_size=7)
+        traps, _, _ = board._flat_cells()
+        reference = ArrayBoard(30, 25, density=0, seed=1)
+        reference._traps = bytearray(traps)
+        reference._count_surrounding()
+        reference.discoverable = board.discoverable
+        for row, col in [(0, 0), (12, 20), (24, 29), (6, 3)]:
+            self.assertEqual(board.scan_field(row, col), reference.scan_field(row, col))
+            self.assertEqual(str(board), str(reference))
+            self.assertEqual(board.discoverable, reference.discoverable)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+"""Module with unittests for the board engine selection."""
+import unittest
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+
+from source.array_board import ArrayBoard
+from source.board import Board
+from source.chunked_board import ChunkedBoard
+from source.engines import create_board
+
+class TestEngines(unittest.TestCase):
+    """Class with unittests for the create_board function."""
+    def test_default_engine(self) -> None:
+        """Test that the list engine is used by default."""
+        board = create_board(5, 6)
+        self.assertIs(type(board), Board)
+        self.assertEqual((board.width, board.height), (5, 6))
+
+    def test_array_engine(self) -> None:
+        """Test selecting the array engine."""
+        board = create_board(5, 6, engine="array")
+        self.assertIsInstance(board, ArrayBoard)
+
+    def test_chunked_engine(self) -> None:
+        """Test selecting the chunked engine."""
+        board = create_board(5, 6, engine="chunked")
+        self.assertIsInstance(board, ChunkedBoard)
+
+    def test_unknown_engine(self) -> None:
+        """Test that an unknown engine name raises a ValueError."""
+        with self.assertRaises(ValueError):
+            create_board(engine="unknown")
+
+
+if __name__ == "__main__":
+    unittest.main()
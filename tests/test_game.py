@@ -14,7 +14,10 @@ os.environ['PYTHONPATH'] = this_path
 sys.path.append(os.environ['PYTHONPATH'])
 
 
+from source.board import Board
 from source.game import Game
+from source.generator import generate_board
+from source.results import GameRecord
 
 
 class TestGame(unittest.TestCase):
@@ -57,18 +60,19 @@ class TestGame(unittest.TestCase):
         # Check that input was called twice
         self.assertEqual(mock_input.call_count, 2)
 
-    @patch('source.game.clear')
-    def test_display_board_and_instructions(self, mock_clear: unittest.mock.MagicMock) -> None:
+    def test_display_board_and_instructions(self) -> None:
         """Test displaying the board and instructions"""
-        # Create a game instance with a mocked board
+        # Create a game instance with a mocked terminal
+        terminal = MagicMock()
         with patch.object(Game, 'main_menu'):
-            game = Game(wait_time = 0)
+            game = Game(wait_time = 0, terminal = terminal)
 
             # Call the method
             game.display_board_and_instructions()
 
-            # Check that clear was called
-            mock_clear.assert_called_once()
+            # Check that the screen was drawn as one frame
+            terminal.draw.assert_called_once()
+            self.assertIn("Here is the map of the space station:", terminal.draw.call_args[0][0])
 
 
     @patch('source.game.wait')
@@ -174,6 +178,149 @@ class TestGame(unittest.TestCase):
                 # Check that input was called multiple times
                 self.assertGreaterEqual(mock_input.call_count, 2)
 
+    @patch('source.game.wait')
+    @patch('builtins.input')
+    def test_play_menu_undo(self, mock_input: unittest.mock.MagicMock, mock_wait: unittest.mock.MagicMock) -> None:
+        """Test undoing moves during a game"""
+        board = Board(3, 3)
+        board._traps = [[row == 0 and col == 0 for col in range(3)] for row in range(3)]
+        board._surrounding = [[0, 1, 0], [1, 1, 0], [0, 0, 0]]
+        board.discoverable = 8
+        with patch('source.game.Board', return_value=board), patch.object(Game, 'main_menu'):
+            game = Game(wait_time = 0, terminal = MagicMock())
+            # Scan a cell, undo it, undo with no move left, then step on the trap
+            mock_input.side_effect = ['1 1', 'u', 'u', '0 0']
+            game.play_menu()
+        # Only the trap is discovered, the undone scan is not
+        self.assertEqual([row.count(True) for row in board._discovered], [1, 0, 0])
+        self.assertTrue(board._discovered[0][0])
+
+    @patch('source.game.wait')
+    @patch('builtins.input')
+    def test_play_menu_undo_many_moves(self, mock_input: unittest.mock.MagicMock, mock_wait: unittest.mock.MagicMock) -> None:
+        """Test undoing several moves in a row, one move per undo"""
+        board = Board(3, 3)
+        board._traps = [[row == 0 and col == 0 for col in range(3)] for row in range(3)]
+        board._surrounding = [[0, 1, 0], [1, 1, 0], [0, 0, 0]]
+        board.discoverable = 8
+        # Each of the three numbered cells only reveals itself, then all three moves are undone and the trap is scanned
+        lines = iter(['0 1', '1 0', '1 1', 'u', 'u', 'u', 'u', '0 0'])
+        discovered = []
+
+        def read_line(*_: object) -> str:
+            discovered.append(sorted((row, col) for row in range(3) for col in range(3) if board._discovered[row][col]))
+            return next(lines)
+
+        mock_input.side_effect = read_line
+        with patch('source.game.Board', return_value=board), patch.object(Game, 'main_menu'):
+            game = Game(wait_time = 0, terminal = MagicMock())
+            game.play_menu()
+        self.assertEqual(discovered[3:8], [[(0, 1), (1, 0), (1, 1)], [(0, 1), (1, 0)], [(0, 1)], [], []])
+        self.assertEqual(board.discoverable, 7)
+
+    @patch('source.game.wait')
+    @patch('builtins.input')
+    def test_play_menu_undo_history_size(self, mock_input: unittest.mock.MagicMock, mock_wait: unittest.mock.MagicMock) -> None:
+        """Test that the undo history of a game only keeps the cells its moves revealed, not a copy of the board per move"""
+        board = Board(20, 20, density=0.1, seed=3)
+        # Every safe cell is scanned once, the scans of cells revealed by earlier openings reveal nothing
+        mock_input.side_effect = [f"{row} {col}" for row in range(20) for col in range(20) if not board._traps[row][col]]
+        with patch('source.game.Board', return_value=board), patch.object(Game, 'main_menu'):
+            game = Game(wait_time = 0, terminal = MagicMock())
+            game.play_menu()
+        self.assertEqual(board.discoverable, 0)
+        recorded = sum(len(states) for move in game._history for _, _, states in move.spans)
+        self.assertLessEqual(recorded, 3 * 20 * 20)
+        self.assertLess(len(game._history), 20 * 20 - 40)
+
+    @patch('source.game.wait')
+    @patch('builtins.input')
+    def test_play_menu_undo_new_game(self, mock_input: unittest.mock.MagicMock, mock_wait: unittest.mock.MagicMock) -> None:
+        """Test that the moves of the previous game cannot be undone in a new game"""
+        first = Board(6, 6, density=0.1, seed=2)
+        second = Board(3, 3, density=0, seed=1)
+        # The first game's move is scanning a trap, the second game starts with an undo
+        trap = next((row, col) for row in range(6) for col in range(6) if first._traps[row][col])
+        mock_input.side_effect = [f"{trap[0]} {trap[1]}", 'u', '0 0']
+        with patch('source.game.Board', side_effect=[first, second]), patch.object(Game, 'main_menu'):
+            game = Game(wait_time = 0, terminal = MagicMock())
+            game.play_menu()
+            game.play_menu()
+        self.assertEqual(len(second._discovered), 3)
+        self.assertEqual(second.discoverable, 0)
+
+    @patch('source.game.wait')
+    @patch('builtins.input')
+    def test_play_menu_detaches_hints(self, mock_input: unittest.mock.MagicMock, mock_wait: unittest.mock.MagicMock) -> None:
+        """Test that the hint engine of the previous game stops following its board when a new game starts"""
+        first = Board(6, 6, density=0.1, seed=2)
+        second = Board(3, 3, density=0, seed=1)
+        trap = next((row, col) for row in range(6) for col in range(6) if first._traps[row][col])
+        mock_input.side_effect = ['h', f"{trap[0]} {trap[1]}", '0 0']
+        with patch('source.game.Board', side_effect=[first, second]), patch.object(Game, 'main_menu'), patch('builtins.print'):
+            game = Game(wait_time = 0, terminal = MagicMock())
+            game.play_menu()
+            self.assertEqual(len(first._reveal_listeners), 1)
+            game.play_menu()
+        self.assertEqual(first._reveal_listeners, [])
+
+    @patch('source.game.wait')
+    @patch('builtins.input')
+    def test_play_menu_records_result(self, mock_input: unittest.mock.MagicMock, mock_wait: unittest.mock.MagicMock) -> None:
+        """Test that the outcome of a game is recorded to the result store"""
+        board = Board(4, 3, density=0, seed=1)
+        results = MagicMock()
+        mock_input.return_value = '0 0'
+        with patch('source.game.Board', return_value=board), patch.object(Game, 'main_menu'):
+            game = Game(wait_time = 0, terminal = MagicMock(), results = results)
+            game.play_menu()
+        results.record.assert_called_once()
+        record: GameRecord = results.record.call_args.args[0]
+        self.assertEqual((record.mode, record.seed, record.width, record.height, record.traps, record.moves, record.won),
+                         ("game", 1, 4, 3, 0, 1, True))
+
+    @patch('source.game.wait')
+    @patch('builtins.input')
+    def test_play_menu_no_guess(self, mock_input: unittest.mock.MagicMock, mock_wait: unittest.mock.MagicMock) -> None:
+        """Test that a game without guessing opens its board at the start after the journal recorded it, without counting a move"""
+        board, (row, col) = generate_board(8, 8, density=0.1, seed=5, workers=1)
+        trap = next((trap_row, trap_col) for trap_row in range(8) for trap_col in range(8) if board._traps[trap_row][trap_col])
+        mock_input.side_effect = ['u', f"{trap[0]} {trap[1]}"]
+        journal = MagicMock()
+        journal.record_game.side_effect = lambda recorded: self.assertIsNone(recorded.revealed_count(row, col))
+        results = MagicMock()
+        with patch('source.game.generate_board', return_value=(board, (row, col))) as mock_generate, patch.object(Game, 'main_menu'):
+            game = Game(wait_time = 0, terminal = MagicMock(), journal = journal, results = results, no_guess = True)
+            game.play_menu()
+        mock_generate.assert_called_once()
+        journal.record_game.assert_called_once_with(board)
+        self.assertEqual(board.revealed_count(row, col), 0)
+        # The opening cannot be undone and only the scan of the trap is a move
+        self.assertEqual(results.record.call_args.args[0].moves, 1)
+
+    @patch('builtins.print')
+    @patch('source.game.Terminal')
+    @patch('source.game.wait')
+    @patch('builtins.input')
+    def test_session_many_games(self, mock_input: unittest.mock.MagicMock, mock_wait: unittest.mock.MagicMock, mock_terminal: unittest.mock.MagicMock, mock_print: unittest.mock.MagicMock) -> None:
+        """Test that a session plays more games than the recursion limit and creates one board per game"""
+        games = sys.getrecursionlimit() + 100
+        with patch('source.game.Board') as mock_board_class:
+            mock_board = MagicMock()
+            mock_board_class.return_value = mock_board
+            mock_board.height = 5
+            mock_board.width = 5
+            mock_board.scan_field.return_value = False
+
+            # Start a game, step on a trap and return to the main menu, many times in a row
+            mock_input.side_effect = ['y', '1 1'] * games + ['n']
+
+            Game(wait_time = 0)
+
+            self.assertEqual(mock_board_class.call_count, games)
+            self.assertEqual(mock_wait.call_count, games)
+            mock_print.assert_any_call("Goodbye!")
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,84 @@
+"""
+Test module for the generator module
+"""
+import unittest
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+
+from source.board import Board
+from source.engines import create_board
+from source.generator import GenerationStats, find_start, generate_board, generate_boards
+from source.solver import Solver
+
+
+class TestGenerator(unittest.TestCase):
+    """Test cases for the generator module"""
+
+    def test_generated_boards_are_solvable(self) -> None:
+        """Test that every generated board is solved by the solver from its first scan"""
+        boards, stats = generate_boards(5, 12, 12, density=0.18, seed=3, workers=1)
+        self.assertEqual(len(boards), 5)
+        self.assertEqual(stats.boards, 5)
+        self.assertGreaterEqual(stats.candidates, 5)
+        for generated in boards:
+            board = create_board(12, 12, density=0.18, seed=generated.seed)
+            solver = Solver(board)
+            self.assertTrue(board.scan_field(*generated.start))
+            self.assertTrue(solver.solve())
+
+    def test_generation_reproducible(self) -> None:
+        """Test that the generated boards only depend on the seed, not on the number of workers or the batch size"""
+        single, _ = generate_boards(4, 10, 10, density=0.18, seed=7, workers=1, chunk_size=3)
+        pooled, _ = generate_boards(4, 10, 10, density=0.18, seed=7, workers=2, chunk_size=2)
+        self.assertEqual(single, pooled)
+
+    def test_find_start_leaves_board_undiscovered(self) -> None:
+        """Test that trying first scans restores the board"""
+        board = Board(10, 10, density=0.2, seed=11)
+        discoverable = board.discoverable
+        _, starts = find_start(board)
+        self.assertGreaterEqual(starts, 1)
+        self.assertEqual(board.discoverable, discoverable)
+        self.assertTrue(all(board.revealed_count(row, col) is None for row in range(10) for col in range(10)))
+
+    def test_find_start_without_openings(self) -> None:
+        """Test that a board without any opening has no first scan"""
+        board = Board(4, 4, density=1, seed=1)
+        self.assertEqual(find_start(board), (None, 0))
+
+    def test_generate_board(self) -> None:
+        """Test that the generated board is returned undiscovered with its first scan"""
+        board, (row, col) = generate_board(8, 8, density=0.1, seed=5, workers=1, engine="array")
+        self.assertEqual((board.width, board.height), (8, 8))
+        self.assertEqual(board.start, (row, col))
+        self.assertEqual(board.revealed_count(row, col), None)
+        self.assertTrue(board.scan_field(row, col))
+        self.assertEqual(board.revealed_count(row, col), 0)
+
+    def test_generation_gives_up(self) -> None:
+        """Test that a RuntimeError is raised if no candidate can be solved"""
+        with self.assertRaises(RuntimeError):
+            generate_boards(1, 5, 5, density=1, seed=1, workers=1, max_candidates=8)
+
+    def test_unknown_engine(self) -> None:
+        """Test that an unknown engine name raises a ValueError"""
+        with self.assertRaises(ValueError):
+            generate_boards(1, engine="unknown")
+
+    def test_stats(self) -> None:
+        """Test the derived statistics"""
+        stats = GenerationStats(boards=5, candidates=20, starts=30, elapsed=0.5)
+        self.assertEqual(stats.boards_per_second, 10)
+        self.assertEqual(stats.success_rate, 0.25)
+        self.assertIn("boards per second: 10.0", str(stats))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,7 @@
 Test module for the helpers module
 """
 
+import io
 import unittest
 from unittest.mock import patch
 import time
@@ -15,18 +16,18 @@ sys.path.append(os.environ['PYTHONPATH'])
 
 # Import the functions to test
 from source.helpers import clear, wait
+from source.timers import Scheduler, VirtualClock
 
 class TestHelpers(unittest.TestCase):
     """Unittest TestCase class for the helpers module"""
     @patch("os.system")
     def test_clear(self, mock_system: unittest.mock.MagicMock) -> None:
-        """Test that the clear function calls the correct system command."""
-        clear()
-        # Check if os.system was called with the correct command
-        if os.name == 'nt':
-            mock_system.assert_called_with('cls')
-        else:
-            mock_system.assert_called_with('clear')
+        """Test that the clear function does not run a shell command and writes nothing when the output is not a terminal."""
+        output = io.StringIO()
+        with patch("sys.stdout", output):
+            clear()
+        mock_system.assert_not_called()
+        self.assertEqual(output.getvalue(), "")
 
     def test_wait(self) -> None:
         """Test that the wait function waits approximately the correct amount of time."""
@@ -38,5 +39,11 @@ class TestHelpers(unittest.TestCase):
         elapsed_time = end_time - start_time
         self.assertAlmostEqual(elapsed_time, 2, delta=0.5)  # Allow a 0.5 second tolerance
 
+    def test_wait_scheduler(self) -> None:
+        """Test that the wait function waits on the given scheduler."""
+        clock = VirtualClock()
+        wait(5, Scheduler(clock))
+        self.assertEqual(clock.now(), 5)
+
 # Run the tests
 unittest.TextTestRunner().run(unittest.TestLoader().loadTestsFromTestCase(TestHelpers))
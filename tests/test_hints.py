@@ -0,0 +1,98 @@
+"""
+Test module for the hints module
+"""
+import unittest
+from itertools import combinations
+from random import Random
+from unittest.mock import MagicMock, patch
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+
+from source.board import Board
+from source.game import Game
+from source.hints import HintEngine, count_component
+
+
+def brute_force(board: Board) -> dict[tuple[int, int], float]:
+    """Computes the trap probability of every undiscovered cell by enumerating all placements of the traps."""
+    width, height = board.width, board.height
+    traps, surrounding, discovered = board._flat_cells()
+    revealed_traps = {cell for cell in range(width * height) if discovered[cell] and traps[cell]}
+    undiscovered = [cell for cell in range(width * height) if not discovered[cell]]
+    counts = dict.fromkeys(undiscovered, 0)
+    placements = 0
+    for placement in combinations(undiscovered, sum(traps) - len(revealed_traps)):
+        trapped = set(placement) | revealed_traps
+        if all(sum((neighbor_row * width + neighbor_col) in trapped
+                   for neighbor_row in range(max(row - 1, 0), min(row + 2, height))
+                   for neighbor_col in range(max(col - 1, 0), min(col + 2, width))
+                   if (neighbor_row, neighbor_col) != (row, col)) == surrounding[row * width + col]
+               for row, col in (divmod(cell, width) for cell in range(width * height) if discovered[cell] and not traps[cell])):
+            placements += 1
+            for cell in placement:
+                counts[cell] += 1
+    return {divmod(cell, width): count / placements for cell, count in counts.items()}
+
+
+class TestHints(unittest.TestCase):
+    """Test cases for the HintEngine class"""
+
+    def test_count_component(self) -> None:
+        """Test the placement counts of a single constraint: one trap among two cells."""
+        totals, cell_counts = count_component((0, 1), (((0, 1), 1),))
+        self.assertEqual(totals, [0, 2, 0])
+        self.assertEqual(cell_counts, [[0, 1, 0], [0, 1, 0]])
+
+    def test_matches_brute_force(self) -> None:
+        """Test that the probabilities are the same as those of enumerating all trap placements."""
+        for seed in range(20):
+            board = Board(5, 4, density=0.25, seed=seed)
+            cells = [divmod(cell, 5) for cell in range(20)]
+            Random(seed).shuffle(cells)
+            for row, col in cells[:3]:
+                if not board._cell_trapped(row, col):
+                    board.scan_field(row, col)
+            if board.discoverable == 0:
+                continue
+            engine = HintEngine(board)
+            probabilities = engine.probabilities()
+            interior = engine.interior_probability()
+            for cell, expected in brute_force(board).items():
+                self.assertAlmostEqual(probabilities.get(cell, interior), expected, msg=f"seed {seed}, cell {cell}")
+
+    def test_cache(self) -> None:
+        """Test that only the frontier components that changed are counted again."""
+        board = Board(8, 8, density=0.2, seed=163)
+        board.scan_field(0, 0)
+        engine = HintEngine(board)
+        engine.probabilities()
+        self.assertEqual(engine.counted, 3)
+        engine.probabilities()
+        self.assertEqual(engine.counted, 3)
+
+        # Scanning a cell of one component resolves it, the two other components are taken from the cache
+        board.scan_field(0, 3)
+        probabilities = engine.probabilities()
+        self.assertEqual(engine.counted, 3)
+        self.assertEqual(len(engine._cache), 2)
+        self.assertEqual(probabilities, HintEngine(board).probabilities())
+
+    @patch('builtins.print')
+    def test_game_hint(self, mock_print: MagicMock) -> None:
+        """Test that the game prints the safest cell as a hint."""
+        with patch.object(Game, 'main_menu'):
+            game = Game(wait_time = 0, terminal = MagicMock())
+        game._board = Board(3, 3, density=0.0, seed=0)
+        game.show_hint()
+        mock_print.assert_called_with("Hint: the cell 0 0 is a trap with a probability of 0.0%.")
+
+
+if __name__ == '__main__':
+    unittest.main()
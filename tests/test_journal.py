@@ -0,0 +1,118 @@
+"""Module with unittests for the move journal."""
+import os
+import sys
+import tempfile
+import unittest
+from random import Random
+from unittest.mock import patch
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+
+from source.board import Board
+from source.engines import create_board
+from source.game import Game
+from source.journal import Journal, JournalReader
+
+class TestJournal(unittest.TestCase):
+    """Class with unittests for the Journal and JournalReader classes."""
+    def setUp(self) -> None:
+        """Create a temporary directory for the journals."""
+        self._directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self._path = os.path.join(self._directory.name, "journal.bin")
+
+    def tearDown(self) -> None:
+        """Remove the journals."""
+        self._directory.cleanup()
+
+    def _play(self, journal: Journal, engine: str, seed: int, moves: int) -> list[tuple[str, int]]:
+        """Records a game of random moves and returns the printed board and safe cells left after each move."""
+        board = create_board(12, 9, engine=engine, density=0.15 if seed % 2 else None, seed=seed)
+        journal.record_game(board)
+        rng = Random(seed)
+        states = [(str(board), board.discoverable)]
+        for _ in range(moves):
+            board.scan_field(rng.randrange(board.height), rng.randrange(board.width))
+            states.append((str(board), board.discoverable))
+        return states
+
+    def test_replay(self) -> None:
+        """Test that replaying rebuilds the state of every game after every move."""
+        with Journal(self._path, checkpoint_interval=5) as journal:
+            games = [self._play(journal, engine, seed, 23) for seed, engine in enumerate(["list", "array", "chunked"])]
+        reader = JournalReader(self._path)
+        self.assertEqual([entry.moves for entry in reader.games], [23, 23, 23])
+        self.assertEqual([len(entry.checkpoints) for entry in reader.games], [4, 4, 4])
+        for game, states in enumerate(games):
+            for moves, state in enumerate(states):
+                board = reader.replay(game, moves)
+                self.assertEqual((str(board), board.discoverable), state)
+
+    def test_undo(self) -> None:
+        """Test that replaying a journal follows the moves undone in a game."""
+        with Journal(self._path) as journal:
+            board = create_board(12, 9, engine="list", density=0.15, seed=7)
+            journal.record_game(board)
+            board.scan_field(0, 0)
+            snapshot = board.snapshot()
+            board.scan_field(8, 11)
+            board.restore(snapshot)
+            journal.checkpoint()
+            board.scan_field(4, 6)
+        replayed = JournalReader(self._path).replay()
+        self.assertEqual((str(replayed), replayed.discoverable), (str(board), board.discoverable))
+
+    def test_batched_writes(self) -> None:
+        """Test that records are written in batches and only once the journal is flushed."""
+        with Journal(self._path, batch_size=1000) as journal:
+            self._play(journal, "array", 1, 200)
+            self.assertLess(journal.writes, 5)
+            journal.flush()
+            written = journal.writes
+        self.assertEqual(journal.writes, written)
+        self.assertEqual(JournalReader(self._path).games[0].moves, 200)
+
+    def test_append(self) -> None:
+        """Test that reopening a journal appends to it."""
+        with Journal(self._path) as journal:
+            self._play(journal, "list", 3, 4)
+        with Journal(self._path) as journal:
+            self._play(journal, "list", 4, 6)
+        self.assertEqual([entry.moves for entry in JournalReader(self._path).games], [4, 6])
+
+    def test_truncated_journal(self) -> None:
+        """Test that a record cut off at the end of the journal is ignored."""
+        with Journal(self._path) as journal:
+            self._play(journal, "array", 5, 10)
+        with open(self._path, "rb+") as file:
+            file.truncate(os.path.getsize(self._path) - 3)
+        self.assertEqual(JournalReader(self._path).games[0].moves, 9)
+
+    def test_invalid_journal(self) -> None:
+        """Test that files which are not journals and boards without seeds are rejected."""
+        with open(self._path, "wb") as file:
+            file.write(b"journal")
+        with self.assertRaises(ValueError):
+            JournalReader(self._path)
+        other_path = os.path.join(self._directory.name, "other.bin")
+        with Journal(other_path) as journal:
+            with self.assertRaises(ValueError):
+                journal.record_game(Board(3, 3, rng=Random(1)))
+
+    @patch('builtins.input')
+    def test_game(self, mock_input: unittest.mock.MagicMock) -> None:
+        """Test that the games of a session are recorded."""
+        mock_input.side_effect = ['y', '0 0', '0 1', 'n']
+        board = Board(2, 1, density=0, seed=1)
+        with Journal(self._path) as journal:
+            with patch('source.game.Board', return_value=board):
+                Game(wait_time = 0, journal = journal)
+        entry = JournalReader(self._path).games[0]
+        self.assertEqual((entry.seed, entry.moves), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -28,6 +28,24 @@ class TestMain(unittest.TestCase):
         # Check that Game was instantiated
         mock_game.assert_called_once()
 
+    @patch('source.main.BoardPool')
+    @patch('source.main.Game')
+    def test_play_script_without_pool(self, mock_game: unittest.mock.MagicMock, mock_pool: unittest.mock.MagicMock) -> None:
+        """Test that a scripted session generates its boards in the game instead of a background pool"""
+        script = unittest.mock.MagicMock()
+        play(script)
+        mock_pool.assert_not_called()
+        self.assertIsNone(mock_game.call_args.kwargs["board_pool"])
+        self.assertIs(mock_game.call_args.kwargs["script"], script)
+
+    @patch('source.main.BoardPool')
+    @patch('source.main.Game')
+    def test_play_no_guess(self, mock_game: unittest.mock.MagicMock, mock_pool: unittest.mock.MagicMock) -> None:
+        """Test that a session without guessing takes its boards from a no-guess pool"""
+        play(no_guess=True)
+        mock_pool.assert_called_once_with(no_guess=True)
+        self.assertTrue(mock_game.call_args.kwargs["no_guess"])
+
     def test_pythonpath(self) -> None:
         """Test that PYTHONPATH is set correctly"""
         # Import the main module
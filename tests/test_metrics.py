@@ -0,0 +1,107 @@
+"""
+Test module for the metrics module
+"""
+import json
+import unittest
+from unittest.mock import patch
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+
+from source.array_board import ArrayBoard
+from source.board import Board
+from source.game import Game
+from source.metrics import Histogram, Metrics
+
+
+class TestMetrics(unittest.TestCase):
+    """Test cases for the metrics module"""
+
+    def setUp(self) -> None:
+        """Create a fresh metrics registry"""
+        self.metrics = Metrics()
+
+    def tearDown(self) -> None:
+        """Make sure no instrumentation is left behind"""
+        self.metrics.disable()
+
+    def test_disabled_has_no_wrappers(self) -> None:
+        """Test that enabling and disabling restores the original methods"""
+        original = Board.__dict__["scan_field"]
+        self.metrics.enable()
+        self.assertTrue(self.metrics.enabled)
+        self.assertIsNot(Board.__dict__["scan_field"], original)
+        self.metrics.disable()
+        self.assertFalse(self.metrics.enabled)
+        self.assertIs(Board.__dict__["scan_field"], original)
+
+    def test_board_metrics(self) -> None:
+        """Test the counters and histograms of the board"""
+        self.metrics.enable()
+        board = ArrayBoard(6, 6, density=0, seed=1)
+        str(board)
+        board.scan_field(0, 0)
+        self.metrics.disable()
+        snapshot = self.metrics.snapshot()
+        self.assertEqual(snapshot["counters"]["board.scan_field.calls"], 1)
+        self.assertEqual(snapshot["counters"]["board.scan_field.revealed_cells"], 36)
+        self.assertEqual(snapshot["counters"]["board.place_traps.calls"], 1)
+        self.assertEqual(snapshot["histograms"]["board.render.seconds"]["count"], 1)
+
+    def test_scan_many_metrics(self) -> None:
+        """Test that batch scans are measured with their fields, revealed cells and traps"""
+        board = Board(3, 3)
+        board._traps = [[row == 0 and col == 0 for col in range(3)] for row in range(3)]
+        board._surrounding = [[0, 1, 0], [1, 1, 0], [0, 0, 0]]
+        board.discoverable = 8
+        self.metrics.enable()
+        board.scan_many([(1, 1), (0, 1), (0, 0)])
+        self.metrics.disable()
+        snapshot = self.metrics.snapshot()
+        self.assertEqual(snapshot["counters"]["board.scan_many.calls"], 1)
+        self.assertEqual(snapshot["counters"]["board.scan_many.fields"], 3)
+        self.assertEqual(snapshot["counters"]["board.scan_many.revealed_cells"], 2)
+        self.assertEqual(snapshot["counters"]["board.scan_many.traps"], 1)
+        self.assertEqual(snapshot["histograms"]["board.scan_many.seconds"]["count"], 1)
+
+    @patch('builtins.input')
+    def test_input_wait(self, mock_input: unittest.mock.MagicMock) -> None:
+        """Test that waiting for user input is measured"""
+        mock_input.return_value = 'n'
+        self.metrics.enable()
+        Game(wait_time = 0)
+        self.metrics.disable()
+        self.assertEqual(self.metrics.counters["game.input_wait.calls"], 1)
+
+    def test_export(self) -> None:
+        """Test the JSON and text exports"""
+        self.metrics.count("calls", 2)
+        self.metrics.observe("seconds", 0.5)
+        snapshot = json.loads(self.metrics.to_json())
+        self.assertEqual(snapshot["counters"], {"calls": 2})
+        self.assertEqual(snapshot["histograms"]["seconds"]["buckets"]["<=1"], 1)
+        self.assertIn("calls 2", self.metrics.to_text())
+        self.metrics.reset()
+        self.assertEqual(self.metrics.snapshot(), {"counters": {}, "histograms": {}})
+
+    def test_histogram(self) -> None:
+        """Test the histogram statistics"""
+        histogram = Histogram()
+        for seconds in (0.000001, 0.002, 20):
+            histogram.observe(seconds)
+        values = histogram.to_dict()
+        self.assertEqual(values["count"], 3)
+        self.assertEqual(values["buckets"]["<=1e-05"], 1)
+        self.assertEqual(values["buckets"]["<=0.01"], 1)
+        self.assertEqual(values["buckets"]["+inf"], 1)
+        self.assertEqual(values["max"], 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
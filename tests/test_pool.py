@@ -0,0 +1,102 @@
+"""Module with unittests for the board pool."""
+import unittest
+from unittest.mock import patch
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+
+from source.array_board import ArrayBoard
+from source.board import Board
+from source.game import Game
+from source.pool import BoardPool
+from source.solver import Solver
+
+class TestBoardPool(unittest.TestCase):
+    """Class with unittests for the BoardPool class."""
+    def setUp(self) -> None:
+        """Create a pool of array boards."""
+        self.pool = BoardPool(engine="array", per_key=2, capacity=3)
+
+    def tearDown(self) -> None:
+        """Stop the pool's background thread."""
+        self.pool.close()
+
+    def test_hit(self) -> None:
+        """Test that prefetched boards are taken from the pool and replaced in the background."""
+        self.pool.prefetch(8, 6, 0.2)
+        self.pool.wait()
+        self.assertEqual(self.pool.ready, 2)
+        board = self.pool.get(8, 6, 0.2)
+        self.assertIsInstance(board, ArrayBoard)
+        self.assertEqual((board.width, board.height, board.discoverable), (8, 6, 38))
+        self.assertEqual((self.pool.hits, self.pool.misses), (1, 0))
+        self.pool.wait()
+        self.assertEqual(self.pool.ready, 2)
+
+    def test_miss(self) -> None:
+        """Test that a board is generated synchronously if none is ready."""
+        board = self.pool.get(5, 5, 0)
+        self.assertEqual(board.discoverable, 25)
+        self.assertEqual((self.pool.hits, self.pool.misses), (0, 1))
+        self.pool.wait()
+        self.pool.get(5, 5, 0)
+        self.assertEqual(self.pool.hit_rate, 0.5)
+
+    def test_distinct_boards(self) -> None:
+        """Test that every board is only handed out once."""
+        self.pool.prefetch(4, 4, 0.1)
+        self.pool.wait()
+        boards = [self.pool.get(4, 4, 0.1) for _ in range(4)]
+        self.assertEqual(len({id(board) for board in boards}), 4)
+
+    def test_eviction(self) -> None:
+        """Test that the boards of the least recently used keys are evicted beyond the capacity."""
+        self.pool.prefetch(5, 5, 0.1)
+        self.pool.wait()
+        self.pool.prefetch(6, 6, 0.1)
+        self.pool.wait()
+        self.assertEqual(self.pool.ready, 3)
+        self.assertEqual(self.pool.evictions, 1)
+        self.pool.get(5, 5, 0.1)
+        self.assertEqual(self.pool.hits, 1)
+
+    def test_no_guess(self) -> None:
+        """Test that a no-guess pool hands out boards that are solved without guessing from their start."""
+        pool = BoardPool(engine="array", no_guess=True)
+        try:
+            pool.prefetch(8, 8, 0.15)
+            pool.wait()
+            board = pool.get(8, 8, 0.15)
+        finally:
+            pool.close()
+        self.assertEqual(pool.hits, 1)
+        self.assertIsNotNone(board.start)
+        solver = Solver(board)
+        self.assertTrue(board.scan_field(*board.start))
+        self.assertTrue(solver.solve())
+        self.assertEqual(board.discoverable, 0)
+
+    def test_unknown_engine(self) -> None:
+        """Test that an unknown engine name raises a ValueError."""
+        with self.assertRaises(ValueError):
+            BoardPool(engine="unknown")
+
+    @patch('builtins.input')
+    def test_game(self, mock_input: unittest.mock.MagicMock) -> None:
+        """Test that the game takes its board from the pool."""
+        mock_input.side_effect = ['y', '0 0', 'n']
+        board = Board(2, 1, density=0, seed=1)
+        with patch.object(self.pool, 'get', return_value=board) as mock_get:
+            Game(wait_time = 0, board_pool = self.pool)
+        mock_get.assert_called_once()
+        self.assertEqual(board.discoverable, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+Test module for the results module
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+
+from source.board import Board
+from source.results import GameRecord, ResultStore, format_leaderboard, game_record
+
+
+def record(mode: str = "game", width: int = 8, height: int = 8, won: bool = True, duration: float = 1.0, moves: int = 5) -> GameRecord:
+    """Returns the record of a game with the given properties"""
+    return GameRecord(mode, 1, width, height, 10, moves, won, duration, time.time())
+
+
+class TestResults(unittest.TestCase):
+    """Test cases for the results module"""
+
+    def setUp(self) -> None:
+        """Open a store in a temporary directory"""
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.path = os.path.join(self.directory.name, "results.db")
+        self.store = ResultStore(self.path)
+
+    def tearDown(self) -> None:
+        """Close the store and remove the database"""
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_leaderboard_order(self) -> None:
+        """Test that the leaderboard lists the fastest won games, ties broken by the number of moves"""
+        self.store.record(record(duration=3.0))
+        self.store.record(record(duration=1.0, moves=9))
+        self.store.record(record(duration=1.0, moves=4))
+        self.store.record(record(duration=0.5, won=False))
+        self.store.flush()
+        leaderboard = self.store.leaderboard()
+        self.assertEqual([(game.duration, game.moves) for game in leaderboard], [(1.0, 4), (1.0, 9), (3.0, 5)])
+        self.assertTrue(all(game.won for game in leaderboard))
+        self.assertEqual(len(self.store.leaderboard(limit=2)), 2)
+
+    def test_leaderboard_per_size_and_mode(self) -> None:
+        """Test that the leaderboard can be restricted to a board size and is kept apart per mode"""
+        self.store.record_many([record(width=8, height=8), record(width=16, height=16, duration=0.1), record(mode="server", duration=0.01)])
+        self.store.flush()
+        self.assertEqual([(game.width, game.height) for game in self.store.leaderboard(width=8, height=8)], [(8, 8)])
+        self.assertEqual([game.duration for game in self.store.leaderboard()], [0.1, 1.0])
+        self.assertEqual([game.mode for game in self.store.leaderboard(mode="server")], ["server"])
+        with self.assertRaises(ValueError):
+            self.store.leaderboard(width=8)
+
+    def test_sizes(self) -> None:
+        """Test the totals per mode and board size"""
+        self.store.record_many([record(moves=4), record(won=False, moves=2), record(width=5, height=5)])
+        self.store.record(record(mode="simulation"))
+        self.store.flush()
+        sizes = self.store.sizes("game")
+        self.assertEqual([(size.width, size.height, size.games, size.wins) for size in sizes], [(5, 5, 1, 1), (8, 8, 2, 1)])
+        self.assertEqual(sizes[1].win_rate, 0.5)
+        self.assertEqual(sizes[1].moves_per_game, 3)
+        self.assertEqual(len(self.store.sizes()), 3)
+        self.assertEqual(self.store.count(), 4)
+
+    def test_batched_writes(self) -> None:
+        """Test that games recorded in the meantime are written in a single transaction"""
+        self.store.record_many(record() for _ in range(2500))
+        self.store.flush()
+        self.assertEqual(self.store.count(), 2500)
+        self.assertEqual(self.store.transactions, 1)
+
+    def test_failed_commit(self) -> None:
+        """Test that a failed transaction is raised by flush instead of stopping the background thread, and that later games are still written"""
+        original = ResultStore._commit
+        failures = [sqlite3.OperationalError("database or disk is full")]
+
+        def commit(store: ResultStore, connection: sqlite3.Connection, games: list[GameRecord]) -> None:
+            if failures:
+                raise failures.pop()
+            original(store, connection, games)
+
+        with patch.object(ResultStore, '_commit', commit):
+            self.store.record(record())
+            errors: list[Exception] = []
+
+            def flush() -> None:
+                try:
+                    self.store.flush()
+                except sqlite3.Error as error:
+                    errors.append(error)
+
+            # flush runs in a thread, so that the test fails instead of hanging if flush waits forever
+            flusher = threading.Thread(target=flush, daemon=True)
+            flusher.start()
+            flusher.join(timeout=5)
+            self.assertFalse(flusher.is_alive())
+            self.assertEqual([str(error) for error in errors], ["database or disk is full"])
+            self.store.record(record())
+            self.store.flush()
+        self.assertEqual(self.store.count(), 1)
+
+    def test_reopen(self) -> None:
+        """Test that the games are kept when the store is closed and opened again"""
+        self.store.record(record())
+        self.store.close()
+        self.store = ResultStore(self.path)
+        self.assertEqual(self.store.count(), 1)
+        self.assertEqual(len(self.store.leaderboard()), 1)
+
+    def test_game_record(self) -> None:
+        """Test that a game record holds the board's seed and size"""
+        board = Board(6, 4, density=0.25, seed=7)
+        game = game_record("game", board, 6, 3, False, 2.5)
+        self.assertEqual((game.seed, game.width, game.height, game.traps, game.moves, game.won), (7, 6, 4, 6, 3, False))
+
+    def test_format_leaderboard(self) -> None:
+        """Test that every game is a row of the table"""
+        table = format_leaderboard([record(), record(width=16, height=9)])
+        self.assertEqual(len(table.splitlines()), 3)
+        self.assertIn("16x9", table)
+
+
+if __name__ == "__main__":
+    unittest.main()
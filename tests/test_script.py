@@ -0,0 +1,97 @@
+"""
+Test module for the script module
+"""
+import io
+import unittest
+from unittest.mock import MagicMock, patch
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+
+from benchmarks.bench_script import run_script, script_lines
+from source.board import Board
+from source.game import Game
+from source.script import Script, ScriptStats
+
+
+class TestScript(unittest.TestCase):
+    """Test cases for the Script class"""
+
+    def test_read_line(self) -> None:
+        """Test that lines are read without their line breaks and that the end of the stream raises an EOFError"""
+        script = Script(io.StringIO("y\n1 2\n3 4"), output=io.StringIO())
+        self.assertEqual([script.read_line() for _ in range(3)], ["y", "1 2", "3 4"])
+        with self.assertRaises(EOFError):
+            script.read_line()
+        self.assertEqual(script.stats.lines, 3)
+
+    def test_summaries(self) -> None:
+        """Test that a summary is written every summary interval"""
+        output = io.StringIO()
+        script = Script(io.StringIO(), output=output, summary_interval=3)
+        for _ in range(7):
+            script.moved()
+        self.assertEqual([line.split(", ")[2] for line in output.getvalue().splitlines()], ["moves: 3", "moves: 6"])
+
+    def test_game_results(self) -> None:
+        """Test that the result of every game is written, unless disabled"""
+        board = Board(4, 3, density=0, seed=1)
+        output = io.StringIO()
+        script = Script(io.StringIO(), output=output)
+        script.game_over(board, True, 5)
+        self.assertEqual(output.getvalue(), "game 1: won after 5 moves (4x3, seed 1)\n")
+        quiet_output = io.StringIO()
+        quiet = Script(io.StringIO(), output=quiet_output, report_games=False)
+        quiet.game_over(board, False, 2)
+        self.assertEqual(quiet_output.getvalue(), "")
+        self.assertEqual((quiet.stats.games, quiet.stats.wins), (1, 0))
+
+    @patch('source.game.wait')
+    def test_scripted_session(self, mock_wait: MagicMock) -> None:
+        """Test a scripted session through the game's input validation, without drawing screens or waiting"""
+        boards = [Board(3, 3, density=0, seed=1), Board(2, 2, density=1, seed=1)]
+        boards[1].discoverable = 1
+        output = io.StringIO()
+        terminal = MagicMock()
+        lines = ["x", "y", "a b", "9 9", "u", "h", "1 1", "y", "0 0", "n", "ignored"]
+        script = Script(io.StringIO("\n".join(lines)), output=output)
+        with patch('source.game.Board', side_effect=boards), patch('builtins.print') as mock_print:
+            Game(terminal=terminal, script=script)
+        stats = script.finish()
+        self.assertEqual((stats.lines, stats.invalid, stats.moves, stats.games, stats.wins), (10, 3, 2, 2, 1))
+        self.assertEqual(output.getvalue().splitlines()[:2], ["game 1: won after 1 moves (3x3, seed 1)", "game 2: lost after 1 moves (2x2, seed 1)"])
+        terminal.draw.assert_not_called()
+        mock_print.assert_not_called()
+        mock_wait.assert_not_called()
+
+    def test_end_of_script_ends_session(self) -> None:
+        """Test that the session ends when the script ends in the middle of a game"""
+        script = Script(io.StringIO("y\n"), output=io.StringIO())
+        with patch('source.game.Board', return_value=Board(3, 3, density=0, seed=1)):
+            Game(terminal=MagicMock(), script=script)
+        self.assertEqual(script.stats.games, 0)
+
+    def test_benchmark(self) -> None:
+        """Test that the benchmark plays every line of its script"""
+        self.assertEqual(script_lines(2, 1, seed=1).count("\n"), 5)
+        stats = run_script(20, 10, seed=1)
+        self.assertEqual(stats.lines, 20 * 11 + 1)
+        self.assertGreater(stats.games, 0)
+        self.assertGreater(stats.lines_per_second, 0)
+
+    def test_stats(self) -> None:
+        """Test the derived statistics"""
+        stats = ScriptStats(lines=12, invalid=2, moves=10, games=3, wins=1, elapsed=0.5)
+        self.assertEqual(stats.moves_per_second, 20)
+        self.assertEqual(stats.lines_per_second, 24)
+        self.assertIn("moves per second: 20, lines per second: 24", str(stats))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,199 @@
+"""Module with unittests for the game server and its client."""
+import asyncio
+import tempfile
+import unittest
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+
+from benchmarks.load_server import percentile, run_load
+from source.board import Board
+from source.client import GameClient, ServerError
+from source.results import ResultStore
+from source.server import GameServer, Session
+from source.spectate import SpectatorView
+
+class TestServer(unittest.TestCase):
+    """Class with unittests for the commands of the GameServer class."""
+    def setUp(self) -> None:
+        """Create a server (not listening) and a session."""
+        self.server = GameServer(port=0)
+        self.session = Session()
+
+    def test_new(self) -> None:
+        """Test starting a game."""
+        self.assertEqual(self.server.handle(self.session, "NEW 4 3 0 1"), "OK 4 3 12\n")
+        self.assertIsInstance(self.session.board, Board)
+        self.assertTrue(self.server.handle(self.session, "new").startswith("OK "))
+
+    def test_new_no_guess(self) -> None:
+        """Test that a game without guessing starts with its start scanned and reports it."""
+        _, width, height, discoverable, row, col = self.server.handle(self.session, "NEW 8 8 0.1 5 noguess").split()
+        board = self.session.board
+        self.assertIsNotNone(board)
+        self.assertEqual((int(width), int(height), int(discoverable)), (8, 8, board.discoverable))
+        self.assertEqual(board.start, (int(row), int(col)))
+        self.assertEqual(board.revealed_count(int(row), int(col)), 0)
+        self.assertLess(board.discoverable, 64 - 6)
+        self.assertEqual(self.session.moves, 0)
+
+    def test_scan(self) -> None:
+        """Test scanning until the game is won, and that the game is over afterwards."""
+        self.server.handle(self.session, "NEW 4 3 0 1")
+        self.assertEqual(self.server.handle(self.session, "SCAN 0 0"), "WON\n")
+        self.assertTrue(self.server.handle(self.session, "SCAN 0 0").startswith("ERR "))
+
+    def test_scan_trap(self) -> None:
+        """Test scanning a trap."""
+        self.server.handle(self.session, "NEW 2 2 1 1")
+        self.assertEqual(self.server.handle(self.session, "SCAN 1 1"), "TRAP\n")
+
+    def test_render(self) -> None:
+        """Test that the printed board is sent with its number of lines."""
+        self.server.handle(self.session, "NEW 4 3 0 1")
+        response = self.server.handle(self.session, "RENDER")
+        lines = response.splitlines()
+        self.assertEqual(lines[0], f"BOARD {len(lines) - 1}")
+        self.assertEqual("\n".join(lines[1:]) + "\n", str(self.session.board))
+
+    def test_errors(self) -> None:
+        """Test that invalid commands are answered with errors."""
+        for command in ["", "JUMP", "SCAN 0 0", "RENDER", "NEW 3", "NEW a b", "NEW 5000 5000", "NEW 3 3 2", "NEW 40 40 NOGUESS", "NEW 5 5 1 1 NOGUESS"]:
+            self.assertTrue(self.server.handle(self.session, command).startswith("ERR "), command)
+        self.server.handle(self.session, "NEW 4 3 0 1")
+        for command in ["SCAN 1", "SCAN 3 0", "SCAN a b"]:
+            self.assertTrue(self.server.handle(self.session, command).startswith("ERR "), command)
+
+    def test_watch(self) -> None:
+        """Test that watching a session subscribes to its spectator feed, and that watching unknown sessions fails."""
+        self.assertEqual(self.server.handle(self.session, "SESSION"), "SESSION 0\n")
+        for command in ["WATCH", "WATCH a", "WATCH 1 2", "WATCH 99"]:
+            self.assertTrue(self.server.handle(Session(), command).startswith("ERR "), command)
+
+    def test_unknown_engine(self) -> None:
+        """Test that an unknown engine name raises a ValueError."""
+        with self.assertRaises(ValueError):
+            GameServer(engine="unknown")
+
+    def test_results(self) -> None:
+        """Test that the outcomes of finished games are recorded."""
+        with tempfile.TemporaryDirectory() as directory, ResultStore(os.path.join(directory, "results.db")) as results:
+            server = GameServer(port=0, results=results)
+            server.handle(self.session, "NEW 4 3 0 1")
+            server.handle(self.session, "SCAN 0 0")
+            server.handle(self.session, "NEW 2 2 1 1")
+            server.handle(self.session, "SCAN 1 1")
+            results.flush()
+            self.assertEqual([(size.games, size.wins) for size in results.sizes("server")], [(1, 0), (1, 1)])
+            self.assertEqual([(game.width, game.height, game.moves) for game in results.leaderboard(mode="server")], [(4, 3, 1)])
+
+
+class TestClient(unittest.IsolatedAsyncioTestCase):
+    """Class with unittests for the GameClient class against a running server."""
+    async def asyncSetUp(self) -> None:
+        """Start a server on a free port."""
+        self.server = GameServer(port=0)
+        await self.server.start()
+
+    async def asyncTearDown(self) -> None:
+        """Stop the server."""
+        await self.server.close()
+
+    async def test_game(self) -> None:
+        """Test playing a game over the connection."""
+        client = await GameClient.connect(port=self.server.port)
+        self.assertEqual(await client.new_game(4, 3, 0, 1), (4, 3, 12))
+        self.assertIn("?", await client.render())
+        self.assertEqual(await client.scan(0, 0), ("WON", 0))
+        self.assertNotIn("?", await client.render())
+        with self.assertRaises(ServerError):
+            await client.scan(0, 0)
+        await client.close()
+
+    async def test_game_no_guess(self) -> None:
+        """Test starting a game without guessing over the connection."""
+        client = await GameClient.connect(port=self.server.port)
+        width, height, discoverable = await client.new_game(8, 8, 0.1, 5, no_guess=True)
+        self.assertEqual((width, height), (8, 8))
+        self.assertLess(discoverable, 58)
+        # Only the traps and the safe cells left are undiscovered after the start
+        self.assertEqual((await client.render()).count("?"), discoverable + 6)
+        await client.close()
+
+    async def test_concurrent_sessions(self) -> None:
+        """Test that many sessions are served at the same time, each with its own board."""
+        clients = await asyncio.gather(*(GameClient.connect(port=self.server.port) for _ in range(50)))
+        self.assertEqual(self.server.sessions, 50)
+        sizes = await asyncio.gather(*(client.new_game(3 + index % 5, 4, 0, index) for index, client in enumerate(clients)))
+        self.assertEqual([width for width, _, _ in sizes], [3 + index % 5 for index in range(50)])
+        await asyncio.gather(*(client.close() for client in clients))
+        await asyncio.sleep(0.01)
+        self.assertEqual(self.server.sessions, 0)
+
+    async def test_spectators(self) -> None:
+        """Test that spectators receive the moves of a session as frames until the session ends."""
+        player = await GameClient.connect(port=self.server.port)
+        session_id = await player.session_id()
+        await player.new_game(6, 5, 0.2, 3)
+        views = [SpectatorView() for _ in range(3)]
+
+        async def watch(view: SpectatorView) -> list[str]:
+            spectator = await GameClient.connect(port=self.server.port)
+            kinds = []
+            async for frame in spectator.watch(session_id):
+                view.apply(frame)
+                kinds.append(frame.split()[0])
+            return kinds
+
+        watchers = [asyncio.create_task(watch(view)) for view in views]
+        while self.server.sessions < 4:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.01)
+        self.assertEqual(await player.scan(0, 0), ("SAFE", 23))
+        await player.new_game(2, 2, 0, 1)
+        self.assertEqual(await player.scan(1, 1), ("WON", 0))
+        await player.close()
+        for kinds in await asyncio.gather(*watchers):
+            self.assertEqual(kinds, ["KEY", "DELTA", "KEY", "DELTA", "END", "CLOSED"])
+        for view in views:
+            self.assertEqual((view.width, view.height, bytes(view.labels), view.result, view.closed), (2, 2, b"0000", "WON", True))
+        await asyncio.sleep(0.01)
+        self.assertEqual(self.server.sessions, 0)
+
+    async def test_spectator_stops_watching(self) -> None:
+        """Test that a spectator that disconnects is unsubscribed while the session goes on."""
+        player = await GameClient.connect(port=self.server.port)
+        session_id = await player.session_id()
+        reader, writer = await asyncio.open_connection(port=self.server.port)
+        writer.write(f"WATCH {session_id}\n".encode())
+        self.assertEqual(await reader.readline(), f"WATCHING {session_id}\n".encode())
+        writer.close()
+        await writer.wait_closed()
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.server.sessions, 1)
+        await player.new_game(4, 3, 0, 1)
+        await player.close()
+
+    async def test_load(self) -> None:
+        """Test that the load generator reports requests and latencies."""
+        report = await run_load(5, 0.2, port=self.server.port)
+        self.assertGreater(report.requests, 0)
+        self.assertGreater(report.requests_per_second, 0)
+        self.assertLessEqual(report.p50, report.p99)
+
+    def test_percentile(self) -> None:
+        """Test the nearest-rank percentiles."""
+        latencies = [float(value) for value in range(1, 101)]
+        self.assertEqual(percentile(latencies, 0.5), 51)
+        self.assertEqual(percentile(latencies, 0.99), 100)
+        self.assertEqual(percentile([], 0.99), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+"""
+Test module for the simulation module
+"""
+import tempfile
+import unittest
+from random import Random
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+
+from source.board import Board
+from source.results import ResultStore
+from source.simulation import RandomStrategy, ScanOrderStrategy, SimulationStats, Strategy, play_game, run_batch
+
+
+class TestSimulation(unittest.TestCase):
+    """Test cases for the simulation module"""
+
+    def test_play_game_win(self) -> None:
+        """Test that a board without traps is always won"""
+        board = Board(6, 4, density=0, seed=1)
+        result = play_game(board, ScanOrderStrategy(board, Random(1)))
+        self.assertTrue(result.won)
+        self.assertEqual(result.moves, 1)
+
+    def test_play_game_loss(self) -> None:
+        """Test that a board full of traps is lost on the first move"""
+        board = Board(4, 4, density=1, seed=1)
+        self.assertEqual(board.discoverable, 0)
+        board.discoverable = 1
+        result = play_game(board, RandomStrategy(board, Random(1)))
+        self.assertFalse(result.won)
+        self.assertEqual(result.moves, 1)
+
+    def test_strategy_without_next_move(self) -> None:
+        """Test that a strategy that does not choose moves cannot be created"""
+        class Incomplete(Strategy):  # pylint: disable=abstract-method
+            """Strategy without next_move"""
+        board = Board(4, 4, density=0, seed=1)
+        with self.assertRaises(TypeError):
+            Incomplete(board, Random(1))  # pylint: disable=abstract-class-instantiated
+
+    def test_random_strategy_only_scans_undiscovered_cells(self) -> None:
+        """Test that the random strategy never scans a cell twice"""
+        board = Board(8, 8, density=0.1, seed=5)
+        strategy = RandomStrategy(board, Random(5))
+        for _ in range(10):
+            row, col = strategy.next_move()
+            self.assertIsNone(board.revealed_count(row, col))
+            if not board.scan_field(row, col) or board.discoverable == 0:
+                break
+
+    def test_run_batch_reproducible(self) -> None:
+        """Test that the results only depend on the seed, not on the number of workers"""
+        single = run_batch(60, strategy="scan_order", width=6, height=6, density=0.1, seed=42, workers=1, chunk_size=7)
+        pooled = run_batch(60, strategy="scan_order", width=6, height=6, density=0.1, seed=42, workers=2, chunk_size=7)
+        self.assertEqual(single.games, 60)
+        self.assertEqual((single.wins, single.moves), (pooled.wins, pooled.moves))
+
+    def test_run_batch_unknown_strategy(self) -> None:
+        """Test that an unknown strategy name raises a ValueError"""
+        with self.assertRaises(ValueError):
+            run_batch(1, strategy="unknown")
+
+    def test_run_batch_records_results(self) -> None:
+        """Test that the outcome of every simulated game is recorded"""
+        with tempfile.TemporaryDirectory() as directory, ResultStore(os.path.join(directory, "results.db")) as results:
+            stats = run_batch(25, strategy="solver", width=6, height=6, density=0.1, seed=3, workers=1, chunk_size=10, results=results)
+            results.flush()
+            sizes = results.sizes("simulation")
+            self.assertEqual([(size.width, size.height, size.games, size.wins, size.moves) for size in sizes],
+                             [(6, 6, 25, stats.wins, stats.moves)])
+
+    def test_stats(self) -> None:
+        """Test the aggregate statistics"""
+        stats = SimulationStats(games=10, wins=4, moves=50, elapsed=2)
+        self.assertAlmostEqual(stats.win_rate, 0.4)
+        self.assertAlmostEqual(stats.moves_per_game, 5)
+        self.assertAlmostEqual(stats.games_per_second, 5)
+        self.assertIn("win rate: 40.00%", str(stats))
+
+
+if __name__ == '__main__':
+    unittest.main()
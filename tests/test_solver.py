@@ -0,0 +1,108 @@
+"""
+Test module for the solver module
+"""
+import unittest
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+
+from source.array_board import ArrayBoard
+from source.board import Board
+from source.solver import Solver
+
+
+def board_from_rows(rows: list[str]) -> Board:
+    """Creates a board from rows of '.' (safe) and 'X' (trap) characters."""
+    height, width = len(rows), len(rows[0])
+    board = Board(width, height)
+    board._traps = [[char == "X" for char in row] for row in rows]
+    board._surrounding = [[
+        sum(rows[neighbor_row][neighbor_col] == "X"
+            for neighbor_row in range(max(row - 1, 0), min(row + 2, height))
+            for neighbor_col in range(max(col - 1, 0), min(col + 2, width))
+            if (neighbor_row, neighbor_col) != (row, col))
+        for col in range(width)] for row in range(height)]
+    board.discoverable = sum(row.count(".") for row in rows)
+    board._region_of = None
+    return board
+
+
+class TestSolver(unittest.TestCase):
+    """Test cases for the Solver class"""
+
+    def test_deduce_trap_and_safe_cells(self) -> None:
+        """Test the basic deductions after an opening"""
+        board = board_from_rows([
+            "...",
+            "...",
+            "X..",
+        ])
+        board.scan_field(0, 2)
+        solver = Solver(board)
+        solver.deduce()
+        # The opening reveals everything except (2, 0) and the bottom row's numbers tell it is a trap
+        self.assertEqual(solver.trap_cells, [(2, 0)])
+        self.assertTrue(solver.is_trap(2, 0))
+        self.assertEqual(board.discoverable, 0)
+
+    def test_solve_mid_game(self) -> None:
+        """Test that the solver attaches to a board in the middle of a game and follows its reveals"""
+        board = board_from_rows([
+            "....X",
+            ".....",
+            ".....",
+            "X....",
+        ])
+        board.scan_field(1, 1)
+        solver = Solver(board)
+        self.assertTrue(solver.solve())
+        self.assertEqual(board.discoverable, 0)
+        self.assertEqual(sorted(solver.trap_cells), [(0, 4), (3, 0)])
+        self.assertGreater(solver.deductions, 0)
+        self.assertGreaterEqual(solver.deductions_per_second, 0)
+
+    def test_subset_rule(self) -> None:
+        """Test a deduction that needs two constraints (1-2 pattern along a wall)"""
+        board = board_from_rows([
+            ".X.X",
+            "....",
+            "....",
+        ])
+        board.scan_field(2, 0)
+        solver = Solver(board)
+        solver.deduce()
+        # Row 1 shows 1 1 2 1: comparing the first two numbers shows that (0, 2) is safe, which leads to the other cells
+        self.assertIn((0, 0), solver.safe_cells)
+        self.assertTrue(solver.is_trap(0, 1))
+
+    def test_deductions_are_sound(self) -> None:
+        """Test that every deduction on random boards is correct"""
+        for seed in range(30):
+            board = ArrayBoard(15, 12, density=0.15, seed=seed)
+            zeros = [cell for cell in range(15 * 12) if not board._traps[cell] and board._surrounding[cell] == 0]
+            if not zeros:
+                continue
+            board.scan_field(*divmod(zeros[0], 15))
+            solver = Solver(board)
+            solver.solve()
+            for row, col in solver.trap_cells:
+                self.assertTrue(board._traps[row * 15 + col])
+            self.assertFalse(any(board._traps[row * 15 + col] for row, col in solver.safe_cells))
+
+    def test_detach(self) -> None:
+        """Test that a detached solver no longer follows the board"""
+        board = board_from_rows(["..", ".."])
+        solver = Solver(board)
+        solver.detach()
+        board.scan_field(0, 0)
+        self.assertEqual(solver._state, bytearray(4))
+
+
+if __name__ == '__main__':
+    unittest.main()
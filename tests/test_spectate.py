@@ -0,0 +1,205 @@
+"""
+Test module for the spectate module
+"""
+import unittest
+from random import Random
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+
+from benchmarks.bench_spectators import run_broadcast
+from source.array_board import ArrayBoard
+from source.board import Board
+from source.spectate import SpectatorFeed, SpectatorView, Subscriber
+
+
+def expected_labels(board: Board) -> bytes:
+    """
+    Returns the labels of the cells of a board as a spectator should see them.
+
+    Args:
+        board (Board): board of the game
+
+    Returns:
+        bytes: one label per cell in row-major order
+    """
+    traps, surrounding, discovered = board._flat_cells()
+    return bytes((ord("X") if trap else ord("0") + count) if known else ord("?") for trap, count, known in zip(traps, surrounding, discovered))
+
+
+def apply_all(view: SpectatorView, subscriber: Subscriber) -> list[str]:
+    """
+    Reads the unread frames of a subscriber and applies them to a view.
+
+    Args:
+        view (SpectatorView): view of the spectator
+        subscriber (Subscriber): subscription of the spectator
+
+    Returns:
+        list[str]: kinds of the applied frames
+    """
+    frames = subscriber.read().decode().splitlines()
+    for frame in frames:
+        view.apply(frame)
+    return [frame.split()[0] for frame in frames]
+
+
+class TestSpectatorFeed(unittest.TestCase):
+    """Test cases for the SpectatorFeed and Subscriber classes"""
+
+    def test_delta_frames(self) -> None:
+        """Test that a scan is published as one delta of the newly revealed cells"""
+        board = Board(4, 3, density=0, seed=1)
+        board._traps[2][3] = True
+        board._surrounding[1][2] = board._surrounding[1][3] = board._surrounding[2][2] = 1
+        board.discoverable -= 1
+        feed = SpectatorFeed(board)
+        subscriber = feed.subscribe()
+        self.assertEqual(subscriber.read(), b"KEY 1 4 3 11 ????????????\n")
+        board.scan_field(1, 3)
+        self.assertEqual(subscriber.read(), b"DELTA 2 10 1 3 1\n")
+        board.scan_field(0, 0)
+        self.assertEqual(subscriber.read(), b"DELTA 3 0 0 0 0000 1 0 001 2 0 001\nEND 4 WON\n")
+        board.scan_field(1, 3)
+        self.assertEqual(subscriber.read(), b"")
+
+    def test_trap_frames(self) -> None:
+        """Test that scanning a trap publishes the trap and the end of the game"""
+        board = Board(2, 1, density=0, seed=1)
+        board._traps[0][1] = True
+        board._surrounding[0][0] = 1
+        board.discoverable -= 1
+        feed = SpectatorFeed(board)
+        subscriber = feed.subscribe()
+        subscriber.read()
+        board.scan_field(0, 1)
+        self.assertEqual(subscriber.read(), b"DELTA 2 0 0 1 X\nEND 3 LOST\n")
+
+    def test_views_follow_the_game(self) -> None:
+        """Test that the views of subscribers that read after every move, rarely or only at the end all match the board"""
+        for board_class in (Board, ArrayBoard):
+            rng = Random(2)
+            board = board_class(20, 15, density=0.1, seed=7)
+            feed = SpectatorFeed(board, capacity=8, keyframe_interval=4)
+            subscribers = [feed.subscribe() for _ in range(3)]
+            views = [SpectatorView() for _ in range(3)]
+            for view, subscriber in zip(views, subscribers):
+                apply_all(view, subscriber)
+            # Scanning the safe cells in random order wins the game after many moves
+            cells = [(row, col) for row in range(15) for col in range(20) if not board._cell_trapped(row, col)]
+            rng.shuffle(cells)
+            for move, cell in enumerate(cells):
+                board.scan_field(*cell)
+                apply_all(views[0], subscribers[0])
+                if move % 10 == 0:
+                    apply_all(views[1], subscribers[1])
+            for view, subscriber in zip(views, subscribers):
+                apply_all(view, subscriber)
+                self.assertEqual(bytes(view.labels), expected_labels(board))
+                self.assertEqual(view.discoverable, board.discoverable)
+                self.assertEqual(view.result, "WON")
+            self.assertEqual(subscribers[0].resyncs, 0)
+            self.assertGreater(subscribers[2].resyncs, 0)
+
+    def test_slow_subscriber_resyncs_with_keyframe(self) -> None:
+        """Test that a subscriber that falls behind the capacity reads a keyframe and the frames after it, instead of the frames it missed"""
+        board = Board(30, 30, density=0.2, seed=3)
+        feed = SpectatorFeed(board, capacity=4, keyframe_interval=2)
+        subscriber = feed.subscribe()
+        subscriber.read()
+        for row in range(30):
+            for col in range(30):
+                if not board._traps[row][col]:
+                    board.scan_field(row, col)
+        self.assertGreater(subscriber.lag, 4)
+        kinds = [frame.split()[0] for frame in subscriber.read().decode().splitlines()]
+        self.assertEqual(kinds[0], "KEY")
+        self.assertLessEqual(len(kinds), 3)
+        self.assertEqual(subscriber.resyncs, 1)
+        self.assertEqual(subscriber.lag, 0)
+
+    def test_keyframes_are_shared(self) -> None:
+        """Test that subscribers that fall behind at the same time read the same keyframe object"""
+        board = Board(10, 10, density=0.1, seed=4)
+        feed = SpectatorFeed(board, capacity=4, keyframe_interval=2)
+        first, second = feed.subscribe(), feed.subscribe()
+        for cell in range(100):
+            board.scan_field(*divmod(cell, 10))
+        self.assertIs(feed.keyframe(), feed.keyframe())
+        self.assertEqual(first.read(), second.read())
+
+    def test_new_game(self) -> None:
+        """Test that attaching the board of a new game publishes its keyframe and stops publishing the moves of the old board"""
+        old = Board(5, 5, density=0, seed=1)
+        feed = SpectatorFeed(old)
+        subscriber = feed.subscribe()
+        view = SpectatorView()
+        apply_all(view, subscriber)
+        new = Board(3, 2, density=0, seed=1)
+        feed.attach(new)
+        old.scan_field(0, 0)
+        self.assertEqual(apply_all(view, subscriber), ["KEY"])
+        self.assertEqual((view.width, view.height, bytes(view.labels)), (3, 2, b"??????"))
+        new.scan_field(0, 0)
+        self.assertEqual(apply_all(view, subscriber), ["DELTA", "END"])
+        self.assertEqual(view.result, "WON")
+
+    def test_wait_and_close(self) -> None:
+        """Test that waiting subscribers are woken up once by the next frame, and that subscribers are closed after reading the last frame"""
+        feed = SpectatorFeed()
+        subscriber = feed.subscribe()
+        wakeups = []
+        subscriber.wait(lambda: wakeups.append(1))
+        self.assertEqual(subscriber.read(), b"")
+        feed.attach(Board(2, 2, density=0, seed=1))
+        feed.close()
+        self.assertEqual(wakeups, [1])
+        self.assertFalse(subscriber.closed)
+        self.assertEqual([frame.split()[0] for frame in subscriber.read().decode().splitlines()], ["KEY", "CLOSED"])
+        self.assertTrue(subscriber.closed)
+
+    def test_cancel(self) -> None:
+        """Test that a cancelled subscriber is woken up and reads nothing"""
+        feed = SpectatorFeed(Board(2, 2, density=0, seed=1))
+        subscriber = feed.subscribe()
+        subscriber.read()
+        wakeups = []
+        subscriber.wait(lambda: wakeups.append(1))
+        subscriber.cancel()
+        self.assertEqual((wakeups, feed.subscribers, subscriber.closed), ([1], 0, True))
+        feed.close()
+        self.assertEqual(subscriber.read(), b"")
+
+    def test_invalid_interval(self) -> None:
+        """Test that a keyframe interval that is not smaller than the capacity raises a ValueError"""
+        with self.assertRaises(ValueError):
+            SpectatorFeed(capacity=4, keyframe_interval=4)
+
+    def test_view_rendering(self) -> None:
+        """Test that a view prints like the board, with revealed traps as X's"""
+        board = Board(3, 2, density=0, seed=1)
+        feed = SpectatorFeed(board)
+        subscriber = feed.subscribe()
+        board.scan_field(0, 0)
+        view = SpectatorView()
+        apply_all(view, subscriber)
+        self.assertEqual(str(view), str(board))
+        with self.assertRaises(ValueError):
+            view.apply("JUMP 9")
+
+    def test_benchmark(self) -> None:
+        """Test that the benchmark reports fewer bytes than resending the printed board"""
+        report = run_broadcast(20, 30, size=10, slow=0.5, slow_interval=10)
+        self.assertEqual((report.subscribers, report.moves), (20, 30))
+        self.assertLess(report.delta_bytes, report.frame_bytes)
+        self.assertGreater(report.moves_per_second, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
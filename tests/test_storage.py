@@ -0,0 +1,174 @@
+"""Module with unittests for the board storage."""
+import os
+import sys
+import tempfile
+import unittest
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+
+from source.array_board import ArrayBoard
+from source.board import Board
+from source.storage import HEADER, load_board, pack_bits, pack_nibbles, save_board, unpack_bits, unpack_nibbles
+
+class TestStorage(unittest.TestCase):
+    """Class with unittests for saving and loading boards."""
+    def setUp(self) -> None:
+        """Create a temporary directory for the board files."""
+        self._directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self._path = os.path.join(self._directory.name, "board.bin")
+
+    def tearDown(self) -> None:
+        """Remove the board files."""
+        self._directory.cleanup()
+
+    def test_packing(self) -> None:
+        """Test that packed bits and numbers unpack to the same cells."""
+        flags = bytes([1, 0, 1, 1, 0, 0, 0, 1, 1, 0, 1])
+        packed = pack_bits(flags)
+        self.assertEqual(packed, bytes([0b10001101, 0b101]))
+        self.assertEqual(unpack_bits(packed, 0, len(flags)), flags)
+        self.assertEqual(unpack_bits(packed[1:], 9, 11), flags[9:11])
+        counts = bytes([3, 8, 0, 5, 1])
+        packed = pack_nibbles(counts)
+        self.assertEqual(packed, bytes([0x83, 0x50, 0x01]))
+        self.assertEqual(unpack_nibbles(packed, 0, len(counts)), counts)
+        self.assertEqual(unpack_nibbles(packed[1:], 3, 5), counts[3:5])
+
+    def test_file_size(self) -> None:
+        """Test that the traps and discovered states take one bit per cell and the surrounding traps four bits."""
+        board = ArrayBoard(10, 10, density=0.2, seed=1)
+        save_board(board, self._path)
+        self.assertEqual(os.path.getsize(self._path), HEADER.size + 13 + 13 + 50)
+
+    def test_board_attributes(self) -> None:
+        """Test that a loaded board has all attributes a generated board has besides its cells."""
+        board = ArrayBoard(5, 4, density=0.2, seed=1)
+        save_board(board, self._path)
+        with load_board(self._path) as loaded:
+            missing = set(vars(board)) - set(vars(loaded)) - {"_traps", "_surrounding", "_discovered", "_snapshot_generation", "_row_generation"}
+            self.assertEqual(missing, set())
+
+    def test_no_new_traps(self) -> None:
+        """Test that the traps of a loaded board cannot be placed again."""
+        save_board(ArrayBoard(5, 4, density=0.2, seed=1), self._path)
+        with load_board(self._path) as loaded, self.assertRaises(TypeError):
+            loaded._place_traps(3)
+
+    def test_round_trip(self) -> None:
+        """Test that a loaded board matches the saved board, for both board engines."""
+        for board in (Board(9, 7, density=0.15, seed=3), ArrayBoard(9, 7, density=0.15, seed=3)):
+            board.scan_field(4, 4)
+            save_board(board, self._path)
+            with load_board(self._path) as loaded:
+                self.assertEqual((loaded.width, loaded.height), (9, 7))
+                self.assertEqual(loaded.discoverable, board.discoverable)
+                self.assertEqual(str(loaded), str(board))
+                self.assertEqual(loaded.solution, board.solution)
+
+    def test_topology_round_trip(self) -> None:
+        """Test that a loaded board keeps the topology of the saved board and reveals its zero-regions the same way."""
+        board = ArrayBoard(12, 10, density=0.12, seed=6, topology="torus")
+        save_board(board, self._path)
+        with load_board(self._path) as loaded:
+            self.assertEqual(loaded.topology, "torus")
+            self.assertIs(loaded.neighbor_table, board.neighbor_table)
+            zero = next(cell for cell in range(120) if not board._traps[cell] and board._surrounding[cell] == 0)
+            self.assertEqual(loaded.scan_field(*divmod(zero, 12)), board.scan_field(*divmod(zero, 12)))
+            self.assertEqual(str(loaded), str(board))
+
+    def test_scan_field(self) -> None:
+        """Test that scanning a loaded board reveals the same cells as scanning the original board."""
+        board = ArrayBoard(30, 20, density=0.1, seed=5)
+        save_board(board, self._path)
+        with load_board(self._path) as loaded:
+            for row, col in [(0, 0), (10, 15), (19, 29), (5, 3)]:
+                self.assertEqual(loaded.scan_field(row, col), board.scan_field(row, col))
+                self.assertEqual(str(loaded), str(board))
+                self.assertEqual(loaded.discoverable, board.discoverable)
+
+    def test_copy_on_write(self) -> None:
+        """Test that a board that is not writable leaves its file unchanged."""
+        save_board(ArrayBoard(8, 8, density=0, seed=1), self._path)
+        with open(self._path, "rb") as file:
+            saved = file.read()
+        with load_board(self._path) as loaded:
+            loaded.scan_field(0, 0)
+            self.assertEqual(loaded.discoverable, 0)
+        with open(self._path, "rb") as file:
+            self.assertEqual(file.read(), saved)
+
+    def test_snapshot(self) -> None:
+        """Test that restoring a snapshot of a loaded board brings back its discovered cells."""
+        save_board(ArrayBoard(30, 20, density=0.1, seed=5), self._path)
+        with load_board(self._path) as loaded:
+            snapshot = loaded.snapshot()
+            printed = str(loaded)
+            loaded.scan_field(10, 15)
+            loaded.restore(snapshot)
+            self.assertEqual(str(loaded), printed)
+            self.assertEqual(loaded.discoverable, snapshot.discoverable)
+
+    def test_undo_move(self) -> None:
+        """Test that undoing a move of a loaded board clears the discovered bits the move set."""
+        save_board(ArrayBoard(30, 20, density=0.1, seed=5), self._path)
+        with load_board(self._path) as loaded:
+            loaded.scan_field(0, 0)
+            printed = str(loaded)
+            discoverable = loaded.discoverable
+            loaded.begin_move()
+            loaded.scan_field(10, 15)
+            loaded.undo_move(loaded.end_move())
+            self.assertEqual(str(loaded), printed)
+            self.assertEqual(loaded.discoverable, discoverable)
+
+    def test_writable(self) -> None:
+        """Test that a writable board saves the progress of the game to its file."""
+        save_board(ArrayBoard(8, 8, density=0, seed=1), self._path)
+        with load_board(self._path, writable=True) as loaded:
+            loaded.scan_field(0, 0)
+        with load_board(self._path) as loaded:
+            self.assertEqual(loaded.discoverable, 0)
+            self.assertEqual(loaded.revealed_count(7, 7), 0)
+
+    def test_writable_keeps_topology(self) -> None:
+        """Test that a writable board keeps its topology when the progress of the game is saved to its file."""
+        for topology in ("torus", "hex"):
+            board = ArrayBoard(8, 6, density=0.1, seed=4, topology=topology)
+            save_board(board, self._path)
+            safe = next(cell for cell in range(48) if not board._traps[cell])
+            with load_board(self._path, writable=True) as loaded:
+                loaded.scan_field(*divmod(safe, 8))
+            board.scan_field(*divmod(safe, 8))
+            with load_board(self._path) as loaded:
+                self.assertEqual(loaded.topology, topology)
+                self.assertEqual(loaded.discoverable, board.discoverable)
+                self.assertEqual(str(loaded), str(board))
+
+    def test_save_loaded_board(self) -> None:
+        """Test that a loaded board can be saved again."""
+        board = ArrayBoard(6, 5, density=0.2, seed=2)
+        board.scan_field(2, 2)
+        save_board(board, self._path)
+        copy_path = os.path.join(self._directory.name, "copy.bin")
+        with load_board(self._path) as loaded:
+            save_board(loaded, copy_path)
+        with open(self._path, "rb") as original, open(copy_path, "rb") as copy:
+            self.assertEqual(original.read(), copy.read())
+
+    def test_invalid_file(self) -> None:
+        """Test that files which are not board files are rejected."""
+        with open(self._path, "wb") as file:
+            file.write(b"not a board file at all")
+        with self.assertRaises(ValueError):
+            load_board(self._path)
+        open(self._path, "wb").close()  # pylint: disable=consider-using-with
+        with self.assertRaises(ValueError):
+            load_board(self._path)
+
+
+if __name__ == '__main__':
+    unittest.main()
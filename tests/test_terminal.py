@@ -0,0 +1,88 @@
+"""Module with unittests for the terminal output layer."""
+import io
+import unittest
+from unittest.mock import patch
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+
+from source.terminal import CLEAR_BELOW, CLEAR_SCREEN, CURSOR_HOME, Terminal, move_cursor
+
+
+class CountingStream(io.StringIO):
+    """Text stream that counts its writes and flushes."""
+    def __init__(self) -> None:
+        """Initializes the stream without writes."""
+        super().__init__()
+        self.writes = 0
+        self.flushes = 0
+
+    def write(self, s: str) -> int:
+        """Writes text and counts the write."""
+        self.writes += 1
+        return super().write(s)
+
+    def flush(self) -> None:
+        """Counts the flush."""
+        self.flushes += 1
+
+
+class TestTerminal(unittest.TestCase):
+    """Class with unittests for the Terminal class."""
+    def test_plain_fallback(self) -> None:
+        """Test that frames are written as plain text when the stream is not a terminal."""
+        stream = CountingStream()
+        terminal = Terminal(stream)
+        self.assertFalse(terminal.ansi)
+        terminal.draw("a\nb\n")
+        terminal.draw("c")
+        terminal.clear()
+        self.assertEqual(stream.getvalue(), "a\nb\nc\n")
+        self.assertNotIn("\x1b", stream.getvalue())
+
+    @patch("shutil.get_terminal_size", return_value=os.terminal_size((80, 24)))
+    def test_only_changed_lines(self, _: unittest.mock.MagicMock) -> None:
+        """Test that a frame only rewrites the lines that changed, with a single write and flush."""
+        stream = CountingStream()
+        terminal = Terminal(stream, ansi=True)
+        terminal.draw("header\nrow 0\nrow 1\n")
+        self.assertTrue(stream.getvalue().startswith(CURSOR_HOME + CLEAR_SCREEN))
+        self.assertEqual((stream.writes, stream.flushes), (1, 1))
+
+        stream.seek(0)
+        stream.truncate()
+        terminal.draw("header\nrow 0\nrow X\n")
+        frame = stream.getvalue()
+        self.assertEqual((stream.writes, stream.flushes), (2, 2))
+        self.assertIn(move_cursor(2) + "row X", frame)
+        self.assertNotIn("header", frame)
+        self.assertNotIn("row 0", frame)
+        self.assertTrue(frame.endswith(move_cursor(3) + CLEAR_BELOW))
+
+        # After invalidating, the whole frame is drawn again
+        terminal.invalidate()
+        stream.seek(0)
+        stream.truncate()
+        terminal.draw("header\nrow 0\nrow X\n")
+        self.assertIn("header", stream.getvalue())
+
+    @patch("shutil.get_terminal_size", return_value=os.terminal_size((80, 4)))
+    def test_tall_frame_redrawn(self, _: unittest.mock.MagicMock) -> None:
+        """Test that frames which would scroll the screen are always drawn completely."""
+        stream = CountingStream()
+        terminal = Terminal(stream, ansi=True)
+        terminal.draw("1\n2\n3\n")
+        stream.seek(0)
+        stream.truncate()
+        terminal.draw("1\n2\n3\n")
+        self.assertTrue(stream.getvalue().startswith(CURSOR_HOME + CLEAR_SCREEN))
+
+
+if __name__ == "__main__":
+    unittest.main()
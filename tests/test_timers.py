@@ -0,0 +1,62 @@
+"""
+Test module for the timers module
+"""
+
+import unittest
+import os
+import sys
+import time
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+from source.timers import Clock, Scheduler, VirtualClock
+
+
+class TestTimers(unittest.TestCase):
+    """Unittest TestCase class for the timers module"""
+    def test_wait_virtual_clock(self) -> None:
+        """Test that waiting on a virtual clock advances the virtual time without waiting in real time."""
+        clock = VirtualClock()
+        real_start = Clock().now()
+        Scheduler(clock).wait(3600)
+        self.assertEqual(clock.now(), 3600)
+        self.assertLess(Clock().now() - real_start, 1)
+
+    def test_events_run_in_order(self) -> None:
+        """Test that events run in order of their due time at the right virtual time."""
+        clock = VirtualClock()
+        scheduler = Scheduler(clock)
+        calls: list[tuple[str, float]] = []
+        scheduler.call_later(2, lambda: calls.append(("second", clock.now())))
+        scheduler.call_later(1, lambda: calls.append(("first", clock.now())))
+        scheduler.call_later(1, lambda: scheduler.call_later(5, lambda: calls.append(("nested", clock.now()))))
+        scheduler.run()
+        self.assertEqual(calls, [("first", 1), ("second", 2), ("nested", 6)])
+        self.assertEqual(scheduler.pending, 0)
+
+    def test_wait_keeps_later_events(self) -> None:
+        """Test that waiting only runs the events that become due while waiting."""
+        clock = VirtualClock()
+        scheduler = Scheduler(clock)
+        calls: list[int] = []
+        scheduler.call_later(1, lambda: calls.append(1))
+        scheduler.call_later(10, lambda: calls.append(10))
+        scheduler.wait(5)
+        self.assertEqual(calls, [1])
+        self.assertEqual(clock.now(), 5)
+        self.assertEqual(scheduler.pending, 1)
+
+    def test_real_wait_does_not_busy_wait(self) -> None:
+        """Test that waiting on the real clock sleeps instead of using CPU time."""
+        start, start_cpu = time.monotonic(), time.process_time()
+        Scheduler().wait(0.3)
+        end, end_cpu = time.monotonic(), time.process_time()
+        self.assertGreaterEqual(end - start, 0.25)
+        self.assertLess(end_cpu - start_cpu, 0.15)
+
+
+if __name__ == '__main__':
+    unittest.main()
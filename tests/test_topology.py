@@ -0,0 +1,144 @@
+"""
+Test module for the topology module
+"""
+import unittest
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+
+from source.array_board import ArrayBoard
+from source.board import Board
+from source.engines import create_board
+from source.solver import Solver
+from source.topology import TOPOLOGIES, Topology, neighbor_table
+
+
+class TestTopology(unittest.TestCase):
+    """Test cases for the topologies and the neighbor index"""
+
+    def test_grid_neighbors(self) -> None:
+        """Test the neighbors of inner, border and corner cells of a bounded grid"""
+        table = neighbor_table("grid", 4, 3)
+        self.assertEqual(sorted(table.cell_neighbors(1, 1)), [(0, 0), (0, 1), (0, 2), (1, 0), (1, 2), (2, 0), (2, 1), (2, 2)])
+        self.assertEqual(sorted(table.cell_neighbors(0, 0)), [(0, 1), (1, 0), (1, 1)])
+        self.assertEqual(sorted(table.neighbors(11)), [6, 7, 10])
+
+    def test_torus_neighbors(self) -> None:
+        """Test that the neighbors of border cells wrap around, and that narrow boards have no duplicate neighbors"""
+        table = neighbor_table("torus", 5, 4)
+        self.assertEqual(sorted(table.cell_neighbors(0, 0)), [(0, 1), (0, 4), (1, 0), (1, 1), (1, 4), (3, 0), (3, 1), (3, 4)])
+        self.assertEqual(sorted(table.cell_neighbors(3, 4)), [(0, 0), (0, 3), (0, 4), (2, 0), (2, 3), (2, 4), (3, 0), (3, 3)])
+        self.assertEqual(sorted(neighbor_table("torus", 2, 2).cell_neighbors(0, 0)), [(0, 1), (1, 0), (1, 1)])
+        self.assertEqual(neighbor_table("torus", 1, 1).cell_neighbors(0, 0), [])
+
+    def test_hex_neighbors(self) -> None:
+        """Test the six neighbors of cells in even and odd rows"""
+        table = neighbor_table("hex", 5, 5)
+        self.assertEqual(sorted(table.cell_neighbors(2, 2)), [(1, 1), (1, 2), (2, 1), (2, 3), (3, 1), (3, 2)])
+        self.assertEqual(sorted(table.cell_neighbors(1, 2)), [(0, 2), (0, 3), (1, 1), (1, 3), (2, 2), (2, 3)])
+        self.assertEqual(sorted(table.cell_neighbors(0, 0)), [(0, 1), (1, 0)])
+
+    def test_neighbors_are_symmetric(self) -> None:
+        """Test that every cell is a neighbor of its neighbors, for all topologies"""
+        for name in TOPOLOGIES:
+            table = neighbor_table(name, 7, 6)
+            for cell in range(7 * 6):
+                for neighbor in table.neighbors(cell):
+                    self.assertIn(cell, table.neighbors(neighbor), name)
+
+    def test_rows_share_adjacency_lists(self) -> None:
+        """Test that the index is shared by boards of the same shape and only holds one adjacency list per row class"""
+        self.assertIs(Board(30, 20, density=0.1, seed=1).neighbor_table, Board(30, 20, density=0.2, seed=2).neighbor_table)
+        self.assertEqual(neighbor_table("grid", 30, 20).row_classes, 3)
+        self.assertEqual(neighbor_table("torus", 30, 20).row_classes, 3)
+        self.assertEqual(neighbor_table("hex", 30, 20).row_classes, 4)
+
+    def test_default_shapes_stay_cached(self) -> None:
+        """Test that the neighbor indexes of all default board shapes are kept, so boards of random default sizes never build them again"""
+        shapes = [(width, height) for width in range(5, 11) for height in range(5, 11)]
+        tables = [neighbor_table("grid", width, height) for width, height in shapes]
+        self.assertTrue(all(neighbor_table("grid", width, height) is table for (width, height), table in zip(shapes, tables)))
+
+    def test_unknown_topology(self) -> None:
+        """Test that an unknown topology raises a ValueError"""
+        with self.assertRaises(ValueError):
+            Board(5, 5, topology="sphere")
+        with self.assertRaises(ValueError):
+            create_board(5, 5, engine="chunked", topology="torus")
+
+    def test_topology_without_neighbors(self) -> None:
+        """Test that a topology that does not define the neighbors of a cell cannot be created"""
+        class Incomplete(Topology):  # pylint: disable=abstract-method
+            """Topology without cell_neighbors"""
+            name = "incomplete"
+        with self.assertRaises(TypeError):
+            Incomplete()  # pylint: disable=abstract-class-instantiated
+
+    def test_surrounding_matches_brute_force(self) -> None:
+        """Test that the numbers of surrounding traps count the traps of the neighbors, for all topologies and both engines"""
+        for name in TOPOLOGIES:
+            for board in (Board(9, 7, density=0.3, seed=4, topology=name), ArrayBoard(9, 7, density=0.3, seed=4, topology=name)):
+                for row in range(7):
+                    for col in range(9):
+                        expected = sum(board._cell_trapped(*neighbor) for neighbor in board.neighbors(row, col))
+                        self.assertEqual(board._cell_surrounding(row, col), expected, name)
+
+    def test_torus_reveal_wraps(self) -> None:
+        """Test that a zero-region of a torus spreads across the borders"""
+        board = Board(6, 6, density=0, seed=1, topology="torus")
+        board._traps[2][2] = True
+        for row, col in board.neighbors(2, 2):
+            board._surrounding[row][col] += 1
+        board.discoverable -= 1
+        self.assertTrue(board.scan_field(0, 0))
+        self.assertEqual(board.discoverable, 0)
+        self.assertIsNone(board.revealed_count(2, 2))
+
+    def test_reveal_matches_brute_force(self) -> None:
+        """Test that scanning reveals exactly the zero-region of the field and its border, for all topologies"""
+        for name in TOPOLOGIES:
+            board = Board(12, 10, density=0.12, seed=6, topology=name)
+            zeros = [(row, col) for row in range(10) for col in range(12) if not board._traps[row][col] and board._surrounding[row][col] == 0]
+            expected = set()
+            stack = [zeros[0]]
+            while stack:
+                cell = stack.pop()
+                if cell in expected:
+                    continue
+                expected.add(cell)
+                if board._surrounding[cell[0]][cell[1]] == 0:
+                    stack.extend(board.neighbors(*cell))
+            board.scan_field(*zeros[0])
+            revealed = {(row, col) for row in range(10) for col in range(12) if board._discovered[row][col]}
+            self.assertEqual(revealed, expected, name)
+
+    def test_hex_rendering(self) -> None:
+        """Test that odd rows of a hexagonal board are printed half a cell to the right"""
+        lines = str(Board(3, 2, density=0, seed=1, topology="hex")).splitlines()
+        self.assertTrue(lines[2].startswith("0 | "))
+        self.assertTrue(lines[4].startswith("  1 | "))
+
+    def test_solver_on_torus(self) -> None:
+        """Test that the solver's deductions are correct on a torus"""
+        for seed in range(10):
+            board = ArrayBoard(12, 10, density=0.15, seed=seed, topology="torus")
+            zeros = [cell for cell in range(12 * 10) if not board._traps[cell] and board._surrounding[cell] == 0]
+            if not zeros:
+                continue
+            board.scan_field(*divmod(zeros[0], 12))
+            solver = Solver(board)
+            solver.solve()
+            for row, col in solver.trap_cells:
+                self.assertTrue(board._traps[row * 12 + col])
+            self.assertTrue(all(board.revealed_count(row, col) is not None or not board._traps[row * 12 + col]
+                                for row in range(10) for col in range(12) if board._discovered[row][col]))
+
+
+if __name__ == "__main__":
+    unittest.main()
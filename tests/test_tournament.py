@@ -0,0 +1,76 @@
+"""
+Test module for the tournament module
+"""
+import unittest
+from random import Random
+
+import os
+import sys
+
+this_path = os.path.dirname(__file__)
+this_path = os.path.join(this_path, '..')
+os.environ['PYTHONPATH'] = this_path
+sys.path.append(os.environ['PYTHONPATH'])
+
+
+from source.array_board import ArrayBoard
+from source.tournament import Corpus, format_ranking, run_tournament
+
+
+class TestTournament(unittest.TestCase):
+    """Test cases for the tournament module"""
+
+    def test_corpus_boards(self) -> None:
+        """Test that the boards of a corpus play like the generated boards"""
+        with Corpus.generate(3, 9, 7, density=0.15, seed=5) as corpus:
+            rng = Random(5)
+            for index in range(len(corpus)):
+                expected = ArrayBoard(9, 7, density=0.15, seed=rng.getrandbits(63))
+                board = corpus.board(index)
+                self.assertEqual(board.discoverable, expected.discoverable)
+                self.assertEqual(board.solution, expected.solution)
+                for row, col in [(0, 0), (3, 4), (6, 8)]:
+                    self.assertEqual(board.scan_field(row, col), expected.scan_field(row, col))
+                    self.assertEqual(str(board), str(expected))
+                board.release()
+            # Every game starts on an undiscovered board
+            board = corpus.board(0)
+            self.assertEqual(board.discoverable, corpus.spec.discoverable[0])
+            self.assertFalse(any(1 in row for row in board._discovered))
+            board.release()
+
+    def test_attach(self) -> None:
+        """Test that an attached corpus shares the boards and the shared memory is removed with its owner"""
+        corpus = Corpus.generate(2, 6, 6, density=0.2, seed=1)
+        attached = Corpus.attach(corpus.spec)
+        board, shared = corpus.board(1), attached.board(1)
+        self.assertEqual(board.solution, shared.solution)
+        board.release()
+        shared.release()
+        attached.close()
+        corpus.close()
+        with self.assertRaises(FileNotFoundError):
+            Corpus.attach(corpus.spec)
+
+    def test_run_tournament(self) -> None:
+        """Test that the results do not depend on the number of workers and the ranking is sorted by win rate"""
+        with Corpus.generate(40, 6, 6, density=0.1, seed=3) as corpus:
+            single = run_tournament(corpus, ["scan_order", "solver"], seed=2, workers=1, chunk_size=7)
+            pooled = run_tournament(corpus, ["scan_order", "solver"], seed=2, workers=2, chunk_size=7)
+        self.assertEqual([(standing.strategy, standing.stats.wins, standing.stats.moves) for standing in single],
+                         [(standing.strategy, standing.stats.wins, standing.stats.moves) for standing in pooled])
+        self.assertEqual([standing.stats.games for standing in single], [40, 40])
+        self.assertGreaterEqual(single[0].stats.win_rate, single[1].stats.win_rate)
+        table = format_ranking(single)
+        self.assertIn("solver", table)
+        self.assertIn("win rate", table)
+
+    def test_unknown_strategy(self) -> None:
+        """Test that an unknown strategy name raises a ValueError"""
+        with Corpus.generate(1, 5, 5, seed=1) as corpus:
+            with self.assertRaises(ValueError):
+                run_tournament(corpus, ["unknown"])
+
+
+if __name__ == '__main__':
+    unittest.main()